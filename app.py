@@ -1,34 +1,40 @@
+import time
 import streamlit as st
 import streamlit_authenticator as stauth
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_squared_error
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
-import os
+from utils.activity_log import get_activity_logger
+from utils.auth import load_auth_config
+from utils.startup import lazy_import, record, startup_report
 
-# Logger function
-def log_activity(activity):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open("activity_log.txt", "a") as f:
-        f.write(f"{timestamp}: {activity}\n")
+# pandas, plotly, scikit-learn and the analysis helpers are imported with
+# lazy_import() inside the menu branch that needs them
 
-# Authentication setup (simple example; in production, use secure hashes)
-names = ["Admin"]
-usernames = ["admin"]
-passwords = ["password"]  # Hash in production
-hashed_passwords = stauth.Hasher(passwords).generate()
-authenticator = stauth.Authenticate(names, usernames, hashed_passwords, "data_analysis", "abcdef", cookie_expiry_days=30)
+ACTIVITY_PAGE_SIZE = 100
+
+# Logger function (buffered, rotated and de-duplicated by utils.activity_log)
+def log_activity(activity, user=None):
+    get_activity_logger().log(activity, user=user or st.session_state.get("username"))
+
+# Authentication setup: bcrypt hashes are precomputed in auth_config.yaml
+# (see utils/auth.py) and the config is loaded once per process
+@st.cache_resource
+def get_auth_config():
+    started = time.perf_counter()
+    config = load_auth_config()
+    record("auth config", time.perf_counter() - started)
+    return config
+
+def get_authenticator():
+    config = get_auth_config()
+    cookie = config["cookie"]
+    # Built per run: its cookie-manager component has to render on every rerun
+    return stauth.Authenticate(config["credentials"], cookie["name"], cookie["key"], cookie["expiry_days"])
 
 # Main app
 def main():
     st.title("Data Analysis Assistant")
     
     # Authentication
+    authenticator = get_authenticator()
     name, authentication_status, username = authenticator.login("Login", "main")
     if authentication_status == False:
         st.error("Username/password is incorrect")
@@ -44,6 +50,8 @@ def main():
         # Sidebar for navigation
         menu = ["Upload Dataset", "EDA", "Modeler", "Visualization", "Activity Log"]
         choice = st.sidebar.selectbox("Menu", menu)
+        with st.sidebar.expander("⏱️ Startup timing"):
+            st.table(startup_report())
         
         # Global data storage
         if "data" not in st.session_state:
@@ -51,15 +59,17 @@ def main():
         
         if choice == "Upload Dataset":
             st.header("Upload Dataset")
-            uploaded_file = st.file_uploader("Choose a file (CSV, Excel, JSON)", type=["csv", "xlsx", "json"])
+            ingestion = lazy_import("utils.ingestion")
+            uploaded_file = st.file_uploader("Choose a file (CSV, Excel, JSON, Parquet, Arrow)", type=ingestion.SUPPORTED_TYPES)
+            memory_map = st.checkbox("Store on disk (shared store; repeat uploads of the same file skip parsing)")
             if uploaded_file is not None:
-                if uploaded_file.name.endswith(".csv"):
-                    st.session_state.data = pd.read_csv(uploaded_file)
-                elif uploaded_file.name.endswith(".xlsx"):
-                    st.session_state.data = pd.read_excel(uploaded_file)
-                elif uploaded_file.name.endswith(".json"):
-                    st.session_state.data = pd.read_json(uploaded_file)
+                data, report = ingestion.ingest_dataset(uploaded_file, uploaded_file.name, memory_map=memory_map)
+                st.session_state.data = data
                 st.success("Dataset uploaded successfully!")
+                st.write(
+                    f"{report['rows']:,} rows × {report['columns']} columns — "
+                    f"{report['optimized_mb']} MB in memory (saved {report['saved_mb']} MB, {report['saved_pct']}%)"
+                )
                 st.dataframe(st.session_state.data.head())
                 log_activity(f"Dataset uploaded: {uploaded_file.name}")
         
@@ -68,58 +78,60 @@ def main():
                 st.error("Please upload a dataset first.")
             else:
                 st.header("Exploratory Data Analysis")
+                eda = lazy_import("utils.eda")
                 data = st.session_state.data
+                approximate = st.checkbox(
+                    "Approximate statistics (faster on large datasets)", value=len(data) > eda.APPROX_ROWS
+                )
+                profile = eda.profile_dataset(data, approximate=approximate)
+                if profile["approximate"]:
+                    st.caption("Distinct counts are HyperLogLog estimates; quantiles, value counts and correlation come from a random sample.")
                 
                 # Data Overview
                 st.subheader("Data Overview")
-                st.write(f"Shape: {data.shape}")
-                st.write(f"Columns: {list(data.columns)}")
+                st.write(f"Shape: {profile['shape']}")
+                st.write(f"Columns: {profile['columns']}")
                 
                 # Column Types
                 st.subheader("Column Types")
-                st.write(data.dtypes)
+                st.write(profile["dtypes"])
                 
                 # Summary Statistics
                 st.subheader("Summary Statistics")
-                st.write(data.describe())
+                st.write(profile["summary"])
                 
                 # Missing Values
                 st.subheader("Missing Values")
-                st.write(data.isnull().sum())
+                st.write(profile["missing"])
                 
                 # Unique Values
                 st.subheader("Unique Values per Column")
-                for col in data.columns:
-                    st.write(f"{col}: {data[col].nunique()}")
+                st.write(profile["unique"])
                 
                 # Correlation Matrix
                 st.subheader("Correlation Matrix")
-                numeric_data = data.select_dtypes(include=[np.number])
-                if not numeric_data.empty:
-                    corr = numeric_data.corr()
-                    st.write(corr)
+                if profile["correlation"] is not None:
+                    st.write(profile["correlation"])
                 else:
                     st.write("No numeric columns for correlation.")
                 
                 # Value Counts for Categorical Columns
                 st.subheader("Value Counts for Categorical Columns")
-                cat_cols = data.select_dtypes(include=["object"]).columns
-                for col in cat_cols:
+                for col, counts in profile["value_counts"].items():
                     st.write(f"{col}:")
-                    st.write(data[col].value_counts())
+                    st.write(counts)
                 
                 # Skewness and Kurtosis
                 st.subheader("Skewness and Kurtosis")
-                if not numeric_data.empty:
-                    st.write(f"Skewness: {numeric_data.skew()}")
-                    st.write(f"Kurtosis: {numeric_data.kurtosis()}")
+                if not profile["summary"].empty:
+                    st.write(profile["summary"][["skew", "kurtosis"]])
                 
                 # Top & Bottom Records
                 st.subheader("Top & Bottom Records")
                 st.write("Top 5:")
-                st.dataframe(data.head())
+                st.dataframe(profile["head"])
                 st.write("Bottom 5:")
-                st.dataframe(data.tail())
+                st.dataframe(profile["tail"])
                 
                 log_activity("EDA performed")
         
@@ -128,78 +140,112 @@ def main():
                 st.error("Please upload a dataset first.")
             else:
                 st.header("Modeler")
+                modeling = lazy_import("utils.modeling")
                 data = st.session_state.data
                 target = st.selectbox("Select Target Column", data.columns)
                 features = st.multiselect("Select Feature Columns", [col for col in data.columns if col != target])
                 
+                model_type = st.selectbox("Model Type", modeling.MODEL_TYPES)
+                
                 if st.button("Train Model"):
                     if not features or target not in data.columns:
                         st.error("Select valid features and target.")
                     else:
-                        X = data[features]
-                        y = data[target]
-                        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-                        
-                        model_type = st.selectbox("Model Type", ["Linear Regression", "Random Forest"])
-                        if model_type == "Linear Regression":
-                            model = LinearRegression()
+                        st.session_state.training_job = modeling.submit_training(data, features, target, model_type)
+                        st.session_state.training_result = None
+                        log_activity(f"Model training started: {model_type}")
+                
+                job_id = st.session_state.get("training_job")
+                job = modeling.get_job(job_id) if job_id else None
+                if job is None and job_id:
+                    # finished jobs are dropped once MAX_JOBS newer ones exist
+                    job = st.session_state.get("training_result")
+                elif job is not None and job["status"] != "running":
+                    st.session_state.training_result = job
+                if job is not None:
+                    if job["status"] == "running":
+                        st.info("Training in the background...")
+                        st.button("Refresh status")
+                    elif job["status"] == "failed":
+                        st.error(f"Training failed: {job['error']}")
+                    else:
+                        result = job["result"]
+                        st.write(f"Mean Squared Error: {result['mse']}")
+                        if result["cv_mse"] is not None:
+                            st.write(f"Cross-validated MSE ({result['cv_folds']}-fold): {result['cv_mse']}")
+                        if result["cached"]:
+                            st.caption("Loaded from model cache.")
                         else:
-                            model = RandomForestRegressor()
-                        
-                        model.fit(X_train, y_train)
-                        predictions = model.predict(X_test)
-                        mse = mean_squared_error(y_test, predictions)
-                        st.write(f"Mean Squared Error: {mse}")
-                        log_activity(f"Model trained: {model_type}")
+                            peak = f", peak memory {result['peak_mb']} MB" if result["peak_mb"] is not None else ""
+                            st.caption(f"{result['model_type']} trained on {result['rows']:,} rows in {result['wall_seconds']}s{peak}")
         
         elif choice == "Visualization":
             if st.session_state.data is None:
                 st.error("Please upload a dataset first.")
             else:
                 st.header("Visualization")
+                pd = lazy_import("pandas")
+                px = lazy_import("plotly.express")
+                viz_data = lazy_import("utils.viz_data")
+                eda = lazy_import("utils.eda")
                 data = st.session_state.data
                 viz_type = st.selectbox("Select Visualization", ["Histogram", "Heatmap", "Bar Chart", "Pie Chart", "Bubble Chart"])
                 
                 if viz_type == "Histogram":
                     col = st.selectbox("Select Column", data.columns)
-                    fig = px.histogram(data, x=col)
+                    payload = viz_data.histogram_payload(data, col)
+                    if "bin_mid" in payload:
+                        fig = px.bar(payload, x="bin_mid", y="count", hover_data=["bin_start", "bin_end"], labels={"bin_mid": col})
+                        fig.update_layout(bargap=0)
+                    else:
+                        fig = px.bar(payload, x="value", y="count", labels={"value": col})
                     st.plotly_chart(fig)
                 
                 elif viz_type == "Heatmap":
-                    numeric_data = data.select_dtypes(include=[np.number])
-                    if not numeric_data.empty:
-                        fig = px.imshow(numeric_data.corr(), text_auto=True)
+                    corr = eda.profile_dataset(data)["correlation"]
+                    if corr is not None:
+                        fig = px.imshow(corr, text_auto=True)
                         st.plotly_chart(fig)
                     else:
                         st.error("No numeric data for heatmap.")
                 
                 elif viz_type == "Bar Chart":
                     col = st.selectbox("Select Column", data.columns)
-                    fig = px.bar(data[col].value_counts())
+                    fig = px.bar(viz_data.top_n_payload(data, col), x="value", y="count", labels={"value": col})
                     st.plotly_chart(fig)
                 
                 elif viz_type == "Pie Chart":
                     col = st.selectbox("Select Column", data.columns)
-                    fig = px.pie(data, names=col)
+                    fig = px.pie(viz_data.top_n_payload(data, col), names="value", values="count", labels={"value": col})
                     st.plotly_chart(fig)
                 
                 elif viz_type == "Bubble Chart":
                     x_col = st.selectbox("X-axis", data.columns)
                     y_col = st.selectbox("Y-axis", data.columns)
                     size_col = st.selectbox("Size", data.columns)
-                    fig = px.scatter(data, x=x_col, y=y_col, size=size_col)
+                    method = st.radio("Large data", ["density", "sample"], horizontal=True)
+                    points, reduced = viz_data.scatter_payload(data, x_col, y_col, size_col, method=method)
+                    if reduced:
+                        st.caption(f"Showing {reduced}.")
+                    size = size_col if size_col in points and pd.api.types.is_numeric_dtype(points[size_col]) else None
+                    fig = px.scatter(points, x=x_col, y=y_col, size=size, render_mode="webgl")
                     st.plotly_chart(fig)
                 
                 log_activity(f"Visualization created: {viz_type}")
         
         elif choice == "Activity Log":
             st.header("Activity Log")
-            if os.path.exists("activity_log.txt"):
-                with open("activity_log.txt", "r") as f:
-                    logs = f.read()
-                st.text_area("Logs", logs, height=300)
+            col_user, col_action, col_page = st.columns(3)
+            user_filter = col_user.text_input("User")
+            action_filter = col_action.text_input("Action contains")
+            page = col_page.number_input("Page", min_value=1, value=1, step=1)
+            records = get_activity_logger().tail(
+                page=page - 1, page_size=ACTIVITY_PAGE_SIZE, user=user_filter or None, action=action_filter or None
+            )
+            if records:
+                st.dataframe(records)
             else:
-                st.write("No logs yet.")
+                st.write("No logs yet." if page == 1 else "No more logs.")
 
 if __name__ == "__main__":
     main()
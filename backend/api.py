@@ -0,0 +1,259 @@
+"""
+Headless check-in API for kiosk scanners (ASGI).
+
+    uvicorn backend.api:app --host 0.0.0.0 --port 8000
+
+Check-In vs Check-Out is decided from the database inside the write
+transaction, so decisions stay consistent across workers and restarts. QR
+image decoding is CPU-bound and runs in a process pool; token validation, the
+profile lookup (a database read on a cache miss) and recording run in a thread
+so the event loop never blocks; scans are written to the SQLite database in
+batches.
+
+Endpoints:
+    POST /checkin   JSON {"token": "..."} or raw image bytes (Content-Type: image/*)
+    GET  /health
+    GET  /metrics   Prometheus text
+"""
+import asyncio
+import io
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+
+from utils import database
+from utils.metrics import increment, render_prometheus, timer
+from utils.profile import get_profile
+from utils.qrcode_utils import decode_qr_from_image
+from utils.security import validate_token
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+DECODE_WORKERS = int(os.environ.get("ATTENDANCE_DECODE_WORKERS", os.cpu_count() or 1))
+FLUSH_SECONDS = 0.0  # callers wait on their result, so lingering only adds latency
+FLUSH_BATCH = 1000
+WRITE_TIMEOUT_SECONDS = 30  # longest a request waits for its batch to commit
+
+
+# -------------------------------
+# 💾 Batched Event Writer
+# -------------------------------
+
+class EventBatchWriter:
+    """
+    Collects scans and records them in the database in batches from a
+    background thread (one transaction per batch, not per scan): every scan
+    queued while the previous batch was committing goes into the next one,
+    optionally waiting up to flush_seconds for more. Each scan's
+    type is decided inside that transaction; add() returns a Future that
+    resolves to (event id, type).
+    """
+
+    def __init__(self, flush_seconds=FLUSH_SECONDS, batch_size=FLUSH_BATCH):
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, emp_id, name, department, timestamp, ip=None, location=None):
+        future = Future()
+        self._queue.put(((emp_id, name, department, timestamp, ip, location), future))
+        return future
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    def flush(self):
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    pass
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                with timer("event_batch_write"):
+                    results = database.record_scans([scan for scan, _ in batch])
+                increment("events_written", len(batch))
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                # any failure fails this batch only; the writer keeps running
+                increment("event_write_failures")
+                print(f"Event batch write failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+# -------------------------------
+# 🛂 Check-in Logic
+# -------------------------------
+
+_writer = None
+_decode_pool = None
+
+
+def _decode_bytes(data: bytes):
+    """
+    Decode in a pool worker. Returns the token, "" if no code was found,
+    or None if the body is not a readable image.
+    """
+    try:
+        return decode_qr_from_image(io.BytesIO(data))
+    except Exception:  # PIL/cv2 raise several unrelated types for bad input
+        return None
+
+
+def _startup():
+    global _writer, _decode_pool
+    if _writer is None:
+        _writer = EventBatchWriter()
+    if _decode_pool is None:
+        _decode_pool = ProcessPoolExecutor(max_workers=DECODE_WORKERS)
+
+
+def _shutdown():
+    global _decode_pool
+    if _writer is not None:
+        _writer.flush()
+    if _decode_pool is not None:
+        _decode_pool.shutdown(wait=False, cancel_futures=True)
+        _decode_pool = None
+
+
+def record_checkin(token, client_ip=None):
+    """
+    Validate a token and record the scan. Returns (status, payload).
+    """
+    with timer("validate_token"):
+        emp_id = validate_token(token)
+    if not emp_id:
+        return 401, {"error": "Invalid or expired QR token"}
+    with timer("get_profile"):
+        profile = get_profile(emp_id)
+    if profile is None:
+        increment("profile_not_found")
+        return 404, {"error": "Profile not found"}
+    timestamp = datetime.now()
+    with timer("record_scan"):
+        future = _writer.add(emp_id, profile["Name"], profile["Department"], timestamp, ip=client_ip)
+        try:
+            _, event_type = future.result(timeout=WRITE_TIMEOUT_SECONDS)
+        except Exception:  # write failed or timed out
+            increment("scan_write_errors")
+            return 503, {"error": "Could not confirm the scan, please retry"}
+    increment("scans_recorded")
+    return 200, {
+        "emp_id": emp_id,
+        "name": profile["Name"],
+        "type": event_type,
+        "timestamp": timestamp.isoformat(timespec="seconds"),
+    }
+
+
+async def _handle_checkin(headers, body, client_ip):
+    content_type = headers.get(b"content-type", b"").split(b";")[0].strip().lower()
+    if content_type.startswith(b"image/") or content_type == b"application/octet-stream":
+        loop = asyncio.get_running_loop()
+        with timer("decode_qr"):
+            token = await loop.run_in_executor(_decode_pool, _decode_bytes, body)
+        if token is None:
+            return 422, {"error": "Body is not a readable image"}
+        if not token:
+            return 422, {"error": "No QR code found in image"}
+    else:
+        try:
+            token = json.loads(body or b"{}").get("token")
+        except (ValueError, AttributeError):
+            return 400, {"error": "Expected JSON {\"token\": ...} or an image body"}
+        if not token:
+            return 400, {"error": "Missing token"}
+    return await asyncio.get_running_loop().run_in_executor(None, record_checkin, token, client_ip)
+
+
+# -------------------------------
+# 🌐 ASGI Plumbing
+# -------------------------------
+
+async def _read_body(receive):
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _respond(send, status, payload, content_type=b"application/json"):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            _startup()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+    _startup()  # no-op after the first request; covers servers without lifespan
+
+    method, path = scope["method"], scope["path"].rstrip("/") or "/"
+    if path == "/health" and method == "GET":
+        await _respond(send, 200, {"status": "ok", "pending_writes": _writer.pending})
+    elif path == "/metrics" and method == "GET":
+        await _respond(send, 200, render_prometheus().encode(), b"text/plain; version=0.0.4")
+    elif path == "/checkin" and method == "POST":
+        body = await _read_body(receive)
+        if body is None:
+            await _respond(send, 413, {"error": "Request body too large"})
+            return
+        headers = dict(scope.get("headers") or [])
+        client_ip = (scope.get("client") or (None,))[0]
+        with timer("checkin_total"):
+            status, payload = await _handle_checkin(headers, body, client_ip)
+        await _respond(send, status, payload)
+    else:
+        await _respond(send, 404, {"error": "Not found"})
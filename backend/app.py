@@ -5,19 +5,18 @@ import os
 
 # Utils
 from utils.qrcode_utils import generate_qr_code, decode_qr_from_image
-from utils.calculator import calculate_working_hours
-from utils.profile import load_profiles, get_profile
+from utils.dashboard import get_live_attendance
+from utils.profile import load_profiles, get_profile, sync_roster
 from utils.admin_control import add_employee, remove_employee, export_data
-from utils.notification import send_alert
-from utils.security import generate_one_time_token, validate_token, get_public_ip, get_geo_location
+from utils.security import generate_one_time_token, validate_token, enrich_location_async
 from utils.accessibility import mobile_friendly_view, cross_platform_info
+from utils.rollups import get_rollups
+from utils.metrics import timer, increment, snapshot, render_prometheus, write_metrics_file, serve_metrics
+from utils import database
+from utils.archive import compact_closed_days, department_monthly_summary
 
-# Storage for this example
-if "attendance_log" not in st.session_state:
-    st.session_state.attendance_log = []
-
-if "valid_tokens" not in st.session_state:
-    st.session_state.valid_tokens = {}
+# Prometheus /metrics endpoint, when ATTENDANCE_METRICS_PORT is set
+serve_metrics()
 
 # UI Setup
 st.set_page_config(page_title="Employee Attendance Tracker", layout="wide")
@@ -26,7 +25,7 @@ cross_platform_info()
 st.title("📋 Employee Attendance Tracker with QR")
 
 # Tabs
-tabs = st.tabs(["Scan QR", "Real-Time Dashboard", "Add/Remove Employees", "Profiles", "Export"])
+tabs = st.tabs(["Scan QR", "Real-Time Dashboard", "Add/Remove Employees", "Profiles", "Export", "Metrics"])
 
 # ------------------- TAB 1: QR Scan ------------------ #
 with tabs[0]:
@@ -34,56 +33,54 @@ with tabs[0]:
     uploaded_file = st.file_uploader("Upload or scan QR code:", type=["png", "jpg", "jpeg"])
 
     if uploaded_file:
-        token = decode_qr_from_image(uploaded_file)
-
-        if validate_token(token, st.session_state.valid_tokens):
-            emp_id = st.session_state.valid_tokens.get(token)
-            profile = get_profile(emp_id)
+        with timer("scan_total"):
+            with timer("decode_qr"):
+                token = decode_qr_from_image(uploaded_file)
+            with timer("validate_token"):
+                emp_id = validate_token(token)
+            profile = None
+            if emp_id:
+                with timer("get_profile"):
+                    profile = get_profile(emp_id)
+            event_type = None
             if profile:
                 now = datetime.now()
-                ip = get_public_ip()
-                location = get_geo_location(ip)
-                
-                # Determine check-in or check-out
-                today_logs = [log for log in st.session_state.attendance_log if log['emp_id'] == emp_id and log['date'] == now.date()]
-                if not today_logs or today_logs[-1]['type'] == "Check-Out":
-                    log_type = "Check-In"
-                else:
-                    log_type = "Check-Out"
-
-                st.session_state.attendance_log.append({
-                    "emp_id": emp_id,
-                    "name": profile['name'],
-                    "department": profile['department'],
-                    "timestamp": now,
-                    "type": log_type,
-                    "date": now.date(),
-                    "ip": ip,
-                    "location": location
-                })
-
-                st.success(f"{log_type} recorded for {profile['name']} at {now.strftime('%H:%M:%S')}")
-            else:
-                st.error("Profile not found")
+
+                # Check-in vs check-out is decided and stored in one database
+                # transaction, so concurrent sessions agree; IP/location are
+                # filled in afterwards, off the scan path
+                with timer("record_scan"):
+                    event_id, event_type = database.record_scan(emp_id, profile['Name'], profile['Department'], now)
+                    enrich_location_async(
+                        lambda ip, location, event_id=event_id: database.update_event_location(event_id, ip, location)
+                    )
+
+        if event_type is not None:
+            increment("scans_recorded")
+            st.success(f"{event_type} recorded for {profile['Name']} at {now.strftime('%H:%M:%S')}")
+        elif emp_id:
+            increment("profile_not_found")
+            st.error("Profile not found")
         else:
             st.error("Invalid or expired QR token")
 
 # ---------------- TAB 2: Real-Time Dashboard ---------------- #
 with tabs[1]:
     st.header("📊 Real-Time Attendance Dashboard")
-    df = pd.DataFrame(st.session_state.attendance_log)
+    # today's scans from every session and the kiosk API, tailed from the database
+    clocked_in, working_hours = get_live_attendance().refresh()
 
-    if not df.empty:
-        clocked_in = df.groupby("emp_id").tail(1)
-        current = clocked_in[clocked_in["type"] == "Check-In"]
+    if working_hours is not None:
         st.subheader("✅ Currently Clocked In")
-        st.dataframe(current[["emp_id", "name", "department", "timestamp"]])
+        st.dataframe(clocked_in)
+
+        st.subheader("🕒 Working Hours Summary (Today)")
+        st.dataframe(working_hours)
 
-        st.subheader("🕒 Working Hours Summary")
-        summary = calculate_working_hours(df)
-        st.dataframe(summary)
+        st.subheader("🏢 Department Totals (Today)")
+        st.dataframe(get_rollups().department_totals(datetime.now().date()))
     else:
-        st.info("No attendance records yet.")
+        st.info("No attendance records today.")
 
 # ---------------- TAB 3: Admin Controls ---------------- #
 with tabs[2]:
@@ -98,9 +95,36 @@ with tabs[2]:
             add_employee(emp_id, name, department)
             st.success(f"Added {name} ({emp_id})")
 
+    st.subheader("📥 Sync Roster from HR Export")
+    roster_file = st.file_uploader("HR roster (CSV/Excel with Employee ID, Name, Department)", type=["csv", "xlsx", "xls"])
+    remove_missing = st.checkbox("Remove employees not in the roster", value=True)
+    if roster_file is not None and st.button("Preview Sync"):
+        try:
+            st.session_state.roster_preview = sync_roster(roster_file, remove_missing=remove_missing, dry_run=True)
+        except ValueError as e:
+            st.error(str(e))
+    if "roster_preview" in st.session_state:
+        preview = st.session_state.roster_preview
+        st.write(f"Add {len(preview['added'])}, update {len(preview['updated'])}, "
+                 f"remove {len(preview['removed'])}, unchanged {preview['unchanged']}")
+        force = False
+        if preview["refused"]:
+            st.warning(preview["refused"])
+            force = st.checkbox("I checked the preview, apply anyway")
+        if roster_file is not None and st.button("Apply Sync", disabled=bool(preview["refused"]) and not force):
+            roster_file.seek(0)
+            try:
+                report = sync_roster(roster_file, remove_missing=remove_missing, force=force)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                del st.session_state.roster_preview
+                st.success(f"Roster synced in {report['seconds']}s: {len(report['added'])} added, "
+                           f"{len(report['updated'])} updated, {len(report['removed'])} removed")
+
     st.subheader("🗑 Remove Employee")
     profiles = load_profiles()
-    selected = st.selectbox("Select Employee", [p['emp_id'] for p in profiles])
+    selected = st.selectbox("Select Employee", profiles["Employee ID"].tolist())
     if st.button("Remove"):
         remove_employee(selected)
         st.warning(f"Removed employee {selected}")
@@ -109,16 +133,43 @@ with tabs[2]:
 with tabs[3]:
     st.header("👤 Employee Profiles")
     profiles = load_profiles()
-    for profile in profiles:
-        st.markdown(f"**ID:** {profile['emp_id']} | **Name:** {profile['name']} | **Department:** {profile['department']}")
+    for profile in profiles.to_dict(orient="records"):
+        st.markdown(f"**ID:** {profile['Employee ID']} | **Name:** {profile['Name']} | **Department:** {profile['Department']}")
         st.divider()
 
 # ---------------- TAB 5: Export ---------------- #
 with tabs[4]:
     st.header("📤 Export Attendance Logs")
-    df = pd.DataFrame(st.session_state.attendance_log)
-    if not df.empty:
-        export_data(df)
+    events = database.EventQuery()  # streamed from the database in chunks
+    if len(events):
+        export_data(events)
     else:
         st.info("No data to export.")
 
+    st.subheader("🗄️ Attendance Archive")
+    if st.button("Archive Closed Days"):
+        result = compact_closed_days()
+        st.success(f"Archived {result['events']} events from {result['days']} days (through {result['through']})")
+    with st.form("archive_report"):
+        department = st.text_input("Department")
+        start = st.date_input("From", value=datetime.now().date() - timedelta(days=365))
+        end = st.date_input("To", value=datetime.now().date())
+        if st.form_submit_button("Monthly Hours Report") and department:
+            st.dataframe(department_monthly_summary(department, start, end))
+
+
+# ---------------- TAB 6: Metrics ---------------- #
+with tabs[5]:
+    st.header("⏱️ Scan Path Metrics")
+    metrics = snapshot()
+    if metrics["stages"]:
+        st.subheader("Stage Latency (ms)")
+        st.dataframe(pd.DataFrame(metrics["stages"]))
+        st.subheader("Counters")
+        st.dataframe(pd.DataFrame(list(metrics["counters"].items()), columns=["counter", "value"]))
+        with st.expander("Prometheus text"):
+            st.code(render_prometheus())
+        if st.button("Write metrics file"):
+            st.success(f"Wrote {write_metrics_file()}")
+    else:
+        st.info("No scans measured yet.")
@@ -0,0 +1,142 @@
+"""
+Local load test for the check-in API (backend/api.py).
+
+    python -m benchmarks.load_test --spawn --requests 20000 --concurrency 128
+
+--spawn seeds a synthetic roster into a temp directory, starts uvicorn there
+with a shared token secret, and drives it over keep-alive connections with a
+minimal asyncio HTTP/1.1 client (no extra dependencies). Prints throughput
+and latency percentiles; --out appends the result as a JSON line.
+"""
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _post(reader, writer, host, path, body):
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def _worker(url, tokens, latencies, statuses):
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    try:
+        while tokens:
+            body = json.dumps({"token": tokens.pop()}).encode()
+            started = time.perf_counter()
+            status = await _post(reader, writer, url.netloc, "/checkin", body)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load(base_url, tokens, concurrency):
+    url = urlparse(base_url)
+    latencies, statuses = [], {}
+    tokens = list(tokens)
+    started = time.perf_counter()
+    await asyncio.gather(*[_worker(url, tokens, latencies, statuses) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def pct(q):
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2) if latencies else None
+
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": pct(0.5),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "statuses": statuses,
+    }
+
+
+def _wait_for(url, timeout=30):
+    import urllib.request
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url + "/health", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"API at {url} did not come up")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the check-in API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=128)
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--spawn", action="store_true", help="start a local API server for the run")
+    parser.add_argument("--out", help="append the result as a JSON line to this file")
+    args = parser.parse_args(argv)
+
+    secret = os.environ.setdefault("ATTENDANCE_TOKEN_SECRET", secrets.token_hex(16))
+    sys.path.insert(0, REPO_ROOT)
+    from benchmarks.synthetic import make_roster
+    from utils import database, profile, security
+
+    roster = make_roster(args.employees)
+    ids = roster["Employee ID"].tolist()
+    tokens = [security.generate_one_time_token(ids[i % len(ids)]) for i in range(args.requests)]
+
+    server = None
+    workdir = tempfile.TemporaryDirectory()
+    try:
+        if args.spawn:
+            db_file = os.path.join(workdir.name, "attendance.db")
+            database.configure(db_file)
+            profile.save_profiles(roster)
+            port = urlparse(args.url).port
+            env = dict(os.environ, ATTENDANCE_TOKEN_SECRET=secret, ATTENDANCE_DB=db_file, PYTHONPATH=REPO_ROOT)
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "backend.api:app", "--port", str(port),
+                 "--log-level", "warning", "--no-access-log"],
+                cwd=workdir.name, env=env,
+            )
+            _wait_for(args.url)
+
+        result = asyncio.run(run_load(args.url, tokens, args.concurrency))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        workdir.cleanup()
+
+    print(json.dumps(result, indent=2))
+    if args.out:
+        with open(args.out, "a") as f:
+            f.write(json.dumps(dict(result, run_at=time.strftime("%Y-%m-%dT%H:%M:%S"))) + "\n")
+
+
+if __name__ == "__main__":
+    main()
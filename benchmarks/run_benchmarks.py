@@ -0,0 +1,159 @@
+"""
+Attendance pipeline benchmarks.
+
+    python -m benchmarks.run_benchmarks --events 100000 --employees 5000
+
+Each run appends one JSON line (metadata + per-stage timings and peak
+memory) to the results file so runs can be compared over time.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import synthetic
+from utils import admin_control, calculator, database, notification, profile, qrcode_utils, security
+
+DEFAULT_RESULTS = os.path.join(os.path.dirname(__file__), "results.jsonl")
+BENCH_CONFIG = {"Office Start": "09:00:00", "Office End": "17:00:00", "Daily Hours Required": 8}
+
+
+def measure(name, fn, items, trace_memory=True):
+    """
+    Time fn untraced, then (optionally) run it again under tracemalloc for
+    peak memory, since tracing itself slows Python-heavy stages several-fold.
+    """
+    started = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    result = {
+        "stage": name,
+        "items": items,
+        "seconds": round(seconds, 4),
+        "items_per_sec": round(items / seconds, 1) if seconds else None,
+        "peak_mb": None if peak is None else round(peak / 2**20, 2),
+    }
+    peak_text = "n/a" if peak is None else f"{result['peak_mb']:.2f}"
+    print(f"{name:<22} {result['seconds']:>9.4f}s  {peak_text:>9} MB  {items:>10,} items")
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            text=True, stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(n_events, n_employees, n_images, workdir, seed=0, stages=None):
+    roster = synthetic.make_roster(n_employees, seed)
+    events = synthetic.make_events(roster, n_events, seed=seed)
+    sheet = synthetic.make_daily_sheet(events)
+    ids = roster["Employee ID"].tolist()
+    want = (lambda name: stages is None or name in stages)
+    results = []
+
+    if want("qr_decode") and n_images:
+        tokens = [security.generate_one_time_token(emp_id) for emp_id in ids[:n_images]]
+        paths = synthetic.make_qr_images(tokens, os.path.join(workdir, "qr"))
+        results.append(measure("qr_decode", lambda: qrcode_utils.decode_qr_batch(paths), len(paths)))
+
+    if want("token_validation"):
+        tokens = [security.generate_one_time_token(ids[i % len(ids)]) for i in range(min(n_events, 100000))]
+
+        def validate_all():
+            # fresh replay cache per run, otherwise the traced rerun only sees replays
+            cache = security.ReplayCache()
+            return [security.validate_token(t, cache) for t in tokens]
+
+        results.append(measure("token_validation", validate_all, len(tokens)))
+
+    if want("profile_lookup"):
+        database.configure(os.path.join(workdir, "attendance.db"))
+        profile.save_profiles(roster)
+        profile.invalidate_profile_cache()
+        profile.get_profile(ids[0])  # warm the index once, as the app does
+        lookups = [ids[i % len(ids)] for i in range(min(n_events, 100000))]
+        results.append(measure("profile_lookup", lambda: [profile.get_profile(e) for e in lookups], len(lookups)))
+
+    if want("roster_sync"):
+        runs = iter(range(1000))
+
+        def sync_into_empty_db():
+            # fresh database per run, otherwise the traced rerun finds nothing to change
+            database.configure(os.path.join(workdir, f"roster_{next(runs)}.db"))
+            return profile.sync_roster(roster)
+
+        results.append(measure("roster_sync", sync_into_empty_db, len(roster)))
+
+    if want("session_pairing"):
+        results.append(measure("session_pairing", lambda: calculator.pair_sessions(events), len(events)))
+
+    if want("hours_calculation"):
+        results.append(measure("hours_calculation", lambda: calculator.process_attendance_dataframe(sheet.copy()), len(sheet)))
+
+    if want("alert_detection"):
+        results.append(measure("alert_detection", lambda: notification.detect_alert_flags(sheet, BENCH_CONFIG), len(sheet)))
+
+    if want("monthly_summary"):
+        processed = calculator.process_attendance_dataframe(sheet.copy())
+        results.append(measure("monthly_summary", lambda: calculator.generate_monthly_summary(processed), len(processed)))
+
+    for fmt, exporter in admin_control.EXPORTERS.items():
+        stage = "export_" + fmt.lower().replace(" ", "_").replace("(", "").replace(")", "")
+        if not want(stage):
+            continue
+        # PDF is page-bound; cap it so a 1M-event run finishes
+        source = events.head(20000) if fmt == "PDF" else events
+        suffix = {"CSV": ".csv", "CSV (gzip)": ".csv.gz", "Excel": ".xlsx", "Parquet": ".parquet", "PDF": ".pdf"}[fmt]
+        path = os.path.join(workdir, "export" + suffix)
+        try:
+            results.append(measure(stage, lambda: exporter(source, path), len(source)))
+        except ImportError as e:
+            print(f"{stage:<22} skipped ({e})")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the attendance pipeline on synthetic data.")
+    parser.add_argument("--events", type=int, default=100000, help="number of raw scan events (1k to 1M)")
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--images", type=int, default=50, help="QR images to decode (0 to skip)")
+    parser.add_argument("--stages", nargs="*", help="only run these stages")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=DEFAULT_RESULTS, help="JSON-lines results file to append to")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        stages = run(args.events, args.employees, args.images, workdir, args.seed, args.stages)
+
+    record = {
+        "run_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "params": {"events": args.events, "employees": args.employees, "images": args.images, "seed": args.seed},
+        "stages": stages,
+    }
+    with open(args.out, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"Results appended to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
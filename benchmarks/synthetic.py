@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.attendance_log import CHECK_IN, CHECK_OUT
+from utils.calculator import pair_sessions
+
+# -------------------------------
+# 🧪 Synthetic Attendance Workloads
+# -------------------------------
+
+DEPARTMENTS = ["Engineering", "Sales", "Support", "Finance", "HR", "Operations", "Marketing", "Legal"]
+
+
+def make_roster(n_employees, seed=0):
+    """
+    Roster with the same columns as employee_profiles.csv.
+    """
+    rng = np.random.default_rng(seed)
+    ids = [f"E{i:06d}" for i in range(n_employees)]
+    return pd.DataFrame({
+        "Employee ID": ids,
+        "Name": [f"Employee {i}" for i in range(n_employees)],
+        "Department": rng.choice(DEPARTMENTS, size=n_employees),
+    })
+
+
+def make_events(roster, n_events, start="2024-01-01", burst_fraction=0.8, duplicate_rate=0.02, seed=0):
+    """
+    Raw Check-In/Check-Out events in the backend log's column layout.
+    Each shift is a check-in/check-out pair. `burst_fraction` of shifts start
+    and end inside the 09:00 / 17:00 shift-change windows (±15 min); the rest
+    are spread over the day. A small share of scans is duplicated.
+    """
+    rng = np.random.default_rng(seed)
+    n_shifts = max(1, n_events // 2)
+    emp_idx = rng.integers(0, len(roster), size=n_shifts)
+    # spread shifts over enough days that each employee has ~one shift per day
+    n_days = max(1, int(np.ceil(n_shifts / len(roster))))
+    day = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, n_days, size=n_shifts), unit="D")
+
+    burst = rng.random(n_shifts) < burst_fraction
+    in_s = np.where(burst, 9 * 3600 + rng.normal(0, 300, n_shifts), rng.uniform(6 * 3600, 12 * 3600, n_shifts))
+    length = np.where(burst, 8 * 3600 + rng.normal(0, 600, n_shifts), rng.uniform(3600, 10 * 3600, n_shifts))
+    out_s = np.minimum(in_s + length, 24 * 3600 - 1)
+
+    check_in = day + pd.to_timedelta(in_s.astype(int), unit="s")
+    check_out = day + pd.to_timedelta(out_s.astype(int), unit="s")
+
+    emp = roster.iloc[np.concatenate([emp_idx, emp_idx])].reset_index(drop=True)
+    events = pd.DataFrame({
+        "emp_id": emp["Employee ID"],
+        "name": emp["Name"],
+        "department": emp["Department"],
+        "timestamp": np.concatenate([check_in.to_numpy(), check_out.to_numpy()]),
+        "type": [CHECK_IN] * n_shifts + [CHECK_OUT] * n_shifts,
+    })
+    dupes = events.sample(frac=duplicate_rate, random_state=seed)
+    dupes = dupes.assign(timestamp=dupes["timestamp"] + pd.Timedelta(seconds=5))
+    events = pd.concat([events, dupes], ignore_index=True).sort_values("timestamp", ignore_index=True)
+    events["date"] = events["timestamp"].dt.date
+    return events
+
+
+def make_daily_sheet(events):
+    """
+    Pre-paired daily sheet in the calculator's format
+    (Employee ID, Name, Date, Check-in Time, Check-out Time).
+    """
+    sessions = pair_sessions(events)
+    names = events.drop_duplicates("emp_id").set_index("emp_id")["name"]
+    return pd.DataFrame({
+        "Employee ID": sessions["emp_id"],
+        "Name": sessions["emp_id"].map(names),
+        "Date": pd.to_datetime(sessions["date"]).dt.strftime("%Y-%m-%d"),
+        "Check-in Time": sessions["check_in"].dt.strftime("%H:%M:%S"),
+        "Check-out Time": sessions["check_out"].dt.strftime("%H:%M:%S"),
+    })
+
+
+def make_qr_images(payloads, folder, size=1600):
+    """
+    Write one phone-photo-sized PNG per payload (QR pasted on a larger canvas).
+    """
+    from PIL import Image
+    from utils.qrcode_utils import generate_qr_code
+    import io
+
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i, data in enumerate(payloads):
+        qr = Image.open(io.BytesIO(generate_qr_code(data))).convert("L")
+        canvas = Image.new("L", (size, size), 255)
+        canvas.paste(qr, ((size - qr.width) // 2, (size - qr.height) // 2))
+        path = os.path.join(folder, f"qr_{i:05d}.png")
+        canvas.save(path)
+        paths.append(path)
+    return paths
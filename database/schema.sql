@@ -1 +1,58 @@
+-- Attendance Tracker schema (SQLite, WAL mode)
 
+PRAGMA journal_mode = WAL;
+
+CREATE TABLE IF NOT EXISTS employees (
+    emp_id      TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    department  TEXT,
+    updated_at  TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_employees_department ON employees (department);
+
+CREATE TABLE IF NOT EXISTS attendance_events (
+    id          INTEGER PRIMARY KEY,
+    emp_id      TEXT NOT NULL,
+    name        TEXT,
+    department  TEXT,
+    date        TEXT NOT NULL,            -- YYYY-MM-DD
+    timestamp   TEXT NOT NULL,            -- ISO 8601
+    type        TEXT NOT NULL CHECK (type IN ('Check-In', 'Check-Out')),
+    ip          TEXT,
+    location    TEXT                      -- JSON
+);
+
+CREATE INDEX IF NOT EXISTS idx_events_emp_date ON attendance_events (emp_id, date);
+CREATE INDEX IF NOT EXISTS idx_events_date_department ON attendance_events (date, department);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id          INTEGER PRIMARY KEY,
+    emp_id      TEXT NOT NULL,
+    department  TEXT,
+    date        TEXT NOT NULL,
+    check_in    TEXT NOT NULL,
+    check_out   TEXT NOT NULL,
+    hours       REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_sessions_emp_date ON sessions (emp_id, date);
+CREATE INDEX IF NOT EXISTS idx_sessions_date_department ON sessions (date, department);
+
+-- Running totals per employee/day, employee/month and department/day,
+-- updated in the same transaction as each event
+CREATE TABLE IF NOT EXISTS rollups (
+    scope       TEXT NOT NULL,            -- 'emp_day' | 'emp_month' | 'dept_day'
+    period      TEXT NOT NULL,            -- YYYY-MM-DD or YYYY-MM
+    key         TEXT NOT NULL,            -- emp_id or department
+    hours       REAL NOT NULL DEFAULT 0,
+    sessions    INTEGER NOT NULL DEFAULT 0,
+    events      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, period, key)
+) WITHOUT ROWID;
+
+-- Office-hour settings plus internal counters (e.g. employees_version)
+CREATE TABLE IF NOT EXISTS config (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL
+);
@@ -1 +1,6 @@
+-- Default settings; existing values are kept
 
+INSERT OR IGNORE INTO config (key, value) VALUES ('Office Start', '09:00:00');
+INSERT OR IGNORE INTO config (key, value) VALUES ('Office End', '17:00:00');
+INSERT OR IGNORE INTO config (key, value) VALUES ('Daily Hours Required', '8');
+INSERT OR IGNORE INTO config (key, value) VALUES ('employees_version', '0');
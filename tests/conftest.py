@@ -0,0 +1,16 @@
+import pytest
+
+from utils import database, profile
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    A fresh SQLite database for one test.
+    """
+    original = database.DB_FILE
+    database.configure(str(tmp_path / "attendance.db"))
+    profile.invalidate_profile_cache()
+    yield database
+    database.configure(original)
+    profile.invalidate_profile_cache()
@@ -0,0 +1,42 @@
+import json
+import time
+
+from utils.activity_log import ActivityLogger
+
+
+def _logger(tmp_path, **kwargs):
+    kwargs.setdefault("legacy_path", str(tmp_path / "activity_log.txt"))
+    return ActivityLogger(path=str(tmp_path / "activity.jsonl"), flush_seconds=0.01, **kwargs)
+
+
+def test_legacy_log_imported_once(tmp_path):
+    legacy = tmp_path / "activity_log.txt"
+    legacy.write_text("2024-01-02 09:00:00: User admin logged in\n2024-01-02 09:05:00: EDA performed\n")
+    (tmp_path / "activity.jsonl").write_text(json.dumps({"ts": "2024-02-01 10:00:00", "user": "bob", "action": "new"}) + "\n")
+
+    logger = _logger(tmp_path)
+    assert not legacy.exists() and (tmp_path / "activity_log.txt.migrated").exists()
+    assert [r["action"] for r in logger.tail()] == ["new", "EDA performed", "User admin logged in"]
+
+    logger = _logger(tmp_path)  # restart: nothing is imported again
+    assert len(logger.tail()) == 3
+
+
+def test_age_rotation_survives_restart(tmp_path):
+    path = tmp_path / "activity.jsonl"
+    path.write_text(json.dumps({"ts": "2024-01-01 00:00:00", "user": None, "action": "old"}) + "\n")
+    logger = _logger(tmp_path, rotate_seconds=3600)
+    logger.log("fresh", user="amy")
+    logger.flush()
+    assert (tmp_path / "activity.jsonl.1").exists()
+    assert [r["action"] for r in logger.tail()] == ["fresh", "old"]
+
+
+def test_recent_file_is_not_rotated(tmp_path):
+    path = tmp_path / "activity.jsonl"
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    path.write_text(json.dumps({"ts": now, "user": None, "action": "recent"}) + "\n")
+    logger = _logger(tmp_path, rotate_seconds=3600)
+    logger.log("fresh")
+    logger.flush()
+    assert not (tmp_path / "activity.jsonl.1").exists()
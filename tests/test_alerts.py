@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from utils import notification
+
+CONFIG = pd.Series({"Office Start": "09:00:00", "Office End": "17:00:00", "Daily Hours Required": 8})
+
+
+def test_bitmask_alerts_match_row_wise_detect_alerts():
+    rng = np.random.default_rng(11)
+    n = 5000
+    times = [f"{h:02d}:{m:02d}:{s:02d}" for h, m, s in
+             zip(rng.integers(0, 24, n), rng.integers(0, 60, n), rng.integers(0, 60, n))]
+    df = pd.DataFrame({"Check-in Time": times, "Check-out Time": times[::-1]}, dtype=object)
+    df.loc[::13, "Check-in Time"] = None
+    df.loc[::17, "Check-out Time"] = ""
+    df.loc[::19, "Check-in Time"] = "garbage"
+
+    expected = df.apply(notification.detect_alerts, axis=1)
+    flags = notification.detect_alert_flags(df, CONFIG)
+    assert flags.dtype == np.uint8
+    assert notification.render_alerts(flags).tolist() == expected.tolist()
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from backend import api
+from utils.security import generate_one_time_token
+
+
+async def _call(method, path, body=b"", headers=()):
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers), "client": ("10.0.0.1", 1)}
+    await api.app(scope, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def _checkin(token):
+    return _call("POST", "/checkin", json.dumps({"token": token}).encode(), [(b"content-type", b"application/json")])
+
+
+@pytest.fixture
+def employee(db):
+    db.upsert_employee("E1", "Ada", "Eng")
+    yield "E1"
+    api._shutdown()
+
+
+def test_profile_lookup_does_not_block_the_event_loop(employee, monkeypatch):
+    release = threading.Event()
+    get_profile = api.get_profile
+
+    def slow_profile(emp_id):
+        release.wait(5)
+        return get_profile(emp_id)
+
+    monkeypatch.setattr(api, "get_profile", slow_profile)
+
+    async def scenario():
+        checkin = asyncio.ensure_future(_checkin(generate_one_time_token(employee)))
+        health = await asyncio.wait_for(_call("GET", "/health"), timeout=2)
+        release.set()
+        return health, await checkin
+
+    health, (status, payload) = asyncio.run(scenario())
+    assert health[0] == 200
+    assert status == 200 and payload["type"] == "Check-In"
+
+
+def test_type_is_decided_from_the_database_across_restarts(employee):
+    status, first = asyncio.run(_checkin(generate_one_time_token(employee)))
+    assert status == 200 and first["type"] == "Check-In"
+
+    api._shutdown()
+    api._writer = None  # a fresh worker process has no in-memory state
+    status, second = asyncio.run(_checkin(generate_one_time_token(employee)))
+    assert status == 200 and second["type"] == "Check-Out"
+    assert [e["type"] for e in api.database.query_events(emp_id=employee)] == ["Check-In", "Check-Out"]
+
+
+def test_rejects_invalid_token_and_unknown_employee(employee):
+    assert asyncio.run(_checkin("not-a-token"))[0] == 401
+    assert asyncio.run(_checkin(generate_one_time_token("nobody")))[0] == 404
+
+
+def test_unreadable_image_is_rejected(employee):
+    headers = [(b"content-type", b"image/png")]
+    status, payload = asyncio.run(_call("POST", "/checkin", b"garbage", headers))
+    assert status == 422 and "readable image" in payload["error"]
+
+
+def test_writer_survives_unexpected_errors(employee, monkeypatch):
+    record_scans = api.database.record_scans
+    monkeypatch.setattr(api.database, "record_scans", lambda scans: 1 / 0)
+    status, payload = asyncio.run(_checkin(generate_one_time_token(employee)))
+    assert status == 503
+
+    monkeypatch.setattr(api.database, "record_scans", record_scans)
+    status, payload = asyncio.run(_checkin(generate_one_time_token(employee)))
+    assert status == 200 and payload["type"] == "Check-In"
+    assert api._writer._thread.is_alive()
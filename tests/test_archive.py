@@ -0,0 +1,52 @@
+import glob
+import os
+from datetime import date, datetime, timedelta
+
+from utils import archive
+
+
+def _seed(db, days):
+    scans = []
+    for day in days:
+        for emp_id, dept in (("E1", "Eng"), ("E2", "Ops")):
+            scans += [(emp_id, emp_id.lower(), dept, datetime.combine(day, datetime.min.time()) + timedelta(hours=h), None, None)
+                      for h in (9, 17)]
+    db.record_scans(scans)
+
+
+def test_compaction_is_incremental_and_partitioned(db, tmp_path):
+    out = str(tmp_path / "archive")
+    _seed(db, [date(2024, 1, 30), date(2024, 1, 31), date(2024, 2, 1)])
+
+    first = archive.compact_closed_days(date(2024, 1, 31), archive_dir=out)
+    assert first == {"days": 2, "events": 8, "through": "2024-01-31"}
+    assert archive.compact_closed_days(date(2024, 1, 31), archive_dir=out)["events"] == 0
+    archive.compact_closed_days(date(2024, 2, 1), archive_dir=out, purge=True)
+
+    # closed months are merged to one file per department
+    assert len(glob.glob(os.path.join(out, "month=2024-01", "department=Eng", "*.parquet"))) == 1
+    # purge only drops the days archived by that run
+    assert {str(e["date"]) for e in db.query_events()} == {"2024-01-30", "2024-01-31"}
+    assert len(archive.query_archive(archive_dir=out)) == 12
+
+
+def test_queries_filter_by_partition_and_columns(db, tmp_path):
+    out = str(tmp_path / "archive")
+    _seed(db, [date(2024, 1, 31), date(2024, 2, 1), date(2024, 2, 2)])
+    archive.compact_closed_days(date(2024, 2, 2), archive_dir=out)
+
+    events = archive.query_archive(department="Eng", start="2024-02-01", end="2024-02-01",
+                                   columns=["emp_id", "type"], archive_dir=out)
+    assert list(events.columns) == ["emp_id", "type"]
+    assert events["emp_id"].tolist() == ["E1", "E1"]
+    assert archive.query_archive(emp_id="E2", archive_dir=out)["emp_id"].eq("E2").all()
+    assert archive.query_archive(archive_dir=str(tmp_path / "missing")).empty
+
+
+def test_department_monthly_summary(db, tmp_path):
+    out = str(tmp_path / "archive")
+    _seed(db, [date(2024, 1, 30), date(2024, 1, 31)])
+    archive.compact_closed_days(date(2024, 1, 31), archive_dir=out)
+    summary = archive.department_monthly_summary("Ops", "2024-01-01", "2024-01-31", archive_dir=out)
+    assert summary["Employee ID"].tolist() == ["E2"]
+    assert summary["Hours Worked"].tolist() == [16.0]
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from utils.attendance_log import CHECK_IN, CHECK_OUT, AttendanceLog
+
+
+def test_types_alternate_per_day():
+    log = AttendanceLog()
+    day = datetime(2024, 3, 4)
+    kinds = [log.record("E1", "Ada", "Eng", day.replace(hour=h)).type for h in (9, 12, 13, 17)]
+    assert kinds == [CHECK_IN, CHECK_OUT, CHECK_IN, CHECK_OUT]
+    # an open check-in does not carry over to the next day
+    log.record("E1", "Ada", "Eng", datetime(2024, 3, 5, 9))
+    assert log.record("E1", "Ada", "Eng", datetime(2024, 3, 6, 9)).type == CHECK_IN
+
+
+def test_indexes_follow_appends():
+    log = AttendanceLog()
+    log.record("E1", "Ada", "Eng", datetime(2024, 3, 4, 9))
+    version = log.version
+    log.record("E2", "Bob", "Ops", datetime(2024, 3, 4, 10))
+    log.record("E1", "Ada", "Eng", datetime(2024, 3, 4, 17))
+
+    assert len(log) == 3
+    assert [e.emp_id for e in log.clocked_in()] == ["E2"]
+    assert log.last_event("E1").type == CHECK_OUT
+    assert sorted(log.changed_since(version)) == ["E1", "E2"]
+    assert [e.type for e in log.events_for_employee("E1")] == [CHECK_IN, CHECK_OUT]
+
+
+def test_database_decision_overrides_and_locations_are_shared():
+    log = AttendanceLog()
+    first = log.record("E1", "Ada", "Eng", datetime(2024, 3, 4, 9), type=CHECK_OUT, id=7)
+    assert first.type == CHECK_OUT and first.id == 7
+    second = log.record("E2", "Bob", "Ops", datetime(2024, 3, 4, 9))
+    log.set_location(first, "10.0.0.1", {"city": "Oslo"})
+    log.set_location(second, "10.0.0.1", {"city": "Oslo"})
+    assert first.location is second.location
+    assert log.to_records()[0]["location"] == {"city": "Oslo"}
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from utils import calculator
+
+
+def _times(seconds):
+    return [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in seconds]
+
+
+def _row_wise(df):
+    """
+    The pre-vectorization implementation: one scalar call per row.
+    """
+    out = pd.DataFrame(index=df.index)
+    out["Hours Worked"] = df.apply(
+        lambda row: calculator.get_working_hours(row["Check-in Time"], row["Check-out Time"]), axis=1
+    )
+    out["Late Arrival"] = df["Check-in Time"].apply(calculator.check_late)
+    out["Early Logout"] = df["Check-out Time"].apply(calculator.check_early_logout)
+    out["Overtime"] = out["Hours Worked"].apply(calculator.check_overtime)
+    return out
+
+
+def test_vectorized_matches_row_wise_output():
+    rng = np.random.default_rng(7)
+    n = 20000
+    check_in = rng.integers(0, 24 * 3600, n)
+    check_out = rng.integers(0, 24 * 3600, n)  # includes overnight shifts
+    df = pd.DataFrame({"Check-in Time": _times(check_in), "Check-out Time": _times(check_out)})
+    df.loc[::37, "Check-in Time"] = None
+    df.loc[::41, "Check-out Time"] = "not a time"
+    df.loc[::43, "Check-out Time"] = "24:00:00"
+    df.loc[::47, "Check-in Time"] = "7:5:3"
+    df.loc[::53, "Check-out Time"] = np.nan
+
+    expected = _row_wise(df)
+    result = calculator.process_attendance_dataframe(df.copy())
+    for column in expected.columns:
+        np.testing.assert_array_equal(result[column].to_numpy(), expected[column].to_numpy(), err_msg=column)
+
+
+def test_hours_round_like_builtin_round():
+    # every whole-second duration in a day, including the x.xx5 halves
+    seconds = np.arange(0, 24 * 3600, 1, dtype="float64")
+    hours, _, _, _ = calculator.compute_attendance_metrics(np.zeros_like(seconds), seconds)
+    assert hours.tolist() == [round(s / 3600, 2) for s in range(24 * 3600)]
+
+
+def test_overnight_and_missing_values():
+    df = pd.DataFrame({
+        "Check-in Time": ["22:00:00", None, "09:30:00"],
+        "Check-out Time": ["06:00:00", "17:00:00", ""],
+    })
+    result = calculator.process_attendance_dataframe(df)
+    assert result["Hours Worked"].tolist() == [8.0, 0.0, 0.0]
+    assert result["Late Arrival"].tolist() == [True, False, True]
+    assert result["Early Logout"].tolist() == [True, False, False]
+    assert result["Overtime"].tolist() == [False, False, False]
+
+
+def test_check_overtime_rejects_non_numbers():
+    assert calculator.check_overtime(None) is False
+    assert calculator.check_overtime(9) is True
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pandas as pd
+
+from utils.attendance_log import AttendanceLog
+from utils.calculator import calculate_working_hours
+from utils.dashboard import DashboardViews
+
+
+def _scan(log, emp_id, hour, day=4):
+    log.record(emp_id, emp_id.lower(), "Eng", datetime(2024, 3, day, hour))
+
+
+def test_views_are_reused_until_the_log_changes():
+    log = AttendanceLog()
+    views = DashboardViews(log)
+    _scan(log, "E1", 9)
+    first = views.working_hours()
+    assert views.working_hours() is first
+    assert views.clocked_in() is views.clocked_in()
+    assert views.clocked_in()["emp_id"].tolist() == ["E1"]
+
+
+def test_incremental_summary_matches_full_recompute():
+    log = AttendanceLog()
+    views = DashboardViews(log)
+    for emp_id, hour in [("E1", 9), ("E2", 8), ("E1", 17)]:
+        _scan(log, emp_id, hour)
+        views.working_hours()
+    for emp_id, hour, day in [("E2", 16, 4), ("E3", 10, 4), ("E1", 9, 5)]:
+        _scan(log, emp_id, hour, day)
+
+    full = calculate_working_hours(pd.DataFrame(log.to_records()))
+    full = full.sort_values(["emp_id", "date"], kind="stable", ignore_index=True)
+    pd.testing.assert_frame_equal(views.working_hours(), full)
+    assert sorted(views.clocked_in()["emp_id"]) == ["E1", "E3"]
+
+
+def test_live_dashboard_tails_every_writer(db):
+    from datetime import date
+
+    from utils.dashboard import LiveAttendance
+
+    live = LiveAttendance()
+    day = date(2024, 5, 2)
+    assert live.refresh(day)[1] is None
+    db.record_scan("E1", "Ada", "Eng", datetime(2024, 5, 2, 9))   # e.g. another session
+    db.record_scan("E2", "Bob", "Ops", datetime(2024, 5, 2, 9))   # e.g. the kiosk API
+    clocked_in, hours = live.refresh(day)
+    assert sorted(clocked_in["emp_id"]) == ["E1", "E2"]
+
+    db.record_scan("E1", "Ada", "Eng", datetime(2024, 5, 2, 17))
+    clocked_in, hours = live.refresh(day)
+    assert clocked_in["emp_id"].tolist() == ["E2"]
+    assert hours.loc[hours["emp_id"] == "E1", "Hours Worked"].tolist() == [8.0]
+    assert len(live.log) == 3
+
+    assert live.refresh(date(2024, 5, 3))[1] is None  # new day starts empty
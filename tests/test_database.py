@@ -0,0 +1,76 @@
+import json
+import sqlite3
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+
+def test_record_scans_alternate_types_within_a_batch(db):
+    t = datetime(2024, 3, 4, 9)
+    results = db.record_scans([("E1", "Ada", "Eng", t.replace(hour=h), None, None) for h in (9, 12, 13)])
+    assert [kind for _, kind in results] == ["Check-In", "Check-Out", "Check-In"]
+    assert db.get_rollup("emp_day", "2024-03-04", "E1")["sessions"] == 1
+
+
+def test_failed_commit_rolls_back_before_returning_the_connection(db, monkeypatch):
+    pool = db.get_pool()
+
+    class FailingCommit:
+        def __init__(self, conn):
+            self._conn = conn
+
+        def execute(self, sql, *args):
+            if sql == "COMMIT":
+                raise sqlite3.OperationalError("database is locked")
+            return self._conn.execute(sql, *args)
+
+        def __getattr__(self, name):
+            return getattr(self._conn, name)
+
+    real = pool.connection
+    monkeypatch.setattr(pool, "connection", lambda: _wrap(real(), FailingCommit))
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.transaction(immediate=True) as conn:
+            conn.execute("INSERT INTO config (key, value) VALUES ('k', 'v')")
+    monkeypatch.undo()
+
+    with pool.connection() as conn:
+        assert not conn.in_transaction
+    assert "k" not in db.get_config()
+    db.set_config({"other": "1"})  # the write lock was released
+
+
+def _wrap(context, wrapper):
+    from contextlib import contextmanager
+
+    @contextmanager
+    def wrapped():
+        with context as conn:
+            yield wrapper(conn)
+    return wrapped()
+
+
+def test_migration_runs_once(db, tmp_path):
+    profiles = tmp_path / "profiles.csv"
+    profiles.write_text("Employee ID,Name,Department\nE1,Ada,Eng\n")
+    # the Export tab's CSV, as the original app wrote it from its session log
+    events = tmp_path / "attendance_log.csv"
+    pd.DataFrame([
+        {"emp_id": "E1", "name": "Ada", "department": "Eng", "timestamp": datetime(2024, 3, 4, 9, 0, 0, 123456),
+         "type": "Check-In", "date": date(2024, 3, 4), "ip": "203.0.113.9", "location": {"city": "Pune"}},
+        {"emp_id": "E1", "name": "Ada", "department": "Eng", "timestamp": datetime(2024, 3, 4, 17),
+         "type": "Check-Out", "date": date(2024, 3, 4), "ip": None, "location": None},
+    ]).to_csv(events, index=False)
+    args = (str(profiles), str(tmp_path / "missing.csv"), str(events))
+
+    assert db.migrate_from_csv(*args) == {"employees": 1, "config": 0, "events": 2}
+    db.upsert_employee("E1", "Ada Lovelace", "Eng")
+    assert db.migrate_from_csv(*args) == {"employees": 0, "config": 0, "events": 0}
+    assert db.get_employee("E1")["Name"] == "Ada Lovelace"
+
+    assert db.migrate_from_csv(*args, force=True)["events"] == 0
+    assert len(db.query_events(emp_id="E1")) == 2
+    assert db.get_rollup("emp_day", "2024-03-04", "E1")["hours"] == pytest.approx(8, abs=1e-4)
+    first = db.query_events(emp_id="E1")[0]
+    assert json.loads(first["location"]) == {"city": "Pune"} and first["ip"] == "203.0.113.9"
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import eda
+
+
+def _frame(rows=5000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "a": rng.exponential(size=rows),
+        "b": np.where(rng.random(rows) < 0.1, np.nan, rng.normal(100, 5, size=rows)),
+        "dept": rng.choice(["ops", "eng", "hr"], size=rows),
+    })
+
+
+def test_streaming_moments_match_pandas():
+    data = _frame()
+    summary = eda.profile_dataset(data, approximate=False)["summary"]
+    numeric = data[["a", "b"]]
+    expected = pd.DataFrame({
+        "count": numeric.count().astype(float), "mean": numeric.mean(), "std": numeric.std(),
+        "min": numeric.min(), "max": numeric.max(), "skew": numeric.skew(), "kurtosis": numeric.kurt(),
+    })
+    pd.testing.assert_frame_equal(summary[expected.columns], expected, rtol=1e-9)
+
+
+def test_approx_distinct_is_within_a_few_percent():
+    values = pd.Series(np.arange(200_000) % 50_000)
+    assert eda.approx_distinct(values) == pytest.approx(50_000, rel=0.03)
+    assert eda.approx_distinct(pd.Series(["x", "y", None, "x"])) == 2
+
+
+def test_profile_is_cached_by_content():
+    data = _frame(500)
+    first = eda.profile_dataset(data)
+    assert eda.profile_dataset(data.copy()) is first
+    changed = data.copy()
+    changed.loc[0, "a"] = -1.0
+    assert eda.dataset_fingerprint(changed) != eda.dataset_fingerprint(data)
+    assert eda.profile_dataset(changed) is not first
+
+
+def test_approximate_value_counts_are_scaled(monkeypatch):
+    monkeypatch.setattr(eda, "SAMPLE_ROWS", 1000)
+    data = _frame(10_000)
+    profile = eda.profile_dataset(data, approximate=True)
+    assert profile["approximate"] and profile["shape"] == (10_000, 3)
+    counts = profile["value_counts"]["dept"]
+    assert counts.sum() == pytest.approx(10_000, abs=5)
+    assert counts.to_dict() == pytest.approx(data["dept"].value_counts().to_dict(), rel=0.15)
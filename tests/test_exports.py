@@ -0,0 +1,93 @@
+import gzip
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import admin_control
+from utils.attendance_log import CHECK_IN, AttendanceLog
+
+
+def _frame(n=250):
+    start = datetime(2024, 1, 1, 9)
+    df = pd.DataFrame({
+        "emp_id": [f"E{i % 7}" for i in range(n)],
+        "timestamp": [start + timedelta(minutes=i) for i in range(n)],
+        "hours": np.linspace(0, 10, n),
+        "ip": [None] * 100 + ["10.0.0.1"] * (n - 100),           # all-null in the first chunk
+        "note": [np.nan] * 150 + ["late"] * (n - 150),
+    })
+    df.loc[5, "timestamp"] = pd.NaT
+    return df
+
+
+def test_csv_and_gzip_match_pandas(tmp_path):
+    df = _frame()
+    expected = df.to_csv(index=False)
+    path = admin_control.export_to_csv(df, str(tmp_path / "a.csv"), chunksize=64)
+    assert open(path, newline="").read() == expected
+    path = admin_control.export_to_csv_gz(df, str(tmp_path / "a.csv.gz"), chunksize=64)
+    with gzip.open(path, "rt", newline="") as f:
+        assert f.read() == expected
+
+
+def test_parquet_handles_columns_null_in_first_chunk(tmp_path):
+    df = _frame()
+    path = admin_control.export_to_parquet(df, str(tmp_path / "a.parquet"), chunksize=64)
+    back = pd.read_parquet(path)
+    assert len(back) == len(df)
+    assert back["ip"].isna().sum() == 100 and (back["ip"].dropna() == "10.0.0.1").all()
+    assert back["note"].isna().sum() == 150
+    np.testing.assert_allclose(back["hours"], df["hours"])
+
+
+def test_parquet_from_attendance_log_with_locations(tmp_path):
+    log = AttendanceLog()
+    for i in range(30):
+        event = log.record(f"E{i % 3}", "N", "Ops", datetime(2024, 1, 1, 9) + timedelta(minutes=i))
+        if i >= 20:
+            log.set_location(event, "10.0.0.1", {"city": "Pune"})
+    path = admin_control.export_to_parquet(log, str(tmp_path / "log.parquet"), chunksize=10)
+    back = pd.read_parquet(path)
+    assert len(back) == 30
+    assert back["location"].iloc[-1] == str({"city": "Pune"})
+    assert back["type"].iloc[0] == CHECK_IN
+
+
+def test_pdf_with_missing_values(tmp_path):
+    path = admin_control.export_to_pdf(_frame(), str(tmp_path / "a.pdf"), chunksize=64)
+    with open(path, "rb") as f:
+        assert f.read(5) == b"%PDF-"
+
+
+def test_excel_round_trip(tmp_path):
+    pytest.importorskip("xlsxwriter")
+    pytest.importorskip("openpyxl")
+    df = _frame(50)
+    path = admin_control.export_to_excel(df, str(tmp_path / "a.xlsx"), chunksize=16)
+    back = pd.read_excel(path)
+    assert back.shape == df.shape
+    assert back["emp_id"].tolist() == df["emp_id"].tolist()
+
+
+def test_progress_is_reported(tmp_path):
+    seen = []
+    admin_control.export_to_csv(_frame(), str(tmp_path / "p.csv"), chunksize=100,
+                                progress=lambda done, total: seen.append((done, total)))
+    assert seen == [(100, 250), (200, 250), (250, 250)]
+
+
+def test_exports_stream_from_the_database(db, tmp_path):
+    for hour in range(8, 18):
+        db.record_scan(f"E{hour % 3}", "x", "Ops", datetime(2024, 5, 2, hour))
+    events = db.EventQuery(start="2024-05-02", end="2024-05-02")
+    seen = []
+    csv = admin_control.export_to_csv(events, str(tmp_path / "out.csv"), chunksize=4,
+                                      progress=lambda done, total: seen.append((done, total)))
+    assert seen == [(4, 10), (8, 10), (10, 10)]
+    frame = pd.read_csv(csv)
+    assert len(frame) == 10 and frame["type"].value_counts().to_dict() == {"Check-In": 6, "Check-Out": 4}
+
+    parquet = admin_control.export_to_parquet(events, str(tmp_path / "out.parquet"), chunksize=4)
+    assert pd.read_parquet(parquet)["timestamp"].dtype.kind == "M"
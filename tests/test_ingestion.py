@@ -0,0 +1,79 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from utils import ingestion
+
+
+def _csv_bytes(rows, extra=""):
+    df = pd.DataFrame({
+        "emp_id": [f"E{i}" for i in range(rows)],
+        "department": np.resize(["Ops", "HR", "Eng"], rows),
+        "hours": np.resize([7.5, 8.0, 9.25], rows),
+        "badge": np.arange(rows),
+    })
+    return (df.to_csv(index=False) + extra).encode()
+
+
+class _Upload(io.BytesIO):
+    """
+    Stand-in for Streamlit's UploadedFile (a BytesIO with a name).
+    """
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+def test_dtypes_are_downcast_and_low_cardinality_only_categorised():
+    df, report = ingestion.ingest_dataset(_Upload(_csv_bytes(5000), "a.csv"), "a.csv", chunksize=1000)
+    assert len(df) == 5000
+    assert isinstance(df["department"].dtype, pd.CategoricalDtype)
+    assert not isinstance(df["emp_id"].dtype, pd.CategoricalDtype)  # unique per row
+    assert df["badge"].dtype == np.uint16
+    assert df["hours"].dtype == np.float32
+    assert report["optimized_mb"] < report["raw_mb"]
+
+
+def test_categories_are_decided_on_the_whole_file():
+    # "code" repeats in the first chunk but is unique everywhere after;
+    # "site" is low-cardinality throughout
+    codes = ["A"] * 1000 + [f"C{i}" for i in range(4000)]
+    df = pd.DataFrame({"code": codes, "site": np.resize(["North", "South"], 5000)})
+    upload = _Upload(df.to_csv(index=False).encode(), "b.csv")
+    out, _ = ingestion.ingest_dataset(upload, "b.csv", chunksize=1000)
+    assert not isinstance(out["code"].dtype, pd.CategoricalDtype)
+    assert out["code"].tolist() == codes
+    assert isinstance(out["site"].dtype, pd.CategoricalDtype)
+
+    # dictionary-encoded Parquet arrives categorical in every chunk,
+    # whatever its cardinality
+    buf = io.BytesIO()
+    pd.DataFrame({"code": pd.Categorical(codes), "site": df["site"]}).to_parquet(buf)
+    out, _ = ingestion.ingest_dataset(_Upload(buf.getvalue(), "c.parquet"), "c.parquet", chunksize=1000)
+    assert not isinstance(out["code"].dtype, pd.CategoricalDtype)
+    assert out["code"].tolist() == codes
+    assert isinstance(out["site"].dtype, pd.CategoricalDtype)
+
+
+def test_dataset_key_covers_the_whole_file():
+    base = _csv_bytes(100_000)
+    tail_a = base[:-20] + b"X" * 20
+    tail_b = base[:-20] + b"Y" * 20  # same name, same size, same first MB
+    assert len(base) > ingestion.HASH_BLOCK
+    key_a = ingestion._dataset_key(_Upload(tail_a, "a.csv"), "a.csv")
+    key_b = ingestion._dataset_key(_Upload(tail_b, "a.csv"), "a.csv")
+    assert key_a != key_b
+    assert key_a == ingestion._dataset_key(_Upload(tail_a, "renamed.csv"), "renamed.csv")
+
+
+def test_memory_mapped_store_is_reused_for_identical_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingestion, "DATASET_STORE", str(tmp_path))
+    data = _csv_bytes(2000)
+    first, report = ingestion.ingest_dataset(_Upload(data, "a.csv"), "a.csv", memory_map=True)
+    again, cached = ingestion.ingest_dataset(_Upload(data, "b.csv"), "b.csv", memory_map=True)
+    assert cached["cached"] is True and cached["path"] == report["path"]
+    pd.testing.assert_frame_equal(first, again)
+    changed, fresh = ingestion.ingest_dataset(_Upload(_csv_bytes(2000, "E9999,Ops,1.0,1\n"), "a.csv"), "a.csv", memory_map=True)
+    assert fresh["path"] != report["path"] and len(changed) == 2001
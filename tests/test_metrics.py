@@ -0,0 +1,52 @@
+import pytest
+
+from utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_timers_counters_and_prometheus_text():
+    for seconds in (0.0002, 0.003, 0.003, 2.0):
+        metrics.observe("decode_qr", seconds)
+    with metrics.timer("validate_token"):
+        pass
+    metrics.increment("scans_recorded", 3)
+
+    snap = metrics.snapshot()
+    stages = {s["stage"]: s for s in snap["stages"]}
+    assert stages["decode_qr"]["count"] == 4 and stages["decode_qr"]["p50_ms"] == 3.0
+    assert stages["validate_token"]["count"] == 1
+    assert snap["counters"] == {"scans_recorded": 3}
+
+    text = metrics.render_prometheus()
+    assert 'attendance_stage_seconds_bucket{stage="decode_qr",le="0.0005"} 1' in text
+    assert 'attendance_stage_seconds_bucket{stage="decode_qr",le="0.005"} 3' in text
+    assert 'attendance_stage_seconds_count{stage="decode_qr"} 4' in text
+    assert "attendance_scans_recorded_total 3" in text
+
+
+def test_timed_decorator_and_disabled_mode(monkeypatch):
+    @metrics.timed("work")
+    def work(x):
+        return x * 2
+
+    assert work(2) == 4 and work.__wrapped__(3) == 6
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    work(1)
+    metrics.increment("ignored")
+    with metrics.timer("ignored"):
+        pass
+    snap = metrics.snapshot()
+    assert [s["count"] for s in snap["stages"]] == [1] and snap["counters"] == {}
+
+
+def test_metrics_file_is_replaced_atomically(tmp_path):
+    metrics.increment("scans_recorded")
+    path = metrics.write_metrics_file(str(tmp_path / "attendance.prom"))
+    assert "attendance_scans_recorded_total 1" in open(path).read()
+    assert not (tmp_path / "attendance.prom.tmp").exists()
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+
+from utils import modeling
+
+
+def _frame(rows=60):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=rows)
+    return pd.DataFrame({"x": x, "group": rng.choice(["a", "b"], size=rows), "y": 3 * x + rng.normal(size=rows)})
+
+
+def _wait(job_id):
+    modeling._jobs[job_id]["future"].result(timeout=60)
+    return modeling.get_job(job_id)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    modeling._jobs.clear()
+    modeling._models.clear()
+    yield
+    modeling._jobs.clear()
+    modeling._models.clear()
+
+
+def test_training_reports_metrics_without_pipeline():
+    job = _wait(modeling.submit_training(_frame(), ["x", "group"], "y", "Linear Regression"))
+    assert job["status"] == "done"
+    assert job["result"]["cv_folds"] == modeling.CV_FOLDS
+    assert job["result"]["peak_mb"] is None  # tracing is opt-in
+    assert "pipeline" not in job["result"]
+
+
+def test_cached_fit_and_pipeline_lookup():
+    data = _frame()
+    first = modeling.submit_training(data, ["x"], "y", "Random Forest", {"n_estimators": 5})
+    assert _wait(first)["result"]["cached"] is False
+    second = modeling.submit_training(data, ["x"], "y", "Random Forest", {"n_estimators": 5})
+    assert modeling.get_job(second)["result"]["cached"] is True
+    assert modeling.get_pipeline(second) is modeling.get_pipeline(first) is not None
+
+
+def test_tiny_dataset_skips_cross_validation():
+    job = _wait(modeling.submit_training(_frame(rows=2), ["x"], "y", "Linear Regression"))
+    assert job["status"] == "done"
+    assert job["result"]["cv_mse"] is None and job["result"]["cv_folds"] == 0
+
+
+def test_finished_jobs_are_capped(monkeypatch):
+    monkeypatch.setattr(modeling, "MAX_JOBS", 3)
+    data = _frame()
+    _wait(modeling.submit_training(data, ["x"], "y", "Linear Regression"))
+    ids = [modeling.submit_training(data, ["x"], "y", "Linear Regression") for _ in range(5)]
+    assert len(modeling._jobs) == 3
+    assert modeling.get_job(ids[0]) is None
+    assert modeling.get_job(ids[-1])["status"] == "done"
@@ -0,0 +1,122 @@
+import socketserver
+import threading
+
+import pytest
+
+from utils import notification
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT.
+    """
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 localhost test SMTP")
+        rcpt = None
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                rcpt = command.split(":", 1)[1].strip(" <>")
+                if rcpt in server.reject:
+                    self.reply("550 mailbox unavailable")
+                else:
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 end with .")
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b".\r\n", b""):
+                        break
+                    lines.append(data)
+                server.messages.append((rcpt, b"".join(lines).decode()))
+                self.reply("250 queued")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 not implemented")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.reject = set()
+
+
+@pytest.fixture
+def smtp_server():
+    server = _SMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _queue(server, **kwargs):
+    return notification.EmailQueue("127.0.0.1", server.server_address[1], "hr@example.com",
+                                   use_ssl=False, backoff=0.0, timeout=5, **kwargs)
+
+
+def test_queue_reuses_one_connection_and_dedupes(smtp_server):
+    q = _queue(smtp_server)
+    for i in range(50):
+        assert q.enqueue(f"e{i}@example.com", "Late arrival", "You were late")
+    assert not q.enqueue("e0@example.com", "Late arrival", "You were late")
+    q.join()
+    stats = q.stats()
+    q.stop()
+    assert len(smtp_server.messages) == 50
+    assert smtp_server.connections == 1
+    assert stats["sent"] == 50 and stats["failed"] == 0 and stats["duplicates"] == 1
+
+
+def test_failed_alert_is_not_suppressed_by_dedupe(smtp_server):
+    smtp_server.reject.add("gone@example.com")
+    q = _queue(smtp_server, max_retries=1)
+    assert q.enqueue("gone@example.com", "Alert", "body")
+    q.join()
+    assert q.stats()["failed"] == 1 and q.stats()["retries"] == 1
+
+    smtp_server.reject.clear()
+    assert q.enqueue("gone@example.com", "Alert", "body")  # not dropped as a duplicate
+    q.join()
+    q.stop()
+    assert q.stats()["sent"] == 1
+    assert [rcpt for rcpt, _ in smtp_server.messages] == ["gone@example.com"]
+
+
+def test_malformed_message_fails_alone_and_worker_survives(smtp_server):
+    q = _queue(smtp_server)
+    assert q.enqueue("a@example.com", "Late\nBcc: everyone@example.com", "body")
+    assert q.enqueue("b@example.com", "Late arrival", "body")
+    q.join()
+    assert q._worker.is_alive()
+    stats = q.stats()
+    assert stats["failed"] == 1 and stats["sent"] == 1
+    assert q.enqueue("a@example.com", "Late\nBcc: everyone@example.com", "body")  # key was dropped
+    q.join()
+    q.stop()
+    assert [rcpt for rcpt, _ in smtp_server.messages] == ["b@example.com"]
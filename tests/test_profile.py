@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from utils import profile
+
+
+def _roster(rows):
+    return pd.DataFrame(rows, columns=profile.PROFILE_COLUMNS)
+
+
+@pytest.fixture
+def staff(db):
+    db.upsert_employees([(f"E{i}", f"Name {i}", "Ops") for i in range(20)] + [("N1", "No Dept", None)])
+    return db
+
+
+def test_null_department_is_not_reported_as_updated(staff):
+    rows = [(f"E{i}", f"Name {i}", "Ops") for i in range(20)] + [("N1", "No Dept", "")]
+    report = profile.sync_roster(_roster(rows))
+    assert report["updated"] == [] and report["unchanged"] == 21
+
+
+def test_blank_roster_is_refused(staff):
+    roster = _roster([("", "Someone", "Ops"), (" ", "Else", "Ops")])
+    assert profile.sync_roster(roster, dry_run=True)["refused"]
+    with pytest.raises(ValueError):
+        profile.sync_roster(roster)
+    assert len(profile.load_profiles()) == 21
+
+
+def test_mass_removal_needs_force(staff):
+    roster = _roster([(f"E{i}", f"Name {i}", "Ops") for i in range(10)])
+    with pytest.raises(ValueError, match="remove 11 of 21"):
+        profile.sync_roster(roster)
+    assert len(profile.load_profiles()) == 21
+
+    report = profile.sync_roster(roster, force=True)
+    assert len(report["removed"]) == 11 and report["refused"] is None
+    assert len(profile.load_profiles()) == 10
+
+
+def test_small_removal_and_keep_missing_are_allowed(staff):
+    rows = [(f"E{i}", f"Name {i}", "Ops") for i in range(17)] + [("N1", "No Dept", "")]
+    assert len(profile.sync_roster(_roster(rows))["removed"]) == 3
+    report = profile.sync_roster(_roster(rows[:2]), remove_missing=False)
+    assert report["removed"] == [] and report["refused"] is None
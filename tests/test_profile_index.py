@@ -0,0 +1,24 @@
+from utils import metrics, profile
+
+
+def test_index_is_reused_until_employees_change(db):
+    db.upsert_employee("E1", "Ada", "Eng")
+    metrics.reset()
+    assert profile.get_profile("E1")["Name"] == "Ada"
+    assert profile.get_profile("E1")["Name"] == "Ada"
+    counters = metrics.snapshot()["counters"]
+    assert counters["profile_index_misses"] == 1 and counters["profile_index_hits"] == 1
+
+    db.upsert_employee("E1", "Ada Lovelace", "Eng")  # e.g. another process writes
+    assert profile.get_profile("E1")["Name"] == "Ada Lovelace"
+    assert metrics.snapshot()["counters"]["profile_index_misses"] == 2
+
+
+def test_lookups_return_copies(db):
+    db.upsert_employees([("E1", "Ada", "Eng"), ("E2", "Bob", None)])
+    found = profile.get_profiles(["E1", "E2", "missing", 1])
+    assert set(found) == {"E1", "E2"}
+    found["E1"]["Name"] = "changed"
+    assert profile.get_profile("E1")["Name"] == "Ada"
+    assert profile.get_profile("missing") is None
+    assert len(profile.load_profiles()) == 2
@@ -0,0 +1,69 @@
+import io
+import zipfile
+
+import pytest
+from PIL import Image
+
+from utils import qrcode_utils
+
+
+def _qr(data, size=None):
+    image = Image.open(io.BytesIO(qrcode_utils._render_qr_png(data))).convert("L")
+    return image.resize((size, size), Image.NEAREST) if size else image
+
+
+def test_decodes_several_codes_in_one_image():
+    left, right = _qr("EMP-1"), _qr("EMP-2")
+    sheet = Image.new("L", (left.width + right.width, left.height), 255)
+    sheet.paste(left, (0, 0))
+    sheet.paste(right, (left.width, 0))
+    assert sorted(qrcode_utils.decode_qr_codes(sheet)) == ["EMP-1", "EMP-2"]
+
+
+def test_large_images_are_downscaled_before_decoding():
+    assert qrcode_utils.decode_qr_from_image(_qr("EMP-3", size=3000)) == "EMP-3"
+    assert qrcode_utils._downscale(qrcode_utils._load_grayscale(_qr("x", 3000)), 1280).shape == (1280, 1280)
+
+
+def test_batch_reports_unreadable_and_empty_images(tmp_path):
+    _qr("EMP-4").save(tmp_path / "a.png")
+    Image.new("L", (200, 200), 255).save(tmp_path / "b.png")
+    (tmp_path / "c.jpg").write_bytes(b"not an image")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    results = qrcode_utils.decode_qr_batch(str(tmp_path), workers=1)
+    assert [r["codes"] for r in results] == [["EMP-4"], [], []]
+    assert results[1]["error"] == "no QR code found"
+    assert results[2]["error"].startswith("unreadable image")
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = qrcode_utils.QRImageCache()
+    monkeypatch.setattr(qrcode_utils, "qr_cache", cache)
+    return cache
+
+
+def test_badges_render_each_payload_once(cache, monkeypatch):
+    rendered = []
+    render = qrcode_utils._render_qr_png
+    monkeypatch.setattr(qrcode_utils, "_render_qr_png", lambda data: rendered.append(data) or render(data))
+
+    badges = qrcode_utils.generate_badges({"E1": "token-1", "E2": "token-2", "E3": "token-1"}, workers=1)
+    assert badges["E1"] is badges["E3"] and rendered == ["token-1", "token-2"]
+    qrcode_utils.generate_badges({"E1": "token-1"}, workers=1)
+    assert rendered == ["token-1", "token-2"]
+    assert qrcode_utils.decode_qr_from_image(io.BytesIO(badges["E2"])) == "token-2"
+
+    with zipfile.ZipFile(io.BytesIO(qrcode_utils.badges_to_zip(badges))) as zf:
+        assert sorted(zf.namelist()) == ["E1.png", "E2.png", "E3.png"]
+
+
+def test_cache_evicts_least_recently_used():
+    cache = qrcode_utils.QRImageCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    assert cache.get("a") == b"12345"  # "b" is now the oldest
+    cache.put("c", b"12345")
+    assert cache.get("b") is None and cache.get("a") and cache.get("c")
+    assert len(cache) == 2
@@ -0,0 +1,71 @@
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+
+from utils.attendance_log import CHECK_IN, CHECK_OUT, AttendanceEvent
+from utils.calculator import pair_sessions
+from utils.rollups import AttendanceRollups
+
+
+def test_totals_follow_recorded_scans(db):
+    db.upsert_employee("1", "Ann", "Ops")
+    for hour in (9, 12, 13, 17):
+        db.record_scan("1", "Ann", "Ops", datetime(2024, 5, 2, hour))
+    rollups = AttendanceRollups()
+    assert rollups.employee_day("1", "2024-05-02") == {"hours": 7.0, "sessions": 2, "events": 4}
+    assert rollups.employee_month("1", "2024-05")["hours"] == 7.0
+    assert rollups.department_day("Ops", "2024-05-02")["sessions"] == 2
+    assert rollups.department_totals("2024-05-02").to_dict(orient="records") == [
+        {"Department": "Ops", "Hours Worked": 7.0, "Sessions": 2, "Events": 4}
+    ]
+    assert rollups.monthly_summary("2024-05").to_dict(orient="records") == [
+        {"Employee ID": "1", "Name": "Ann", "Month": "2024-05", "Hours Worked": 7.0}
+    ]
+
+
+def test_sessions_do_not_span_days_or_repeat(db):
+    events = [
+        AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 2, 22), CHECK_IN),
+        AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 3, 6), CHECK_OUT),   # next day: no session
+        AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 3, 9), CHECK_IN),
+        AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 3, 10), CHECK_OUT),
+        AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 3, 11), CHECK_OUT),  # repeated: the last one counts
+        AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 3, 13), CHECK_IN),
+        AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 3, 14), CHECK_IN),   # repeated: the first one counts
+        AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 3, 16), CHECK_OUT),
+    ]
+    db.insert_events(events)
+    rollups = AttendanceRollups()
+    assert rollups.employee_day("1", "2024-05-02")["sessions"] == 0
+    assert rollups.employee_day("1", "2024-05-03") == {"hours": 5.0, "sessions": 2, "events": 7}
+
+    # the dashboard/export path pairs the same way
+    sessions = pair_sessions(pd.DataFrame([e.to_dict() for e in events]))
+    closed = sessions.dropna(subset=["check_out"])
+    assert closed["hours"].tolist() == [2.0, 3.0]
+    assert closed.groupby("date")["hours"].sum().to_dict() == {date(2024, 5, 3): 5.0}
+
+
+def test_out_of_order_inserts_repair_the_day(db):
+    db.insert_events([AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 3, 17), CHECK_OUT)])
+    assert AttendanceRollups().employee_day("1", "2024-05-03")["sessions"] == 0
+    db.insert_events([AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 3, 9), CHECK_IN)])
+    db.insert_events([AttendanceEvent("1", "Ann", "Ops", datetime(2024, 5, 3, 12), CHECK_OUT)])
+    # 09:00 in, 12:00 out, 17:00 out -> one session until the last Check-Out
+    assert AttendanceRollups().employee_day("1", "2024-05-03") == {"hours": 8.0, "sessions": 1, "events": 3}
+    assert AttendanceRollups().department_day("Ops", "2024-05-03") == {"hours": 8.0, "sessions": 1, "events": 3}
+
+
+def test_concurrent_writers_share_totals(db):
+    def scan(emp_id):
+        for hour in range(8, 18):
+            db.record_scan(emp_id, emp_id, "Eng", datetime(2024, 5, 2, hour))
+
+    threads = [threading.Thread(target=scan, args=(str(i),)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    totals = AttendanceRollups().department_day("Eng", "2024-05-02")
+    assert totals == {"hours": 40.0, "sessions": 40, "events": 80}
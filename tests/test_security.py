@@ -0,0 +1,90 @@
+import pytest
+
+from utils import security
+
+
+def test_token_round_trip_and_single_use():
+    cache = security.ReplayCache()
+    token = security.generate_one_time_token("E42")
+    assert security.validate_token(token, cache) == "E42"
+    assert security.validate_token(token, cache) is None  # replayed
+
+
+def test_expired_and_tampered_tokens_are_rejected():
+    cache = security.ReplayCache()
+    assert security.validate_token(security.generate_one_time_token("E1", ttl=-1), cache) is None
+    token = security.generate_one_time_token("E1")
+    emp, expires, nonce, sig = token.split(".")
+    forged = f"{security._b64(b'E2')}.{expires}.{nonce}.{sig}"
+    assert security.validate_token(forged, cache) is None
+
+
+@pytest.mark.parametrize("rewrite", [
+    lambda e: "0" + e, lambda e: "+" + e, lambda e: " " + e, lambda e: e[:3] + "_" + e[3:],
+    lambda e: "".join(chr(ord(c) - ord("0") + 0x0660) for c in e),  # Arabic-Indic digits
+])
+def test_rewritten_expiry_cannot_replay_a_used_token(rewrite):
+    cache = security.ReplayCache()
+    token = security.generate_one_time_token("E1")
+    assert security.validate_token(token, cache) == "E1"
+    emp, expires, nonce, sig = token.split(".")
+    assert security.validate_token(f"{emp}.{rewrite(expires)}.{nonce}.{sig}", cache) is None
+    assert security.verify_token(f"{emp}.{rewrite(expires)}.{nonce}.{sig}") is None
+
+
+@pytest.mark.parametrize("token", [
+    "YQ.99999999999.n.ü",   # non-ASCII signature
+    "ü.99999999999.n.sig",   # non-ASCII employee part
+    "YQ.soon.n.sig",
+    "only.three.parts",
+    "",
+    None,
+    b"YQ.1.n.sig",
+])
+def test_malformed_tokens_return_none(token):
+    assert security.verify_token(token) is None
+    assert security.validate_token(token, security.ReplayCache()) is None
+
+
+def test_failed_geo_lookups_are_cached(monkeypatch):
+    calls = []
+
+    def failing_get(url, timeout):
+        calls.append(url)
+        raise OSError("offline")
+
+    monkeypatch.setattr(security, "_offline_database", lambda: None)
+    monkeypatch.setattr(security, "_geo_failure_cache", security.TTLCache(60))
+    monkeypatch.setattr(security.requests, "get", failing_get)
+    for _ in range(3):
+        assert security.get_geo_location("203.0.113.9") == security.GEO_UNAVAILABLE
+    assert len(calls) == 1
+    assert security.get_geo_location("Unavailable") == security.GEO_UNAVAILABLE
+    assert len(calls) == 1
+
+
+def test_offline_database_lookup_and_single_open(tmp_path, monkeypatch):
+    import threading
+
+    path = str(tmp_path / "ip_ranges.db")
+    security.build_ip_database([
+        ("10.0.0.0", "10.0.0.255", "Pune", "MH", "India", 18.52, 73.85),
+        ("192.0.2.0", "192.0.2.255", "Oslo", None, "Norway", None, None),
+    ], path)
+    monkeypatch.setattr(security, "IP_DATABASE_FILE", path)
+    monkeypatch.setattr(security, "_ip_database", None)
+
+    opened = []
+    threads = [threading.Thread(target=lambda: opened.append(security._offline_database())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(db) for db in opened}) == 1
+
+    db = opened[0]
+    assert db.lookup("10.0.0.7")["city"] == "Pune"
+    assert db.lookup("192.0.2.1") == {"city": "Oslo", "region": None, "country": "Norway", "latitude": None, "longitude": None}
+    assert db.lookup("10.0.1.1") is None
+    assert db.lookup("not an ip") is None
+    db.close()
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils import calculator
+from utils.attendance_log import CHECK_IN, CHECK_OUT, pair_day
+
+
+def _loop_pairing(events):
+    """
+    Straightforward per-employee, per-day loop implementing the pairing rules.
+    """
+    sessions = []
+    ordered = events.sort_values(["emp_id", "timestamp"], kind="stable")
+    for (emp_id, day), group in ordered.groupby([ordered["emp_id"], ordered["timestamp"].dt.date], sort=True):
+        rows = list(zip(group["timestamp"], group["type"]))
+        kept = []
+        for i, (ts, kind) in enumerate(rows):
+            if kind == CHECK_IN and kept and kept[-1][1] == CHECK_IN:
+                continue  # repeated Check-In: keep the first
+            if kind == CHECK_OUT and i + 1 < len(rows) and rows[i + 1][1] == CHECK_OUT:
+                continue  # repeated Check-Out: keep the last
+            kept.append((ts, kind))
+        for i, (ts, kind) in enumerate(kept):
+            if kind != CHECK_IN:
+                continue
+            nxt = kept[i + 1] if i + 1 < len(kept) else None
+            out = nxt[0] if nxt is not None and nxt[1] == CHECK_OUT else pd.NaT
+            sessions.append((emp_id, day, ts, out))
+    return sessions
+
+
+def _random_events(n, employees=50, days=5, seed=3):
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 3, 1)
+    offsets = rng.choice(days * 24 * 3600, size=n, replace=False)
+    return pd.DataFrame({
+        "emp_id": rng.integers(0, employees, n).astype(str),
+        "timestamp": [start + timedelta(seconds=int(s)) for s in offsets],
+        "type": rng.choice([CHECK_IN, CHECK_OUT], n),
+    })
+
+
+def test_pair_sessions_matches_loop_reference():
+    events = _random_events(5000)
+    result = calculator.pair_sessions(events)
+    got = sorted(
+        (r.emp_id, r.date, pd.Timestamp(r.check_in), pd.Timestamp(r.check_out))
+        for r in result.itertuples()
+    )
+    expected = sorted((e, d, pd.Timestamp(i), pd.Timestamp(o)) for e, d, i, o in _loop_pairing(events))
+    assert len(got) == len(expected)
+    for g, x in zip(got, expected):
+        assert g[:3] == x[:3]
+        assert (pd.isna(g[3]) and pd.isna(x[3])) or g[3] == x[3]
+
+
+def test_pair_day_matches_pair_sessions():
+    events = _random_events(3000)
+    result = calculator.pair_sessions(events).dropna(subset=["check_out"])
+    expected = []
+    ordered = events.sort_values(["emp_id", "timestamp"], kind="stable")
+    for _, group in ordered.groupby([ordered["emp_id"], ordered["timestamp"].dt.date], sort=True):
+        rows = list(zip(group["timestamp"], group["type"], group["emp_id"]))
+        expected += [(start[2], start[0], end[0]) for start, end in pair_day(rows)]
+    got = [(r.emp_id, pd.Timestamp(r.check_in), pd.Timestamp(r.check_out)) for r in result.itertuples()]
+    assert sorted(got) == sorted(expected)
+
+
+def test_duplicates_open_and_orphan_events():
+    t = datetime(2024, 3, 1, 9)
+    events = pd.DataFrame({
+        "emp_id": ["a"] * 6 + ["b"],
+        "timestamp": [t, t + timedelta(minutes=1), t + timedelta(hours=4), t + timedelta(hours=5),
+                      t + timedelta(hours=6), t + timedelta(days=1), t],
+        "type": [CHECK_IN, CHECK_IN, CHECK_OUT, CHECK_OUT, CHECK_IN, CHECK_OUT, CHECK_OUT],
+        "name": ["A"] * 6 + ["B"],
+    })
+    summary = calculator.calculate_working_hours(events)
+    assert summary["emp_id"].tolist() == ["a"]  # b's orphan Check-Out and a's next-day one are dropped
+    row = summary.iloc[0]
+    assert row["Sessions"] == 2
+    assert row["Hours Worked"] == 5.0  # 09:00 -> 14:00 (last of the repeated Check-Outs)
+    assert bool(row["Open Session"]) is True
+    assert row["name"] == "A"
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+from utils import auth, startup
+
+
+def test_login_path_modules_do_not_import_heavy_dependencies():
+    code = (
+        "import sys, utils.activity_log, utils.auth, utils.startup; "
+        "print(sorted(m for m in ('pandas', 'sklearn', 'plotly') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_lazy_import_records_first_import_only(monkeypatch):
+    monkeypatch.setattr(startup, "_import_times", {})
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    module = startup.lazy_import("colorsys")
+    assert startup.lazy_import("colorsys") is module
+    startup.record("auth config", 10.0)
+    report = startup.startup_report()
+    assert [row["module"] for row in report] == ["auth config", "colorsys"]
+
+
+def test_auth_config_hashes_only_when_created(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(auth, "hash_passwords", lambda pws: calls.append(pws) or [f"hash:{p}" for p in pws])
+    path = str(tmp_path / "auth.yaml")
+
+    created = auth.load_auth_config(path)
+    assert created["credentials"]["usernames"]["admin"]["password"] == "hash:password"
+    assert auth.load_auth_config(path) == created
+    assert calls == [["password"]]
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from utils import viz_data
+
+
+def test_top_n_payload_with_count_column():
+    data = pd.DataFrame({"count": [3, 3, 1, 2, 2, 2]})
+    payload = viz_data.top_n_payload(data, "count", n=2)
+    assert list(payload.columns) == ["value", "count"]
+    assert payload["value"].tolist() == ["2", "3", "Other"]
+    assert payload["count"].tolist() == [3, 2, 1]
+
+
+def test_histogram_falls_back_to_top_n_for_text():
+    data = pd.DataFrame({"dept": ["a", "b", "a"]})
+    payload = viz_data.histogram_payload(data, "dept")
+    assert dict(zip(payload["value"], payload["count"])) == {"a": 2, "b": 1}
+
+
+def test_histogram_bins_sum_to_rows():
+    data = pd.DataFrame({"x": np.arange(1000.0)})
+    payload = viz_data.histogram_payload(data, "x", bins=10)
+    assert len(payload) == 10 and payload["count"].sum() == 1000
+
+
+def test_density_scatter_keeps_a_count_column_distinct():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({"x": rng.normal(size=5000), "count": rng.normal(size=5000)})
+    points, reduced = viz_data.scatter_payload(data, "x", "count", max_points=100)
+    assert reduced is not None and len(points) <= 100
+    assert points["points"].sum() == 5000
+    assert points["count"].between(data["count"].min(), data["count"].max()).all()
@@ -0,0 +1,224 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# -------------------------------
+# 📝 Buffered Activity Log
+# -------------------------------
+
+ACTIVITY_LOG_FILE = "activity_log.jsonl"
+LEGACY_LOG_FILE = "activity_log.txt"  # plain "<ts>: <action>" lines from before the JSON log
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+MAX_BYTES = 10 * 1024 * 1024
+ROTATE_SECONDS = 24 * 3600
+BACKUP_COUNT = 5
+FLUSH_SECONDS = 1.0
+BATCH_SIZE = 500
+DEDUPE_SECONDS = 600  # identical (user, action) events inside this window are written once
+READ_BLOCK = 64 * 1024
+
+
+class ActivityLogger:
+    """
+    Activity log written by a background thread.
+    - log() only enqueues; records are written in batches
+    - the file rotates by size and by age (path.1 ... path.N)
+    - repeated identical events (e.g. "logged in" on every rerun) are dropped
+    - tail() reads newest-first from the end of the files, with paging and filters
+    - a legacy text log is imported once at startup, then renamed to <legacy>.migrated
+    Records are JSON lines: {"ts", "user", "action"}.
+    """
+
+    def __init__(self, path=ACTIVITY_LOG_FILE, max_bytes=MAX_BYTES, rotate_seconds=ROTATE_SECONDS,
+                 backup_count=BACKUP_COUNT, flush_seconds=FLUSH_SECONDS, dedupe_seconds=DEDUPE_SECONDS,
+                 legacy_path=LEGACY_LOG_FILE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backup_count = backup_count
+        self.flush_seconds = flush_seconds
+        self.dedupe_seconds = dedupe_seconds
+        self._queue = queue.Queue()
+        self._recent = {}  # (user, action) -> last time written
+        self._lock = threading.Lock()
+        if legacy_path and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+        # age-based rotation counts from the file's first record, so restarts
+        # (which touch nothing) do not reset it the way mtime would
+        self._opened_at = self._first_record_time() or time.time()
+        self._worker = threading.Thread(target=self._run, name="activity-log", daemon=True)
+        self._worker.start()
+
+    # ---------- writing ----------
+
+    def log(self, action, user=None):
+        """
+        Queue one activity. Returns False if it was a duplicate inside the dedupe window.
+        """
+        now = time.time()
+        key = (user, action)
+        with self._lock:
+            last = self._recent.get(key)
+            if last is not None and now - last < self.dedupe_seconds:
+                return False
+            self._recent[key] = now
+            if len(self._recent) > 10000:
+                self._recent = {k: t for k, t in self._recent.items() if now - t < self.dedupe_seconds}
+        self._queue.put({"ts": datetime.fromtimestamp(now).strftime(TS_FORMAT), "user": user, "action": action})
+        return True
+
+    def flush(self):
+        """
+        Block until everything queued so far is on disk.
+        """
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except OSError as e:
+                print(f"Activity log write failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch):
+        self._maybe_rotate()
+        with open(self.path, "a") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in batch))
+
+    def _maybe_rotate(self):
+        if not os.path.exists(self.path):
+            self._opened_at = time.time()
+            return
+        too_big = os.path.getsize(self.path) >= self.max_bytes
+        too_old = time.time() - self._opened_at >= self.rotate_seconds
+        if not (too_big or too_old):
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+        self._opened_at = time.time()
+
+    def _first_record_time(self):
+        try:
+            with open(self.path) as f:
+                return datetime.strptime(json.loads(f.readline())["ts"], TS_FORMAT).timestamp()
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _import_legacy(self, legacy_path):
+        """
+        Put the records of a legacy text log in front of the current file
+        (they are older than anything in it) and rename the legacy file so
+        it is imported only once.
+        """
+        records = []
+        with open(legacy_path, errors="replace") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                ts, sep, action = line.partition(": ")
+                try:
+                    datetime.strptime(ts, TS_FORMAT)
+                except ValueError:
+                    sep = ""
+                if sep:
+                    records.append({"ts": ts, "user": None, "action": action})
+                elif records:  # continuation of a multi-line action
+                    records[-1]["action"] += "\n" + line
+                elif line:
+                    records.append({"ts": None, "user": None, "action": line})
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as out:
+            out.write("".join(json.dumps(record) + "\n" for record in records))
+            if os.path.exists(self.path):
+                with open(self.path) as current:
+                    out.writelines(current)
+        os.replace(tmp, self.path)
+        os.replace(legacy_path, legacy_path + ".migrated")
+
+    # ---------- reading ----------
+
+    def _files_newest_first(self):
+        files = [self.path] + [f"{self.path}.{i}" for i in range(1, self.backup_count + 1)]
+        return [f for f in files if os.path.exists(f)]
+
+    @staticmethod
+    def _reverse_lines(path):
+        """
+        Yield the lines of a file from last to first, reading fixed-size blocks from the end.
+        """
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b""
+            while position > 0:
+                step = min(READ_BLOCK, position)
+                position -= step
+                f.seek(position)
+                lines = (f.read(step) + remainder).split(b"\n")
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line:
+                        yield line
+            if remainder:
+                yield remainder
+
+    def tail(self, page=0, page_size=100, user=None, action=None):
+        """
+        Return one page of records, newest first.
+        `user` must match exactly; `action` is a case-insensitive substring.
+        """
+        needle = action.lower() if action else None
+        skip = page * page_size
+        records = []
+        for path in self._files_newest_first():
+            for line in self._reverse_lines(path):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if user and record.get("user") != user:
+                    continue
+                if needle and needle not in str(record.get("action", "")).lower():
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                records.append(record)
+                if len(records) >= page_size:
+                    return records
+        return records
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def get_activity_logger():
+    """
+    Return the process-wide activity logger (flushed at interpreter exit).
+    """
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            _logger = ActivityLogger()
+            atexit.register(_logger.flush)
+        return _logger
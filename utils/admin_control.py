@@ -1,66 +1,265 @@
 import pandas as pd
+import gzip
 import os
 from fpdf import FPDF
+from utils import database
 
-# Default configuration
-CONFIG_FILE = "admin_config.csv"
+CONFIG_DEFAULTS = {
+    "Office Start": "09:00:00",
+    "Office End": "17:00:00",
+    "Daily Hours Required": 8
+}
 
 def load_config():
     """
     Load working hour thresholds. Default: 9 AM - 5 PM, 8 hours.
     """
-    if not os.path.exists(CONFIG_FILE):
-        df = pd.DataFrame([{
-            "Office Start": "09:00:00",
-            "Office End": "17:00:00",
-            "Daily Hours Required": 8
-        }])
-        df.to_csv(CONFIG_FILE, index=False)
-    return pd.read_csv(CONFIG_FILE).iloc[0]
+    stored = database.get_config()
+    config = {key: stored.get(key, default) for key, default in CONFIG_DEFAULTS.items()}
+    config["Daily Hours Required"] = float(config["Daily Hours Required"])
+    return pd.Series(config)
 
 def update_config(start_time, end_time, required_hours):
     """
     Update configuration.
     """
-    df = pd.DataFrame([{
+    database.set_config({
         "Office Start": start_time,
         "Office End": end_time,
         "Daily Hours Required": required_hours
-    }])
-    df.to_csv(CONFIG_FILE, index=False)
+    })
 
-def remove_employee(emp_id, profile_df):
+def add_employee(emp_id, name, department):
+    """
+    Add (or update) a single employee profile.
+    """
+    database.upsert_employee(emp_id, name, department)
+
+def remove_employee(emp_id, profile_df=None):
     """
     Remove employee from profile list by ID.
+    Returns the remaining profiles when a profile DataFrame is passed in.
+    """
+    database.delete_employee(emp_id)
+    if profile_df is not None:
+        return profile_df[profile_df["Employee ID"].astype(str) != str(emp_id)]
+
+def remove_employees(emp_ids):
+    """
+    Remove many employees in one transaction.
+    """
+    database.delete_employees(emp_ids)
+
+# -------------------------------
+# 📤 Streaming Exports
+# -------------------------------
+
+EXPORT_CHUNK_ROWS = 10000
+
+def iter_export_chunks(source, chunksize=EXPORT_CHUNK_ROWS):
+    """
+    Yield DataFrame chunks from a DataFrame, an AttendanceLog / iterable of
+    events (anything with to_dict()) or an iterable of record dicts.
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield _flatten(source.iloc[start:start + chunksize])
+        return
+    batch = []
+    for item in source:
+        batch.append(item.to_dict() if hasattr(item, "to_dict") else item)
+        if len(batch) >= chunksize:
+            yield _flatten(pd.DataFrame(batch))
+            batch = []
+    if batch:
+        yield _flatten(pd.DataFrame(batch))
+
+def _flatten(chunk):
     """
-    new_df = profile_df[profile_df["Employee ID"] != emp_id]
-    new_df.to_csv("employee_profiles.csv", index=False)
-    return new_df
+    Render nested values (e.g. the location dict) as strings so every format can store them.
+    """
+    for col in chunk.columns[chunk.dtypes == object]:
+        if chunk[col].map(lambda v: isinstance(v, (dict, list))).any():
+            chunk = chunk.assign(**{col: chunk[col].astype(str)})
+    return chunk
+
+def _source_length(source):
+    try:
+        return len(source)
+    except TypeError:
+        return None
 
-def export_to_csv(df, filename="attendance_log.csv"):
-    df.to_csv(filename, index=False)
+def _stream(source, chunksize, progress):
+    """
+    Iterate chunks and report (rows_done, total_rows or None) after each one.
+    """
+    total = _source_length(source)
+    done = 0
+    for chunk in iter_export_chunks(source, chunksize):
+        yield chunk
+        done += len(chunk)
+        if progress:
+            progress(done, total)
+
+def export_to_csv(df, filename="attendance_log.csv", chunksize=EXPORT_CHUNK_ROWS, progress=None):
+    """
+    Write CSV incrementally; a filename ending in .gz is gzip-compressed.
+    """
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, "wt", newline="") as f:
+        for i, chunk in enumerate(_stream(df, chunksize, progress)):
+            chunk.to_csv(f, header=(i == 0), index=False)
     return filename
 
-def export_to_excel(df, filename="attendance_log.xlsx"):
-    df.to_excel(filename, index=False)
+def export_to_csv_gz(df, filename="attendance_log.csv.gz", **kwargs):
+    return export_to_csv(df, filename, **kwargs)
+
+def export_to_excel(df, filename="attendance_log.xlsx", chunksize=EXPORT_CHUNK_ROWS, progress=None):
+    """
+    Write XLSX in xlsxwriter's constant-memory mode (rows are flushed as written).
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(filename, {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+        "nan_inf_to_errors": True,
+    })
+    sheet = workbook.add_worksheet("Attendance")
+    row = 0
+    for chunk in _stream(df, chunksize, progress):
+        if row == 0:
+            sheet.write_row(0, 0, [str(c) for c in chunk.columns])
+            row = 1
+        for values in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            sheet.write_row(row, 0, values)
+            row += 1
+    workbook.close()
     return filename
 
-def export_to_pdf(df, filename="attendance_log.pdf"):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=10)
-    
-    # Header
-    col_width = 40
-    for col in df.columns:
-        pdf.cell(col_width, 10, str(col), border=1)
-    pdf.ln()
-    
-    # Rows
-    for i in range(len(df)):
-        for item in df.iloc[i]:
-            pdf.cell(col_width, 10, str(item), border=1)
+def _parquet_schema(chunk):
+    """
+    Fix the file schema up front: object columns are strings. Inferring it
+    from the first chunk alone types all-null columns (e.g. ip/location
+    before geo enrichment) as null, which later chunks cannot be cast to.
+    """
+    import pyarrow as pa
+
+    inferred = pa.Schema.from_pandas(chunk, preserve_index=False)
+    return pa.schema([
+        pa.field(name, pa.string() if chunk[name].dtype == object or field.type == pa.null() else field.type)
+        for name, field in zip(chunk.columns, inferred)
+    ])
+
+def _as_strings(chunk, schema):
+    import pyarrow as pa
+
+    columns = {}
+    for field in schema:
+        col = chunk[field.name]
+        if field.type == pa.string() and col.dtype == object:
+            col = col.map(str).where(col.notna(), None)
+        columns[field.name] = col
+    return pd.DataFrame(columns)
+
+def export_to_parquet(df, filename="attendance_log.parquet", chunksize=EXPORT_CHUNK_ROWS, progress=None):
+    """
+    Write Parquet one row group per chunk (requires pyarrow).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in _stream(df, chunksize, progress):
+            if writer is None:
+                schema = _parquet_schema(chunk)
+                writer = pq.ParquetWriter(filename, schema, compression="snappy")
+            table = pa.Table.from_pandas(_as_strings(chunk, schema), preserve_index=False)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    return filename
+
+def _cell_text(chunk):
+    """
+    Every value as a str, with missing values (NaN/NaT/None) as blanks.
+    astype(str) keeps NaN as a float on pandas >= 3.
+    """
+    return chunk.astype(object).where(chunk.notna(), "").map(str)
+
+def export_to_pdf(df, filename="attendance_log.pdf", chunksize=EXPORT_CHUNK_ROWS, progress=None):
+    """
+    Render a paginated table from a row iterator.
+    Column widths are computed once from the header and first chunk; the
+    header is repeated on every page.
+    """
+    pdf = FPDF(orientation="L")
+    pdf.set_auto_page_break(False)
+    pdf.set_font("Arial", size=8)
+    row_h = 6
+    usable_w = pdf.w - pdf.l_margin - pdf.r_margin
+    widths = None
+    header = None
+
+    def draw_header():
+        pdf.add_page()
+        pdf.set_font("Arial", style="B", size=8)
+        for col, w in zip(header, widths):
+            pdf.cell(w, row_h, col, border=1)
         pdf.ln()
-    
+        pdf.set_font("Arial", size=8)
+
+    def fit(text, w):
+        # cut rather than wrap so every row keeps the same height
+        max_chars = max(4, int(w / 1.6))
+        return text if len(text) <= max_chars else text[:max_chars - 3] + "..."
+
+    for chunk in _stream(df, chunksize, progress):
+        if widths is None:
+            header = [str(c) for c in chunk.columns]
+            sample = _cell_text(chunk.head(200))
+            lengths = [max([len(h)] + sample[c].str.len().tolist()) for h, c in zip(header, chunk.columns)]
+            lengths = [min(max(n, 4), 40) for n in lengths]
+            scale = usable_w / sum(lengths)
+            widths = [n * scale for n in lengths]
+            draw_header()
+        for values in _cell_text(chunk).itertuples(index=False, name=None):
+            if pdf.get_y() + row_h > pdf.h - pdf.b_margin:
+                draw_header()
+            for item, w in zip(values, widths):
+                pdf.cell(w, row_h, fit(item, w), border=1)
+            pdf.ln()
+
+    if widths is None:
+        pdf.add_page()
     pdf.output(filename)
     return filename
+
+EXPORTERS = {
+    "CSV": export_to_csv,
+    "CSV (gzip)": export_to_csv_gz,
+    "Excel": export_to_excel,
+    "Parquet": export_to_parquet,
+    "PDF": export_to_pdf,
+}
+
+def export_data(source):
+    """
+    Streamlit export widget: pick a format, stream the export to disk with a
+    progress bar, then offer the file for download.
+    """
+    import streamlit as st
+
+    fmt = st.selectbox("Format", list(EXPORTERS))
+    if st.button("Export"):
+        bar = st.progress(0.0)
+
+        def progress(done, total):
+            bar.progress(min(done / total, 1.0) if total else 0.0, text=f"{done:,} rows")
+
+        filename = EXPORTERS[fmt](source, progress=progress)
+        bar.progress(1.0, text="Done")
+        with open(filename, "rb") as f:
+            st.download_button("Download", f, file_name=os.path.basename(filename))
@@ -0,0 +1,168 @@
+import glob
+import os
+import sys
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils import database
+
+# -------------------------------
+# 🗄️ Columnar Attendance Archive
+# -------------------------------
+
+ARCHIVE_DIR = os.environ.get("ATTENDANCE_ARCHIVE_DIR", "attendance_archive")
+ARCHIVED_THROUGH_KEY = "archived_through"  # config key: last day already in the archive
+
+# Layout: ARCHIVE_DIR/month=YYYY-MM/department=<name>/part-<first day>_<last day>.parquet
+PARTITIONING = ds.partitioning(
+    pa.schema([("month", pa.string()), ("department", pa.string())]), flavor="hive"
+)
+EVENT_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("emp_id", pa.string()),
+    ("name", pa.string()),
+    ("department", pa.string()),
+    ("date", pa.date32()),
+    ("timestamp", pa.timestamp("ms")),
+    ("type", pa.dictionary(pa.int8(), pa.string())),
+    ("ip", pa.string()),
+    ("location", pa.string()),
+    ("month", pa.string()),
+])
+
+_lock = threading.Lock()
+
+
+def _events_table(records):
+    df = pd.DataFrame.from_records(records, columns=[f.name for f in EVENT_SCHEMA if f.name != "month"])
+    df["date"] = pd.to_datetime(df["date"]).dt.date
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    df["department"] = df["department"].fillna("Unassigned")
+    df["month"] = df["date"].map(lambda d: d.strftime("%Y-%m"))
+    return pa.Table.from_pandas(df, schema=EVENT_SCHEMA, preserve_index=False)
+
+
+def _merge_partition_files(directory):
+    """
+    Rewrite the per-run part files of one closed partition as a single
+    date-sorted file, so old months are read with one open per department.
+    """
+    files = sorted(glob.glob(os.path.join(directory, "part-*.parquet")))
+    if len(files) < 2:
+        return
+    table = ds.dataset(files, format="parquet").to_table().sort_by([("date", "ascending"), ("emp_id", "ascending")])
+    days = [os.path.basename(f)[len("part-"):-len(".parquet")].split("_")[:2] for f in files]
+    first, last = min(d[0] for d in days), max(d[1] for d in days)
+    target = os.path.join(directory, f"part-{first}_{last}.parquet")
+    tmp = os.path.join(directory, f".part-{first}_{last}.tmp")  # dot files are ignored by readers
+    pq.write_table(table, tmp, compression="zstd")
+    for f in files:
+        os.remove(f)
+    os.replace(tmp, target)
+
+
+def compact_closed_days(through=None, archive_dir=ARCHIVE_DIR, purge=False):
+    """
+    Move every closed day (default: up to yesterday) that is not archived yet
+    from the database into the Parquet archive, partitioned by month and
+    department. Months that are over are then merged to one file per
+    department. With purge=True the archived rows are deleted from the database.
+    Returns {"days": ..., "events": ..., "through": ...}.
+    """
+    through = through or date.today() - timedelta(days=1)
+    with _lock:
+        done = database.get_config().get(ARCHIVED_THROUGH_KEY)
+        start = date.fromisoformat(done) + timedelta(days=1) if done else None
+        if start is not None and start > through:
+            return {"days": 0, "events": 0, "through": done}
+
+        records = database.query_events(start=start, end=through)
+        if records:
+            table = _events_table(records)
+            first, last = records[0]["date"], records[-1]["date"]
+            ds.write_dataset(
+                table,
+                archive_dir, format="parquet", partitioning=PARTITIONING,
+                basename_template=f"part-{first}_{last}_{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+                file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+            )
+            current_month = date.today().strftime("%Y-%m")
+            for month_dir in glob.glob(os.path.join(archive_dir, "month=*")):
+                if month_dir.rsplit("=", 1)[-1] < current_month:
+                    for partition in glob.glob(os.path.join(month_dir, "department=*")):
+                        _merge_partition_files(partition)
+            if purge:
+                database.delete_events_between(start, through)
+
+        database.set_config({ARCHIVED_THROUGH_KEY: through.isoformat()})
+        days = len({r["date"] for r in records})
+        return {"days": days, "events": len(records), "through": through.isoformat()}
+
+
+def _dataset(archive_dir):
+    return ds.dataset(archive_dir, format="parquet", partitioning=PARTITIONING)
+
+
+def query_archive(emp_id=None, start=None, end=None, department=None, columns=None, archive_dir=ARCHIVE_DIR):
+    """
+    Read archived events filtered by employee, inclusive date range and department.
+    Month and department filters prune whole partition directories; the rest
+    are pushed down to Parquet row-group statistics. Only `columns` are read.
+    Returns an Arrow-backed DataFrame.
+    """
+    if not os.path.isdir(archive_dir):
+        return pd.DataFrame(columns=columns or [f.name for f in EVENT_SCHEMA])
+    start = date.fromisoformat(str(start)) if start is not None else None
+    end = date.fromisoformat(str(end)) if end is not None else None
+
+    conditions = []
+    if department is not None:
+        conditions.append(ds.field("department") == department)
+    if start is not None:
+        conditions.append(ds.field("month") >= start.strftime("%Y-%m"))
+        conditions.append(ds.field("date") >= pa.scalar(start, pa.date32()))
+    if end is not None:
+        conditions.append(ds.field("month") <= end.strftime("%Y-%m"))
+        conditions.append(ds.field("date") <= pa.scalar(end, pa.date32()))
+    if emp_id is not None:
+        conditions.append(ds.field("emp_id") == str(emp_id))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    table = _dataset(archive_dir).to_table(columns=columns, filter=expression)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def department_monthly_summary(department, start, end, archive_dir=ARCHIVE_DIR):
+    """
+    Monthly hours per employee for one department, read from the archive.
+    Touches only that department's partitions for the months in range.
+    """
+    from utils.calculator import calculate_working_hours, generate_monthly_summary
+
+    events = query_archive(
+        start=start, end=end, department=department,
+        columns=["emp_id", "name", "timestamp", "type"], archive_dir=archive_dir,
+    )
+    if events.empty:
+        return pd.DataFrame(columns=["Employee ID", "Name", "Month", "Hours Worked"])
+    events = events.astype({"emp_id": object, "name": object, "type": object})
+    events["timestamp"] = events["timestamp"].astype("datetime64[s]")
+    daily = calculate_working_hours(events).rename(
+        columns={"emp_id": "Employee ID", "name": "Name", "date": "Date"}
+    )
+    return generate_monthly_summary(daily)
+
+
+if __name__ == "__main__":
+    # python -m utils.archive [YYYY-MM-DD] [--purge]  -> archive closed days (e.g. from a nightly cron)
+    args = [a for a in sys.argv[1:] if a != "--purge"]
+    through = date.fromisoformat(args[0]) if args else None
+    print(compact_closed_days(through, purge="--purge" in sys.argv))
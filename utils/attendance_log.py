@@ -0,0 +1,176 @@
+import sys
+
+# -------------------------------
+# 🗂️ Compact Attendance Event Log
+# -------------------------------
+
+CHECK_IN = "Check-In"
+CHECK_OUT = "Check-Out"
+
+
+def pair_day(events):
+    """
+    Pair one employee's events of one day, given in time order as tuples
+    whose first two items are (timestamp, type). The same rules as
+    utils.calculator.pair_sessions (keep both in sync):
+    - repeated Check-Ins keep the first, repeated Check-Outs keep the last
+    - a Check-In directly followed by a Check-Out closes a session
+    Returns [(check-in event, check-out event), ...] for closed sessions.
+    """
+    kept = [
+        e for i, e in enumerate(events)
+        if not (e[1] == CHECK_IN and i > 0 and events[i - 1][1] == CHECK_IN)
+        and not (e[1] == CHECK_OUT and i + 1 < len(events) and events[i + 1][1] == CHECK_OUT)
+    ]
+    return [(e, kept[i + 1]) for i, e in enumerate(kept[:-1]) if e[1] == CHECK_IN and kept[i + 1][1] == CHECK_OUT]
+
+
+class AttendanceEvent:
+    """
+    A single check-in/check-out event.
+    Uses __slots__ so that tens of thousands of events stay small in memory.
+    """
+    __slots__ = ("emp_id", "name", "department", "timestamp", "type", "ip", "location", "id")
+
+    def __init__(self, emp_id, name, department, timestamp, type, ip=None, location=None, id=None):
+        self.id = id  # database row id, once stored
+        self.emp_id = emp_id
+        self.name = name
+        self.department = department
+        self.timestamp = timestamp
+        self.type = type
+        self.ip = ip
+        self.location = location
+
+    @property
+    def date(self):
+        return self.timestamp.date()
+
+    def to_dict(self) -> dict:
+        """
+        Return the event as a plain dict (same keys as the old session-state log).
+        """
+        return {
+            "emp_id": self.emp_id,
+            "name": self.name,
+            "department": self.department,
+            "timestamp": self.timestamp,
+            "type": self.type,
+            "date": self.date,
+            "ip": self.ip,
+            "location": self.location,
+        }
+
+
+class AttendanceLog:
+    """
+    Day-partitioned attendance log with a per-employee "last event" index.
+    Deciding check-in vs check-out and listing who is clocked in are O(1)
+    lookups instead of scans over the full history.
+    """
+
+    def __init__(self):
+        self._days = {}          # date -> [AttendanceEvent, ...] in arrival order
+        self._last = {}          # emp_id -> latest AttendanceEvent
+        self._clocked_in = {}    # emp_id -> open Check-In event
+        self._by_emp = {}        # emp_id -> [AttendanceEvent, ...]
+        self._emp_version = {}   # emp_id -> log version of their latest event
+        self._locations = {}     # frozen location -> shared location dict
+        self._count = 0
+        self.version = 0         # bumped on every append; lets views cache by version
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for day in sorted(self._days):
+            yield from self._days[day]
+
+    def _intern_ip(self, ip):
+        return sys.intern(ip) if isinstance(ip, str) else ip
+
+    def _intern_location(self, location):
+        if not isinstance(location, dict):
+            return location
+        try:
+            key = tuple(sorted(location.items()))
+        except TypeError:
+            return location
+        return self._locations.setdefault(key, location)
+
+    def last_event(self, emp_id):
+        """
+        Return the most recent event for an employee, or None.
+        """
+        return self._last.get(emp_id)
+
+    def next_event_type(self, emp_id, day) -> str:
+        """
+        Decide whether the next scan on `day` is a Check-In or Check-Out.
+        """
+        last = self._last.get(emp_id)
+        if last is None or last.date != day or last.type == CHECK_OUT:
+            return CHECK_IN
+        return CHECK_OUT
+
+    def record(self, emp_id, name, department, timestamp, ip=None, location=None, type=None, id=None):
+        """
+        Append a scan for the employee and return the stored event.
+        `type` overrides the in-memory decision (e.g. when the database made it).
+        """
+        event = AttendanceEvent(
+            emp_id, name, department, timestamp,
+            type or self.next_event_type(emp_id, timestamp.date()),
+            self._intern_ip(ip), self._intern_location(location), id,
+        )
+        self.append(event)
+        return event
+
+    def append(self, event):
+        """
+        Store an already-built event and update the indexes.
+        """
+        self._days.setdefault(event.date, []).append(event)
+        self._by_emp.setdefault(event.emp_id, []).append(event)
+        self._last[event.emp_id] = event
+        if event.type == CHECK_IN:
+            self._clocked_in[event.emp_id] = event
+        else:
+            self._clocked_in.pop(event.emp_id, None)
+        self._count += 1
+        self.version += 1
+        self._emp_version[event.emp_id] = self.version
+
+    def set_location(self, event, ip, location):
+        """
+        Fill in IP/location on an event after it was recorded (geo enrichment).
+        """
+        event.ip = self._intern_ip(ip)
+        event.location = self._intern_location(location)
+
+    def clocked_in(self):
+        """
+        Return the open Check-In events of everyone currently clocked in.
+        """
+        return list(self._clocked_in.values())
+
+    def events_for_employee(self, emp_id):
+        return list(self._by_emp.get(emp_id, ()))
+
+    def changed_since(self, version):
+        """
+        Return the employee IDs with events appended after `version`.
+        """
+        return [emp_id for emp_id, v in self._emp_version.items() if v > version]
+
+    def days(self):
+        return sorted(self._days)
+
+    def events_for_day(self, day):
+        return list(self._days.get(day, ()))
+
+    def to_records(self):
+        """
+        Return all events as a list of dicts, oldest day first.
+        """
+        return [event.to_dict() for event in self]
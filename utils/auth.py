@@ -0,0 +1,66 @@
+import os
+import sys
+
+import yaml
+
+# -------------------------------
+# 🔐 Precomputed Credentials
+# -------------------------------
+
+AUTH_CONFIG_FILE = os.environ.get("ATTENDANCE_AUTH_CONFIG", "auth_config.yaml")
+
+# Used only to create the config file the first time; the password is hashed once, then never again
+DEFAULT_USERS = {"admin": {"name": "Admin", "password": "password"}}
+DEFAULT_COOKIE = {"name": "data_analysis", "key": "abcdef", "expiry_days": 30}
+
+
+def hash_passwords(passwords):
+    """
+    bcrypt-hash plain passwords (slow by design; run offline, not per request).
+    """
+    import streamlit_authenticator as stauth
+    return stauth.Hasher(passwords).generate()
+
+
+def write_auth_config(users, cookie=DEFAULT_COOKIE, path=AUTH_CONFIG_FILE):
+    """
+    Write a streamlit-authenticator config with already-hashed passwords.
+    `users` maps username -> {"name", "password" (plain)}.
+    """
+    usernames = list(users)
+    hashed = hash_passwords([users[u]["password"] for u in usernames])
+    config = {
+        "credentials": {
+            "usernames": {
+                u: {"name": users[u]["name"], "password": h}
+                for u, h in zip(usernames, hashed)
+            }
+        },
+        "cookie": dict(cookie),
+    }
+    with open(path, "w") as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    return config
+
+
+def load_auth_config(path=AUTH_CONFIG_FILE):
+    """
+    Load credentials with precomputed hashes, creating the file from
+    DEFAULT_USERS on first start.
+    """
+    if not os.path.exists(path):
+        return write_auth_config(DEFAULT_USERS, path=path)
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+if __name__ == "__main__":
+    # python -m utils.auth <username> <display name> <password>
+    if len(sys.argv) != 4:
+        sys.exit("usage: python -m utils.auth <username> <display name> <password>")
+    username, name, password = sys.argv[1:]
+    config = load_auth_config()
+    config["credentials"]["usernames"][username] = {"name": name, "password": hash_passwords([password])[0]}
+    with open(AUTH_CONFIG_FILE, "w") as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    print(f"Updated {username} in {AUTH_CONFIG_FILE}")
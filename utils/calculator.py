@@ -1,60 +1,186 @@
 import datetime
+import numpy as np
 import pandas as pd
+from utils.attendance_log import CHECK_IN
 
 # Define office rules
 OFFICE_START = datetime.time(9, 0, 0)   # 9:00 AM
 OFFICE_END = datetime.time(17, 0, 0)    # 5:00 PM
 WORK_HOURS_PER_DAY = 8  # standard working hours
+TIME_FORMAT = "%H:%M:%S"
+SECONDS_PER_DAY = 24 * 3600
 
 def get_working_hours(in_time, out_time):
     try:
-        in_dt = datetime.datetime.strptime(in_time, "%H:%M:%S")
-        out_dt = datetime.datetime.strptime(out_time, "%H:%M:%S")
-        duration = out_dt - in_dt
-        return round(duration.total_seconds() / 3600, 2)  # return hours (2 decimals)
-    except:
+        in_dt = datetime.datetime.strptime(in_time, TIME_FORMAT)
+        out_dt = datetime.datetime.strptime(out_time, TIME_FORMAT)
+    except (TypeError, ValueError):
         return 0.0
+    duration = (out_dt - in_dt).total_seconds()
+    if duration < 0:  # overnight shift, check-out is on the next day
+        duration += SECONDS_PER_DAY
+    return round(duration / 3600, 2)  # return hours (2 decimals)
 
 def check_late(in_time):
     try:
-        in_dt = datetime.datetime.strptime(in_time, "%H:%M:%S").time()
+        in_dt = datetime.datetime.strptime(in_time, TIME_FORMAT).time()
         return in_dt > OFFICE_START
-    except:
+    except (TypeError, ValueError):
         return False
 
 def check_early_logout(out_time):
     try:
-        out_dt = datetime.datetime.strptime(out_time, "%H:%M:%S").time()
+        out_dt = datetime.datetime.strptime(out_time, TIME_FORMAT).time()
         return out_dt < OFFICE_END
-    except:
+    except (TypeError, ValueError):
         return False
 
 def check_overtime(hours_worked):
     try:
         return hours_worked > WORK_HOURS_PER_DAY
-    except:
+    except TypeError:
         return False
 
+def _seconds(t):
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+def _parse_seconds(value):
+    try:
+        return _seconds(datetime.datetime.strptime(value, TIME_FORMAT))
+    except (TypeError, ValueError):
+        return np.nan
+
+def parse_time_column(values):
+    """
+    Parse an HH:MM:SS column once into float seconds-of-day (NaN where missing/invalid).
+    A day has at most 86,400 distinct times, so only the unique values are parsed
+    (with the same strptime as the scalar helpers) and mapped back by code.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    table = np.array([_parse_seconds(u) for u in uniques] + [np.nan], dtype="float64")
+    return table[codes]  # code -1 (missing) picks the trailing NaN
+
+_hours_table = None
+
+def _round_hours(duration):
+    """
+    Whole-second durations -> hours rounded exactly like round(seconds / 3600, 2).
+    np.round rounds some halves differently, so the at most 86,400 possible
+    values are looked up in a table built once with the built-in round().
+    """
+    global _hours_table
+    if _hours_table is None:
+        _hours_table = np.array([round(s / 3600, 2) for s in range(SECONDS_PER_DAY + 1)])
+    missing = np.isnan(duration)
+    index = np.where(missing, 0, duration).astype(np.int64)
+    return np.where(missing, 0.0, _hours_table[index])
+
+def compute_attendance_metrics(in_seconds, out_seconds):
+    """
+    Vectorized core: returns (hours, late, early, overtime) arrays, matching
+    get_working_hours / check_late / check_early_logout / check_overtime per row.
+    - Check-out earlier than check-in is treated as an overnight shift (+24h).
+    - Missing check-in or check-out gives 0.0 hours; late/early are only
+      flagged when the respective time is present.
+    """
+    in_seconds = np.asarray(in_seconds, dtype="float64")
+    out_seconds = np.asarray(out_seconds, dtype="float64")
+    duration = out_seconds - in_seconds
+    duration = np.where(duration < 0, duration + SECONDS_PER_DAY, duration)
+    hours = _round_hours(duration)
+
+    late = in_seconds > _seconds(OFFICE_START)
+    early = out_seconds < _seconds(OFFICE_END)
+    overtime = hours > WORK_HOURS_PER_DAY
+    return hours, late, early, overtime
+
 def process_attendance_dataframe(df):
     """
     Adds columns for Hours Worked, Overtime, Late Arrival, Early Logout.
     Assumes 'Check-in Time' and 'Check-out Time' columns exist in HH:MM:SS format.
+    Time columns are parsed once and all derived columns are array operations.
     """
-    df["Hours Worked"] = df.apply(
-        lambda row: get_working_hours(row["Check-in Time"], row["Check-out Time"]),
-        axis=1
-    )
-    df["Late Arrival"] = df["Check-in Time"].apply(check_late)
-    df["Early Logout"] = df["Check-out Time"].apply(check_early_logout)
-    df["Overtime"] = df["Hours Worked"].apply(check_overtime)
+    in_seconds = parse_time_column(df["Check-in Time"])
+    out_seconds = parse_time_column(df["Check-out Time"])
+    hours, late, early, overtime = compute_attendance_metrics(in_seconds, out_seconds)
+    df["Hours Worked"] = hours
+    df["Late Arrival"] = late
+    df["Early Logout"] = early
+    df["Overtime"] = overtime
     return df
 
 def generate_monthly_summary(df):
     """
     Returns a grouped summary of total hours worked per employee per month.
     Assumes 'Date' is in YYYY-MM-DD format and 'Hours Worked' is already calculated.
+    The input frame is not modified; for live data prefer rollups.get_rollups().monthly_summary().
+    """
+    month = pd.to_datetime(df["Date"]).dt.to_period("M").rename("Month")
+    summary = df.groupby([df["Employee ID"], df["Name"], month])["Hours Worked"].sum().reset_index()
+    summary["Hours Worked"] = summary["Hours Worked"].round(2)
+    return summary
+
+# -------------------------
+# 🔗 Event → Session Pairing
+# -------------------------
+
+def pair_sessions(events):
+    """
+    Turn raw Check-In/Check-Out events (emp_id, timestamp, type) into sessions.
+    Events are sorted once, then paired with shifted-array comparisons:
+    - repeated Check-Ins keep the first, repeated Check-Outs keep the last (duplicate scans)
+    - a Check-In followed by a Check-Out on the same day forms a session
+    - a Check-In with no matching Check-Out is returned as an open session (NaT check_out)
+    - a Check-Out with no preceding Check-In is dropped
+    The database derives sessions and rollups with the same rules
+    (utils.attendance_log.pair_day), so dashboards and totals agree.
+    Returns columns: emp_id, date, check_in, check_out, hours.
+    """
+    ev = pd.DataFrame({
+        "emp_id": events["emp_id"].to_numpy(),
+        "timestamp": pd.to_datetime(events["timestamp"]).to_numpy(),
+        "is_in": (events["type"] == CHECK_IN).to_numpy(),
+    })
+    ev = ev.sort_values(["emp_id", "timestamp"], kind="stable").reset_index(drop=True)
+    ev["date"] = ev["timestamp"].dt.normalize()
+
+    def _same_group(shift):
+        return ((ev["emp_id"] == ev["emp_id"].shift(shift)) & (ev["date"] == ev["date"].shift(shift))).to_numpy()
+
+    is_in = ev["is_in"].to_numpy()
+    prev_in = np.roll(is_in, 1)
+    next_in = np.roll(is_in, -1)
+    dup_in = is_in & prev_in & _same_group(1)
+    dup_out = ~is_in & ~next_in & _same_group(-1)
+    ev = ev[~(dup_in | dup_out)].reset_index(drop=True)
+
+    is_in = ev["is_in"].to_numpy()
+    next_is_out = ~np.roll(is_in, -1) & _same_group(-1)
+    next_ts = ev["timestamp"].shift(-1)
+
+    starts = is_in
+    sessions = pd.DataFrame({
+        "emp_id": ev["emp_id"][starts].to_numpy(),
+        "date": ev["date"][starts].dt.date.to_numpy(),
+        "check_in": ev["timestamp"][starts].to_numpy(),
+        "check_out": next_ts.where(next_is_out)[starts].to_numpy(),
+    })
+    sessions["hours"] = ((sessions["check_out"] - sessions["check_in"]).dt.total_seconds() / 3600).round(2)
+    return sessions
+
+def calculate_working_hours(events):
+    """
+    Per-employee, per-day working-hour totals from raw attendance events.
+    Open sessions (no check-out yet) count towards Sessions but not Hours Worked.
     """
-    df["Month"] = pd.to_datetime(df["Date"]).dt.to_period("M")
-    summary = df.groupby(["Employee ID", "Name", "Month"])["Hours Worked"].sum().reset_index()
+    sessions = pair_sessions(events)
+    sessions["open"] = sessions["check_out"].isna()
+    summary = sessions.groupby(["emp_id", "date"], sort=True).agg(
+        Sessions=("check_in", "size"),
+        **{"Hours Worked": ("hours", "sum"), "Open Session": ("open", "any")},
+    ).reset_index()
     summary["Hours Worked"] = summary["Hours Worked"].round(2)
+    if "name" in events.columns:
+        names = events.drop_duplicates("emp_id", keep="last").set_index("emp_id")["name"]
+        summary.insert(1, "name", summary["emp_id"].map(names))
     return summary
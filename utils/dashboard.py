@@ -0,0 +1,110 @@
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+
+from utils import database
+from utils.attendance_log import AttendanceEvent, AttendanceLog
+from utils.calculator import calculate_working_hours
+
+# -------------------------------
+# 📊 Cached Dashboard Views
+# -------------------------------
+
+CLOCKED_IN_COLUMNS = ["emp_id", "name", "department", "timestamp"]
+
+
+class DashboardViews:
+    """
+    Dashboard frames cached against AttendanceLog.version.
+    Reruns with no new events reuse the cached frames; new events only
+    recompute the working-hours rows of the employees they belong to.
+    """
+
+    def __init__(self, log):
+        self.log = log
+        self._clocked_in = None
+        self._clocked_in_version = -1
+        self._summary = None
+        self._summary_version = 0
+
+    def clocked_in(self):
+        """
+        Currently clocked-in employees (maintained incrementally by the log).
+        """
+        if self._clocked_in_version != self.log.version:
+            self._clocked_in = pd.DataFrame(
+                [e.to_dict() for e in self.log.clocked_in()], columns=CLOCKED_IN_COLUMNS
+            )
+            self._clocked_in_version = self.log.version
+        return self._clocked_in
+
+    def working_hours(self):
+        """
+        Working-hours summary, recomputed only for employees with new events.
+        """
+        if self._summary is not None and self._summary_version == self.log.version:
+            return self._summary
+
+        changed = self.log.changed_since(self._summary_version)
+        events = [e.to_dict() for emp_id in changed for e in self.log.events_for_employee(emp_id)]
+        fresh = calculate_working_hours(pd.DataFrame(events)) if events else None
+
+        if self._summary is None:
+            summary = fresh
+        else:
+            kept = self._summary[~self._summary["emp_id"].isin(changed)]
+            summary = pd.concat([kept, fresh], ignore_index=True) if fresh is not None else kept
+        if summary is not None:
+            summary = summary.sort_values(["emp_id", "date"], kind="stable", ignore_index=True)
+
+        self._summary = summary
+        self._summary_version = self.log.version
+        return summary
+
+
+class LiveAttendance:
+    """
+    Today's events tailed from the database into an AttendanceLog, so the
+    dashboard shows scans from every session, process and the kiosk API.
+    Each refresh fetches only rows stored after the last one seen; the log
+    starts over when the day changes. Shared by all sessions of a process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._day = None
+
+    def _reset(self, day):
+        self.log = AttendanceLog()
+        self.views = DashboardViews(self.log)
+        self._day = day
+        self._last_id = 0
+
+    def refresh(self, day=None):
+        """
+        Pull new events and return (clocked-in frame, working-hours frame or None).
+        """
+        day = day or date.today()
+        with self._lock:
+            if day != self._day:
+                self._reset(day)
+            for row in database.events_after(self._last_id, day):
+                self.log.append(AttendanceEvent(
+                    row["emp_id"], row["name"], row["department"],
+                    datetime.fromisoformat(row["timestamp"]), row["type"], row["ip"], id=row["id"],
+                ))
+                self._last_id = row["id"]
+            return self.views.clocked_in(), self.views.working_hours()
+
+
+_live = None
+_live_lock = threading.Lock()
+
+
+def get_live_attendance():
+    global _live
+    with _live_lock:
+        if _live is None:
+            _live = LiveAttendance()
+        return _live
@@ -0,0 +1,523 @@
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.attendance_log import CHECK_IN, CHECK_OUT, AttendanceEvent, pair_day
+
+# -------------------------------
+# 🗄️ SQLite Storage
+# -------------------------------
+
+DB_FILE = os.environ.get("ATTENDANCE_DB", "attendance.db")
+POOL_SIZE = 8
+UNASSIGNED = "Unassigned"  # department key for employees without one
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database")
+
+# SQL is kept as constants with ? parameters: sqlite3 caches each compiled
+# statement per connection, so these are prepared once and reused.
+SQL_GET_EMPLOYEE = "SELECT emp_id, name, department FROM employees WHERE emp_id = ?"
+SQL_LIST_EMPLOYEES = "SELECT emp_id, name, department FROM employees ORDER BY emp_id"
+SQL_UPSERT_EMPLOYEE = (
+    "INSERT INTO employees (emp_id, name, department) VALUES (?, ?, ?) "
+    "ON CONFLICT (emp_id) DO UPDATE SET name = excluded.name, department = excluded.department, "
+    "updated_at = CURRENT_TIMESTAMP"
+)
+SQL_DELETE_EMPLOYEE = "DELETE FROM employees WHERE emp_id = ?"
+SQL_LAST_EVENT = (
+    "SELECT type FROM attendance_events WHERE emp_id = ? AND date = ? "
+    "ORDER BY timestamp DESC, id DESC LIMIT 1"
+)
+SQL_INSERT_EVENT = (
+    "INSERT INTO attendance_events (emp_id, name, department, date, timestamp, type, ip, location) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_DAY_EVENTS = (
+    "SELECT timestamp, type, department FROM attendance_events WHERE emp_id = ? AND date = ? "
+    "ORDER BY timestamp, id"
+)
+SQL_DAY_SESSIONS = "SELECT check_in, check_out, department FROM sessions WHERE emp_id = ? AND date = ?"
+SQL_DELETE_DAY_SESSIONS = "DELETE FROM sessions WHERE emp_id = ? AND date = ?"
+SQL_INSERT_SESSION = (
+    "INSERT INTO sessions (emp_id, department, date, check_in, check_out, hours) VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_ADD_ROLLUP = (
+    "INSERT INTO rollups (scope, period, key, hours, sessions, events) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (scope, period, key) DO UPDATE SET hours = hours + excluded.hours, "
+    "sessions = sessions + excluded.sessions, events = events + excluded.events"
+)
+SQL_EVENT_EXISTS = "SELECT 1 FROM attendance_events WHERE emp_id = ? AND date = ? AND timestamp = ? AND type = ?"
+SQL_EVENTS_AFTER = (
+    "SELECT id, emp_id, name, department, date, timestamp, type, ip, location "
+    "FROM attendance_events WHERE date = ? AND id > ? ORDER BY id"
+)
+SQL_UPDATE_LOCATION = "UPDATE attendance_events SET ip = ?, location = ? WHERE id = ?"
+SQL_GET_CONFIG = "SELECT key, value FROM config"
+SQL_SET_CONFIG = "INSERT INTO config (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+SQL_EMPLOYEES_VERSION = "SELECT value FROM config WHERE key = 'employees_version'"
+SQL_BUMP_EMPLOYEES_VERSION = (
+    "INSERT INTO config (key, value) VALUES ('employees_version', '1') "
+    "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+)
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of WAL-mode SQLite connections shared by all threads.
+    Each connection is used by one thread at a time.
+    """
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self._pool = queue.LifoQueue()
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                               isolation_level=None, cached_statements=256)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Run a block in one transaction; IMMEDIATE takes the write lock up front
+        so read-then-write sequences cannot interleave with other writers.
+        """
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            finally:
+                # also covers a failed COMMIT (e.g. SQLITE_BUSY), so the
+                # connection never goes back to the pool mid-transaction
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _read_sql(name):
+    with open(os.path.join(SCHEMA_DIR, name)) as f:
+        return f.read()
+
+
+def get_pool():
+    """
+    Return the process-wide pool, creating the schema and seed rows on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            pool = ConnectionPool(DB_FILE)
+            with pool.connection() as conn:
+                conn.executescript(_read_sql("schema.sql"))
+                conn.executescript(_read_sql("seed_data.sql"))
+            _pool = pool
+        return _pool
+
+
+def configure(path):
+    """
+    Point the process at another database file (tests, benchmarks, migrations).
+    """
+    global DB_FILE, _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+        DB_FILE = path
+
+
+# ---------- employees ----------
+
+def _employee_dict(row):
+    return {"Employee ID": row[0], "Name": row[1], "Department": row[2]}
+
+
+def get_employee(emp_id):
+    with get_pool().connection() as conn:
+        row = conn.execute(SQL_GET_EMPLOYEE, (str(emp_id),)).fetchone()
+    return _employee_dict(row) if row else None
+
+
+def list_employees():
+    with get_pool().connection() as conn:
+        return [_employee_dict(row) for row in conn.execute(SQL_LIST_EMPLOYEES)]
+
+
+def employees_version():
+    """
+    Counter bumped by every employee write, used to invalidate caches.
+    """
+    with get_pool().connection() as conn:
+        row = conn.execute(SQL_EMPLOYEES_VERSION).fetchone()
+    return int(row[0]) if row else 0
+
+
+def upsert_employees(rows):
+    """
+    Insert or update (emp_id, name, department) rows in one transaction.
+    """
+    with get_pool().transaction(immediate=True) as conn:
+        conn.executemany(SQL_UPSERT_EMPLOYEE, ((str(e), n, d) for e, n, d in rows))
+        conn.execute(SQL_BUMP_EMPLOYEES_VERSION)
+
+
+def upsert_employee(emp_id, name, department):
+    upsert_employees([(emp_id, name, department)])
+
+
+def delete_employees(emp_ids):
+    with get_pool().transaction(immediate=True) as conn:
+        conn.executemany(SQL_DELETE_EMPLOYEE, ((str(e),) for e in emp_ids))
+        conn.execute(SQL_BUMP_EMPLOYEES_VERSION)
+
+
+def delete_employee(emp_id):
+    delete_employees([emp_id])
+
+
+def replace_employees(rows):
+    """
+    Make the employees table match `rows` exactly, in one transaction.
+    """
+    rows = [(str(e), n, d) for e, n, d in rows]
+    with get_pool().transaction(immediate=True) as conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_ids (emp_id TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM keep_ids")
+        conn.executemany("INSERT OR IGNORE INTO keep_ids (emp_id) VALUES (?)", ((r[0],) for r in rows))
+        conn.execute("DELETE FROM employees WHERE emp_id NOT IN (SELECT emp_id FROM keep_ids)")
+        conn.executemany(SQL_UPSERT_EMPLOYEE, rows)
+        conn.execute(SQL_BUMP_EMPLOYEES_VERSION)
+
+
+def apply_employee_changes(upserts, deletes):
+    """
+    Apply a roster diff (upserted rows, removed IDs) as one transaction.
+    """
+    with get_pool().transaction(immediate=True) as conn:
+        conn.executemany(SQL_DELETE_EMPLOYEE, ((str(e),) for e in deletes))
+        conn.executemany(SQL_UPSERT_EMPLOYEE, ((str(e), n, d) for e, n, d in upserts))
+        conn.execute(SQL_BUMP_EMPLOYEES_VERSION)
+
+
+# ---------- attendance events & sessions ----------
+
+def _session_hours(check_in, check_out):
+    return (datetime.fromisoformat(check_out) - datetime.fromisoformat(check_in)).total_seconds() / 3600
+
+
+def _insert_event(conn, emp_id, name, department, timestamp, type, ip=None, location=None):
+    """
+    Insert one event and, in the same transaction, re-pair that employee's
+    day into closed sessions (pair_day, the rules of calculator.pair_sessions)
+    and add the change in hours and sessions to the rollups.
+    """
+    day = timestamp.date().isoformat()
+    stamp = timestamp.isoformat()
+    cursor = conn.execute(SQL_INSERT_EVENT, (
+        emp_id, name, department, day, stamp, type, ip,
+        json.dumps(location) if location is not None else None,
+    ))
+    old = conn.execute(SQL_DAY_SESSIONS, (emp_id, day)).fetchall()
+    new = [(start[0], end[0], start[2]) for start, end in pair_day(conn.execute(SQL_DAY_EVENTS, (emp_id, day)).fetchall())]
+    if old != new:
+        conn.execute(SQL_DELETE_DAY_SESSIONS, (emp_id, day))
+        conn.executemany(SQL_INSERT_SESSION, (
+            (emp_id, dept, day, start, end, round(_session_hours(start, end), 4)) for start, end, dept in new
+        ))
+
+    # (hours, sessions) deltas per department; sessions carry their check-in's department
+    delta = {}
+    for sign, rows in ((-1, old), (1, new)):
+        for start, end, dept in rows:
+            hours, count = delta.get(dept or UNASSIGNED, (0.0, 0))
+            delta[dept or UNASSIGNED] = (hours + sign * _session_hours(start, end), count + sign)
+    delta.setdefault(department or UNASSIGNED, (0.0, 0))
+    hours = sum(h for h, _ in delta.values())
+    sessions = sum(c for _, c in delta.values())
+    conn.executemany(SQL_ADD_ROLLUP, [
+        ("emp_day", day, emp_id, hours, sessions, 1),
+        ("emp_month", day[:7], emp_id, hours, sessions, 1),
+    ] + [
+        ("dept_day", day, dept, h, c, 1 if dept == (department or UNASSIGNED) else 0)
+        for dept, (h, c) in delta.items()
+    ])
+    return cursor.lastrowid
+
+
+def _record_scan(conn, emp_id, name, department, timestamp, ip=None, location=None):
+    last = conn.execute(SQL_LAST_EVENT, (emp_id, timestamp.date().isoformat())).fetchone()
+    type = CHECK_OUT if last and last[0] == CHECK_IN else CHECK_IN
+    return _insert_event(conn, emp_id, name, department, timestamp, type, ip, location), type
+
+
+def record_scan(emp_id, name, department, timestamp, ip=None, location=None):
+    """
+    Decide Check-In vs Check-Out from the (emp_id, date) index and store the
+    event atomically. Returns (event id, type).
+    """
+    with get_pool().transaction(immediate=True) as conn:
+        return _record_scan(conn, emp_id, name, department, timestamp, ip, location)
+
+
+def record_scans(scans):
+    """
+    record_scan for a batch of (emp_id, name, department, timestamp, ip,
+    location) tuples in one transaction; each type is decided after the
+    scans before it. Returns [(event id, type), ...] in input order.
+    """
+    with get_pool().transaction(immediate=True) as conn:
+        return [_record_scan(conn, *scan) for scan in scans]
+
+
+def insert_events(events):
+    """
+    Store already-decided AttendanceEvents in one transaction (batch writers).
+    Closed sessions and rollups are derived as in record_scan.
+    """
+    with get_pool().transaction(immediate=True) as conn:
+        for e in events:
+            e.id = _insert_event(conn, e.emp_id, e.name, e.department, e.timestamp, e.type, e.ip, e.location)
+
+
+def update_event_location(event_id, ip, location):
+    with get_pool().transaction() as conn:
+        conn.execute(SQL_UPDATE_LOCATION, (ip, json.dumps(location) if location is not None else None, event_id))
+
+
+EVENT_COLUMNS = ["id", "emp_id", "name", "department", "date", "timestamp", "type", "ip", "location"]
+EVENT_FETCH_ROWS = 10000
+
+
+def _events_sql(emp_id=None, start=None, end=None, department=None, columns="*"):
+    clauses, params = [], []
+    if emp_id is not None:
+        clauses.append("emp_id = ?")
+        params.append(str(emp_id))
+    if start is not None:
+        clauses.append("date >= ?")
+        params.append(str(start))
+    if end is not None:
+        clauses.append("date <= ?")
+        params.append(str(end))
+    if department is not None:
+        clauses.append("department = ?")
+        params.append(department)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return f"SELECT {columns} FROM attendance_events {where}", params
+
+
+def iter_events(emp_id=None, start=None, end=None, department=None, batch_size=EVENT_FETCH_ROWS):
+    """
+    Stream query_events results in fetch batches instead of one list.
+    """
+    sql, params = _events_sql(emp_id, start, end, department, ", ".join(EVENT_COLUMNS))
+    with get_pool().connection() as conn:
+        cursor = conn.execute(sql + " ORDER BY timestamp, id", params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield dict(zip(EVENT_COLUMNS, row))
+
+
+def query_events(emp_id=None, start=None, end=None, department=None):
+    """
+    Events filtered by employee, date range (inclusive ISO dates) and department,
+    served from the (emp_id, date) / (date, department) indexes.
+    """
+    return list(iter_events(emp_id, start, end, department))
+
+
+def count_events(emp_id=None, start=None, end=None, department=None):
+    sql, params = _events_sql(emp_id, start, end, department, "COUNT(*)")
+    with get_pool().connection() as conn:
+        return conn.execute(sql, params).fetchone()[0]
+
+
+class EventQuery:
+    """
+    Sized, re-iterable view of stored events for exports: len() is a COUNT,
+    iteration streams rows with timestamp/date parsed and location as JSON text.
+    """
+
+    def __init__(self, emp_id=None, start=None, end=None, department=None):
+        self.filters = (emp_id, start, end, department)
+
+    def __len__(self):
+        return count_events(*self.filters)
+
+    def __iter__(self):
+        for event in iter_events(*self.filters):
+            event["timestamp"] = datetime.fromisoformat(event["timestamp"])
+            event["date"] = event["timestamp"].date()
+            yield event
+
+
+def events_after(event_id, day):
+    """
+    Events of `day` stored after row `event_id`, in insertion order (for tailing).
+    """
+    with get_pool().connection() as conn:
+        rows = conn.execute(SQL_EVENTS_AFTER, (str(day), event_id)).fetchall()
+    return [dict(zip(EVENT_COLUMNS, row)) for row in rows]
+
+
+def delete_events_between(start, end):
+    """
+    Delete events and sessions for an inclusive date range (after archiving).
+    `start=None` means from the beginning.
+    """
+    start = str(start) if start is not None else ""
+    with get_pool().transaction(immediate=True) as conn:
+        conn.execute("DELETE FROM attendance_events WHERE date >= ? AND date <= ?", (start, str(end)))
+        conn.execute("DELETE FROM sessions WHERE date >= ? AND date <= ?", (start, str(end)))
+
+
+# ---------- rollups ----------
+
+ROLLUP_COLUMNS = ["hours", "sessions", "events"]
+
+
+def get_rollup(scope, period, key):
+    with get_pool().connection() as conn:
+        row = conn.execute(
+            "SELECT hours, sessions, events FROM rollups WHERE scope = ? AND period = ? AND key = ?",
+            (scope, str(period), str(key)),
+        ).fetchone()
+    return dict(zip(ROLLUP_COLUMNS, row or (0.0, 0, 0)))
+
+
+def list_rollups(scope, period=None):
+    """
+    (period, key, hours, sessions, events) rows of one scope, optionally for a
+    single period, served from the (scope, period, key) primary key.
+    """
+    sql = "SELECT period, key, hours, sessions, events FROM rollups WHERE scope = ?"
+    params = [scope]
+    if period is not None:
+        sql += " AND period = ?"
+        params.append(str(period))
+    with get_pool().connection() as conn:
+        return conn.execute(sql + " ORDER BY period, key", params).fetchall()
+
+
+# ---------- config ----------
+
+def get_config():
+    with get_pool().connection() as conn:
+        return dict(conn.execute(SQL_GET_CONFIG).fetchall())
+
+
+def set_config(values):
+    with get_pool().transaction() as conn:
+        conn.executemany(SQL_SET_CONFIG, ((k, str(v)) for k, v in values.items()))
+
+
+# ---------- migration ----------
+
+MIGRATED_KEY = "migrated_from_csv"  # config key set once a migration has completed
+
+
+def _legacy_location(text):
+    """
+    Location cell of an old CSV export: JSON, or the Python repr of a dict
+    that the original pandas export wrote.
+    """
+    import ast
+
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def migrate_from_csv(profile_csv="employee_profiles.csv", config_csv="admin_config.csv",
+                     events_csv="attendance_log.csv", force=False):
+    """
+    One-shot import of the old CSV files. Files that do not exist are
+    skipped; employees and config are upserted, events appended.
+    Before the database, attendance events lived only in each Streamlit
+    session; the one place they were persisted is the Export tab's CSV
+    (attendance_log.csv, columns emp_id, name, department, timestamp, type,
+    date, ip, location). Pass every saved export as events_csv (Excel/PDF
+    exports have to be saved as CSV first).
+    A completed migration is recorded in config and not repeated (it would
+    overwrite later edits) unless force=True; events already in the
+    database are skipped, so overlapping exports or a forced run add no
+    duplicates. Returns the number of rows imported per source.
+    """
+    import csv
+
+    counts = {"employees": 0, "config": 0, "events": 0}
+    if not force and get_config().get(MIGRATED_KEY):
+        return counts
+    if os.path.exists(profile_csv):
+        with open(profile_csv, newline="") as f:
+            rows = [(r["Employee ID"], r["Name"], r["Department"]) for r in csv.DictReader(f)]
+        upsert_employees(rows)
+        counts["employees"] = len(rows)
+    if os.path.exists(config_csv):
+        with open(config_csv, newline="") as f:
+            first = next(csv.DictReader(f), None)
+        if first:
+            set_config(first)
+            counts["config"] = len(first)
+    if events_csv and os.path.exists(events_csv):
+        with open(events_csv, newline="") as f:
+            events = [
+                AttendanceEvent(r["emp_id"], r.get("name") or None, r.get("department") or None,
+                                datetime.fromisoformat(r["timestamp"]), r["type"],
+                                r.get("ip") or None, _legacy_location(r.get("location")))
+                for r in csv.DictReader(f)
+            ]
+        with get_pool().connection() as conn:
+            events = [
+                e for e in events
+                if conn.execute(SQL_EVENT_EXISTS, (e.emp_id, e.timestamp.date().isoformat(),
+                                                   e.timestamp.isoformat(), e.type)).fetchone() is None
+            ]
+        events.sort(key=lambda e: e.timestamp)
+        insert_events(events)
+        counts["events"] = len(events)
+    set_config({MIGRATED_KEY: datetime.now().isoformat(timespec="seconds")})
+    return counts
+
+
+if __name__ == "__main__":
+    # python -m utils.database migrate [--force] [profiles.csv] [admin_config.csv] [attendance_log.csv]
+    if len(sys.argv) < 2 or sys.argv[1] != "migrate":
+        sys.exit("usage: python -m utils.database migrate [--force] [profiles.csv] [admin_config.csv] [attendance_log.csv]")
+    args = [a for a in sys.argv[2:] if a != "--force"]
+    print(migrate_from_csv(*args, force="--force" in sys.argv))
@@ -0,0 +1,189 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# 🔎 Cached EDA Profiles
+# -------------------------------
+
+# Above this many rows the profile switches to approximate statistics
+APPROX_ROWS = 2_000_000
+SAMPLE_ROWS = 200_000
+MOMENT_CHUNK_ROWS = 1_000_000
+TOP_VALUES = 20
+HLL_PRECISION = 14  # 16384 registers, ~0.8% standard error
+PROFILE_CACHE_SIZE = 8
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_fingerprints = {}  # id(df) -> (weakref to df, fingerprint)
+
+
+def dataset_fingerprint(df):
+    """
+    Content hash of a DataFrame (values and column names), computed with
+    pandas' vectorized row hashing. Remembered per frame object, so a
+    rerun over the same session dataset does not hash it again.
+    """
+    known = _fingerprints.get(id(df))
+    if known is not None and known[0]() is df:
+        return known[1]
+    digest = hashlib.sha1(repr(list(df.columns)).encode())
+    digest.update(str(df.shape).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    fingerprint = digest.hexdigest()
+    try:
+        _fingerprints[id(df)] = (weakref.ref(df, lambda _, key=id(df): _fingerprints.pop(key, None)), fingerprint)
+    except TypeError:
+        pass
+    return fingerprint
+
+
+# ---------- sketches ----------
+
+def approx_distinct(series, precision=HLL_PRECISION):
+    """
+    HyperLogLog distinct count over the column's 64-bit value hashes.
+    """
+    values = series.dropna()
+    if values.empty:
+        return 0
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    m = 1 << precision
+    idx = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    rest = (hashes & np.uint64((1 << (64 - precision)) - 1)).astype(np.float64)
+    # rank = position of the leftmost 1-bit in the remaining (64 - p) bits
+    bit_length = np.where(rest > 0, np.frexp(rest)[1], 0)
+    rank = (64 - precision) - bit_length + 1
+    registers = np.zeros(m, dtype=np.int64)
+    np.maximum.at(registers, idx, rank)
+
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.power(2.0, -registers))
+    zeros = np.count_nonzero(registers == 0)
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)  # linear counting for small cardinalities
+    return int(round(min(estimate, len(values))))
+
+
+def _moments(numeric):
+    """
+    Streaming count/mean/std/skew/kurtosis/min/max from chunked power sums
+    (one pass over the numeric block).
+    """
+    cols = numeric.columns
+    n = np.zeros(len(cols))
+    s1 = np.zeros(len(cols))
+    s2 = np.zeros(len(cols))
+    s3 = np.zeros(len(cols))
+    s4 = np.zeros(len(cols))
+    lo = np.full(len(cols), np.inf)
+    hi = np.full(len(cols), -np.inf)
+    shift = None
+    for start in range(0, len(numeric), MOMENT_CHUNK_ROWS):
+        block = numeric.iloc[start:start + MOMENT_CHUNK_ROWS].to_numpy(dtype="float64")
+        valid = ~np.isnan(block)
+        if shift is None:
+            # shift by the first chunk's mean so power sums stay well conditioned
+            counts = valid.sum(axis=0)
+            shift = np.where(counts > 0, np.where(valid, block, 0.0).sum(axis=0) / np.maximum(counts, 1), 0.0)
+        x = np.where(valid, block - shift, 0.0)
+        n += valid.sum(axis=0)
+        s1 += x.sum(axis=0)
+        x2 = x * x
+        s2 += x2.sum(axis=0)
+        s3 += (x2 * x).sum(axis=0)
+        s4 += (x2 * x2).sum(axis=0)
+        lo = np.minimum(lo, np.where(valid, block, np.inf).min(axis=0))
+        hi = np.maximum(hi, np.where(valid, block, -np.inf).max(axis=0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_shifted = s1 / n
+        m2 = s2 / n - mean_shifted ** 2
+        m3 = s3 / n - 3 * mean_shifted * s2 / n + 2 * mean_shifted ** 3
+        m4 = s4 / n - 4 * mean_shifted * s3 / n + 6 * mean_shifted ** 2 * s2 / n - 3 * mean_shifted ** 4
+        var = m2 * n / (n - 1)
+        # bias-corrected sample skewness / excess kurtosis, as pandas reports them
+        g1 = m3 / m2 ** 1.5
+        skew = g1 * np.sqrt(n * (n - 1)) / (n - 2)
+        g2 = m4 / m2 ** 2 - 3
+        kurt = (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * g2 + 6)
+
+    return pd.DataFrame({
+        "count": n,
+        "mean": mean_shifted + shift,
+        "std": np.sqrt(var),
+        "min": np.where(np.isinf(lo), np.nan, lo),
+        "max": np.where(np.isinf(hi), np.nan, hi),
+        "skew": skew,
+        "kurtosis": kurt,
+    }, index=cols)
+
+
+# ---------- profile ----------
+
+def _build_profile(df, approximate):
+    rows = len(df)
+    sample = df.sample(n=SAMPLE_ROWS, random_state=0) if approximate and rows > SAMPLE_ROWS else df
+    scale = rows / len(sample) if len(sample) else 1.0
+
+    numeric = df.select_dtypes(include=[np.number])
+    stats = _moments(numeric) if not numeric.empty else pd.DataFrame()
+    if not numeric.empty:
+        quantiles = sample[numeric.columns].quantile([0.25, 0.5, 0.75]).T
+        quantiles.columns = ["25%", "50%", "75%"]
+        stats = stats.join(quantiles)[["count", "mean", "std", "min", "25%", "50%", "75%", "max", "skew", "kurtosis"]]
+
+    if approximate:
+        unique = pd.Series({col: approx_distinct(df[col]) for col in df.columns}, dtype="int64")
+    else:
+        unique = df.nunique()
+
+    cat_cols = df.select_dtypes(include=["object", "string", "category"]).columns
+    value_counts = {}
+    for col in cat_cols:
+        counts = sample[col].value_counts().head(TOP_VALUES)
+        value_counts[col] = (counts * scale).round().astype("int64") if scale != 1.0 else counts
+
+    corr = sample[numeric.columns].corr() if not numeric.empty else None
+
+    return {
+        "shape": df.shape,
+        "columns": list(df.columns),
+        "dtypes": df.dtypes.astype(str),
+        "summary": stats,
+        "missing": df.isna().sum(),
+        "unique": unique,
+        "correlation": corr,
+        "value_counts": value_counts,
+        "head": df.head(),
+        "tail": df.tail(),
+        "approximate": approximate,
+    }
+
+
+def profile_dataset(df, approximate=None):
+    """
+    Return the EDA profile for a dataset, computed once per content hash.
+    `approximate=None` picks approximate mode automatically above APPROX_ROWS.
+    Approximate mode uses HyperLogLog distinct counts, value counts and
+    quantiles from a uniform random sample (scaled to the full row count)
+    and streaming moments; exact mode uses full passes.
+    """
+    if approximate is None:
+        approximate = len(df) > APPROX_ROWS
+    key = (dataset_fingerprint(df), approximate)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    profile = _build_profile(df, approximate)
+    with _cache_lock:
+        _cache[key] = profile
+        while len(_cache) > PROFILE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return profile
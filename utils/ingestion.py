@@ -0,0 +1,181 @@
+import hashlib
+import os
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# -------------------------------
+# 📥 Chunked Dataset Ingestion
+# -------------------------------
+
+INGEST_CHUNK_ROWS = 200000
+# Object columns with at most this share of distinct values become categoricals
+CATEGORY_RATIO = 0.05
+HASH_BLOCK = 1 << 20
+# Shared on-disk store of ingested datasets, keyed by file content
+DATASET_STORE = os.environ.get("ATTENDANCE_DATASET_STORE", "dataset_store")
+SUPPORTED_TYPES = ["csv", "xlsx", "json", "parquet", "feather", "arrow"]
+
+
+def optimize_dtypes(df, category_ratio=CATEGORY_RATIO):
+    """
+    Downcast numeric columns to the smallest int/float type and turn
+    low-cardinality string columns into categoricals. Categoricals above
+    the ratio go back to their values' dtype, so a second pass over the
+    whole file corrects categories that were decided from one chunk.
+    """
+    out = {}
+    for col in df.columns:
+        series = df[col]
+        kind = series.dtype.kind
+        if kind in "iu":
+            series = pd.to_numeric(series, downcast="unsigned" if (series >= 0).all() else "integer")
+        elif kind == "f":
+            series = pd.to_numeric(series, downcast="float")
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            if len(series) and series.nunique(dropna=True) > category_ratio * len(series):
+                series = series.astype(series.cat.categories.dtype)
+        elif kind == "O" and len(series):
+            if series.nunique(dropna=True) <= category_ratio * len(series):
+                series = series.astype("category")
+        out[col] = series
+    return pd.DataFrame(out, index=df.index)
+
+
+def _concat_chunks(chunks):
+    """
+    Concatenate optimized chunks, merging per-chunk categoricals with
+    union_categoricals so they do not fall back to object dtype.
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+    columns = {}
+    for col in chunks[0].columns:
+        parts = [chunk[col] for chunk in chunks]
+        if all(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+            columns[col] = pd.Series(union_categoricals(parts, ignore_order=True), name=col)
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def _iter_chunks(source, name, chunksize):
+    ext = name.lower().rsplit(".", 1)[-1]
+    if ext == "csv":
+        yield from pd.read_csv(source, chunksize=chunksize, low_memory=True)
+    elif ext == "json":
+        try:
+            yield from pd.read_json(source, lines=True, chunksize=chunksize)
+        except ValueError:
+            if hasattr(source, "seek"):
+                source.seek(0)
+            yield pd.read_json(source)
+    elif ext == "xlsx":
+        # openpyxl has no chunked reader; optimize once after loading
+        yield pd.read_excel(source)
+    elif ext == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif ext in ("feather", "arrow"):
+        import pyarrow as pa
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i).to_pandas()
+    else:
+        raise ValueError(f"Unsupported file type: {name}")
+
+
+def _memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def _dataset_key(source, name):
+    """
+    Content hash of the upload (read in blocks), plus the file type.
+    Returns None for sources that cannot be re-read, e.g. plain streams.
+    """
+    digest = hashlib.sha256(name.lower().rsplit(".", 1)[-1].encode())
+    if hasattr(source, "getbuffer"):
+        buf = source.getbuffer()
+        for start in range(0, buf.nbytes, HASH_BLOCK):
+            digest.update(buf[start:start + HASH_BLOCK])
+    elif isinstance(source, str) and os.path.exists(source):
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b""):
+                digest.update(block)
+    else:
+        return None
+    return digest.hexdigest()[:32]
+
+
+def _store_path(key, store=None):
+    return os.path.join(store or DATASET_STORE, f"{key}.arrow")
+
+
+def load_stored(path):
+    """
+    Read a stored dataset through a memory map. The file is read from the
+    shared page cache, but the pandas frame built from it is still a
+    private copy per session (strings and categoricals are converted).
+    """
+    import pyarrow.feather as feather
+
+    return feather.read_feather(path, memory_map=True)
+
+
+def store_memory_mapped(df, key, store=None):
+    """
+    Write the optimized frame as uncompressed Arrow IPC under its content
+    key, so later uploads of the same file skip ingestion entirely.
+    """
+    import pyarrow.feather as feather
+
+    path = _store_path(key, store)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        feather.write_feather(df.reset_index(drop=True), tmp, compression="uncompressed")
+        os.replace(tmp, path)
+    return load_stored(path), path
+
+
+def ingest_dataset(source, name, chunksize=INGEST_CHUNK_ROWS, memory_map=False):
+    """
+    Read a CSV/Excel/JSON/Parquet/Arrow file in chunks, downcasting each
+    chunk as it arrives. Returns (DataFrame, report) where the report has
+    row/column counts and the memory before/after optimization.
+    With memory_map=True the result is kept in DATASET_STORE by content
+    hash; an identical upload is then loaded from there without re-parsing.
+    """
+    key = _dataset_key(source, name) if memory_map else None
+    if key is not None and os.path.exists(_store_path(key)):
+        path = _store_path(key)
+        df = load_stored(path)
+        mb = round(_memory_mb(df), 2)
+        return df, {"rows": len(df), "columns": df.shape[1], "raw_mb": mb, "optimized_mb": mb,
+                    "saved_mb": 0.0, "saved_pct": 0.0, "path": path, "cached": True}
+
+    raw_mb = 0.0
+    chunks = []
+    for chunk in _iter_chunks(source, name, chunksize):
+        raw_mb += _memory_mb(chunk)
+        chunks.append(optimize_dtypes(chunk))
+    df = _concat_chunks(chunks) if chunks else pd.DataFrame()
+    # re-decide categories on whole-file distinct counts: per-chunk
+    # categoricals that are too distinct overall are converted back
+    df = optimize_dtypes(df)
+
+    report = {
+        "rows": len(df),
+        "columns": df.shape[1],
+        "raw_mb": round(raw_mb, 2),
+        "optimized_mb": round(_memory_mb(df), 2),
+    }
+    report["saved_mb"] = round(report["raw_mb"] - report["optimized_mb"], 2)
+    report["saved_pct"] = round(100 * report["saved_mb"] / raw_mb, 1) if raw_mb else 0.0
+
+    if key is not None:
+        df, path = store_memory_mapped(df, key)
+        report["path"] = path
+    return df, report
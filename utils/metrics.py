@@ -0,0 +1,211 @@
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# -------------------------------
+# ⏱️ Hot-path Metrics
+# -------------------------------
+
+# Set ATTENDANCE_METRICS=0 to turn timers and counters into no-ops
+ENABLED = os.environ.get("ATTENDANCE_METRICS", "1") != "0"
+METRICS_FILE = "attendance_metrics.prom"
+# Prometheus histogram bucket bounds, in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SAMPLE_WINDOW = 2048  # recent samples kept per stage for percentiles
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count", "recent")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.total += seconds
+        self.count += 1
+        self.recent.append(seconds)
+
+    def percentiles(self, qs=(0.5, 0.95, 0.99)):
+        samples = sorted(self.recent)
+        if not samples:
+            return {q: None for q in qs}
+        return {q: samples[min(len(samples) - 1, int(q * len(samples)))] for q in qs}
+
+
+def observe(stage, seconds):
+    if not ENABLED:
+        return
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = _Histogram()
+        hist.observe(seconds)
+
+
+def increment(name, amount=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+class _Timer:
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(stage):
+    """
+    Context manager timing one stage, e.g. `with timer("decode_qr"): ...`.
+    Returns a shared no-op object when metrics are disabled.
+    """
+    return _Timer(stage) if ENABLED else _NULL_TIMER
+
+
+def timed(stage):
+    """
+    Decorator form of timer().
+    """
+    def wrap(fn):
+        def inner(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with _Timer(stage):
+                return fn(*args, **kwargs)
+        inner.__name__ = fn.__name__
+        inner.__doc__ = fn.__doc__
+        inner.__wrapped__ = fn
+        return inner
+    return wrap
+
+
+# ---------- reporting ----------
+
+def snapshot():
+    """
+    Return {"stages": [...], "counters": {...}} for display.
+    """
+    with _lock:
+        stages = []
+        for stage, hist in sorted(_histograms.items()):
+            p = hist.percentiles()
+            stages.append({
+                "stage": stage,
+                "count": hist.count,
+                "mean_ms": round(hist.total / hist.count * 1000, 3) if hist.count else None,
+                "p50_ms": None if p[0.5] is None else round(p[0.5] * 1000, 3),
+                "p95_ms": None if p[0.95] is None else round(p[0.95] * 1000, 3),
+                "p99_ms": None if p[0.99] is None else round(p[0.99] * 1000, 3),
+            })
+        return {"stages": stages, "counters": dict(sorted(_counters.items()))}
+
+
+def render_prometheus():
+    """
+    Render all metrics in the Prometheus text exposition format.
+    """
+    lines = [
+        "# HELP attendance_stage_seconds Scan-path stage latency.",
+        "# TYPE attendance_stage_seconds histogram",
+    ]
+    with _lock:
+        for stage, hist in sorted(_histograms.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS, hist.counts):
+                cumulative += count
+                lines.append(f'attendance_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'attendance_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {hist.count}')
+            lines.append(f'attendance_stage_seconds_sum{{stage="{stage}"}} {hist.total}')
+            lines.append(f'attendance_stage_seconds_count{{stage="{stage}"}} {hist.count}')
+        for name, value in sorted(_counters.items()):
+            lines.append(f"# TYPE attendance_{name}_total counter")
+            lines.append(f"attendance_{name}_total {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path=METRICS_FILE):
+    """
+    Write the Prometheus text to a file (for node_exporter's textfile collector).
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
+    return path
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+
+
+def serve_metrics(port=None):
+    """
+    Expose /metrics on a background HTTP server (once per process).
+    Port defaults to ATTENDANCE_METRICS_PORT; does nothing if unset.
+    """
+    global _server
+    port = port or os.environ.get("ATTENDANCE_METRICS_PORT")
+    if not port:
+        return None
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(("0.0.0.0", int(port)), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    return _server
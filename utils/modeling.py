@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import cross_val_score, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from utils.eda import dataset_fingerprint
+
+# -------------------------------
+# 🤖 Background Model Training
+# -------------------------------
+
+MODEL_TYPES = ["Linear Regression", "Random Forest"]
+TRAINING_WORKERS = 2
+MODEL_CACHE_SIZE = 16
+CV_FOLDS = 5
+MAX_JOBS = 64  # finished jobs kept for status polling; the oldest are dropped first
+# tracemalloc slows every thread in the process (all Streamlit sessions), so
+# peak-memory tracing is opt-in
+TRACE_MEMORY = os.environ.get("ATTENDANCE_TRACE_TRAINING_MEMORY", "") == "1"
+
+_pool = ThreadPoolExecutor(max_workers=TRAINING_WORKERS, thread_name_prefix="trainer")
+_jobs = OrderedDict()  # job id -> job dict (metrics only; fitted pipelines live in _models)
+_jobs_lock = threading.Lock()
+_models = OrderedDict()  # cache key -> result dict (with fitted pipeline)
+_models_lock = threading.Lock()
+# tracemalloc is process-wide, so only one job at a time records peak memory
+_trace_lock = threading.Lock()
+
+
+def build_pipeline(data, features, model_type, params=None):
+    """
+    Imputation + scaling/one-hot preprocessing followed by the regressor.
+    Random forests use every core (their CV folds then run one at a time).
+    """
+    params = dict(params or {})
+    numeric = [c for c in features if pd.api.types.is_numeric_dtype(data[c])]
+    categorical = [c for c in features if c not in numeric]
+
+    if model_type == "Random Forest":
+        params.setdefault("n_jobs", -1)
+        params.setdefault("random_state", 42)
+        model = RandomForestRegressor(**params)
+        numeric_steps = [("impute", SimpleImputer(strategy="median"))]
+    else:
+        model = LinearRegression(**params)
+        numeric_steps = [("impute", SimpleImputer(strategy="median")), ("scale", StandardScaler())]
+
+    preprocess = ColumnTransformer([
+        ("num", Pipeline(numeric_steps), numeric),
+        ("cat", Pipeline([
+            ("impute", SimpleImputer(strategy="most_frequent")),
+            ("onehot", OneHotEncoder(handle_unknown="ignore", max_categories=50)),
+        ]), categorical),
+    ])
+    return Pipeline([("preprocess", preprocess), ("model", model)])
+
+
+def _cache_key(data, features, target, model_type, params):
+    return (dataset_fingerprint(data), tuple(features), target, model_type, tuple(sorted((params or {}).items())))
+
+
+def _train(key, data, features, target, model_type, params):
+    trace = TRACE_MEMORY and _trace_lock.acquire(blocking=False)
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        rows = data[target].notna()
+        X = data.loc[rows, features]
+        y = data.loc[rows, target]
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+        pipeline = build_pipeline(data, features, model_type, params)
+        folds = min(CV_FOLDS, len(X_train))
+        cv_scores = None
+        if folds >= 2:
+            # parallelise folds only when the model itself is single-threaded,
+            # otherwise n_jobs=-1 twice oversubscribes every core
+            parallel_model = pipeline.named_steps["model"].get_params().get("n_jobs") not in (None, 1)
+            cv_scores = cross_val_score(
+                pipeline, X_train, y_train, cv=folds,
+                scoring="neg_mean_squared_error", n_jobs=None if parallel_model else -1,
+            )
+        pipeline.fit(X_train, y_train)
+        mse = mean_squared_error(y_test, pipeline.predict(X_test))
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+    finally:
+        if trace:
+            tracemalloc.stop()
+            _trace_lock.release()
+
+    result = {
+        "pipeline": pipeline,
+        "model_type": model_type,
+        "mse": mse,
+        "cv_mse": None if cv_scores is None else float(-cv_scores.mean()),
+        "cv_folds": folds if cv_scores is not None else 0,
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "peak_mb": None if peak is None else round(peak / 2**20, 2),
+        "rows": len(X),
+    }
+    with _models_lock:
+        _models[key] = result
+        while len(_models) > MODEL_CACHE_SIZE:
+            _models.popitem(last=False)
+    return result
+
+
+def _summary(result, cached):
+    """
+    Job-facing copy of a result without the fitted pipeline, so finished
+    jobs do not keep models alive past their LRU eviction.
+    """
+    return dict({k: v for k, v in result.items() if k != "pipeline"}, cached=cached)
+
+
+def submit_training(data, features, target, model_type, params=None):
+    """
+    Queue a training job and return its id. A cached fit for the same
+    (dataset hash, features, target, model, params) completes immediately.
+    """
+    key = _cache_key(data, features, target, model_type, params)
+    job_id = uuid.uuid4().hex[:8]
+    with _models_lock:
+        cached = _models.get(key)
+        if cached is not None:
+            _models.move_to_end(key)
+    if cached is not None:
+        job = {"status": "done", "result": _summary(cached, True), "error": None, "future": None, "key": key}
+    else:
+        future = _pool.submit(_train, key, data, list(features), target, model_type, params)
+        job = {"status": "running", "result": None, "error": None, "future": future, "key": key}
+    with _jobs_lock:
+        _jobs[job_id] = job
+        for old_id in list(_jobs):
+            if len(_jobs) <= MAX_JOBS:
+                break
+            if _jobs[old_id]["status"] != "running" or _jobs[old_id]["future"].done():
+                del _jobs[old_id]
+    return job_id
+
+
+def get_job(job_id):
+    """
+    Return {"status": "running" | "done" | "failed", "result", "error"} for a job,
+    or None if it is unknown or was dropped to stay under MAX_JOBS.
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return None
+    future = job["future"]
+    if job["status"] == "running" and future.done():
+        error = future.exception()
+        if error is None:
+            job.update(status="done", result=_summary(future.result(), False))
+        else:
+            job.update(status="failed", error=str(error))
+        job["future"] = None  # drop the reference to the fitted pipeline
+    return {k: v for k, v in job.items() if k not in ("future", "key")}
+
+
+def get_pipeline(job_id):
+    """
+    Fitted pipeline of a finished job, while it is still in the model cache.
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return None
+    with _models_lock:
+        cached = _models.get(job["key"])
+    return cached["pipeline"] if cached is not None else None
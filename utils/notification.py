@@ -1,6 +1,14 @@
 import smtplib
 from email.message import EmailMessage
 import datetime
+import hashlib
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+from utils.admin_control import load_config
+from utils.calculator import parse_time_column
 
 # -------------------------
 # ⛔ Alert Triggers
@@ -31,17 +39,71 @@ def detect_alerts(row, office_start="09:00:00", office_end="17:00:00"):
     return ", ".join(alerts)
 
 
+# -------------------------
+# 🧮 Frame-level Alert Engine
+# -------------------------
+
+ALERT_MISSING_CHECK_IN = 1
+ALERT_MISSING_CHECK_OUT = 2
+ALERT_LATE_ARRIVAL = 4
+ALERT_EARLY_EXIT = 8
+
+ALERT_LABELS = {
+    ALERT_MISSING_CHECK_IN: "❗ Missing Check-in",
+    ALERT_MISSING_CHECK_OUT: "❗ Missing Check-out",
+    ALERT_LATE_ARRIVAL: "⏰ Late Arrival",
+    ALERT_EARLY_EXIT: "🏃 Early Exit",
+}
+
+def _missing(values):
+    series = pd.Series(values)
+    return (series.isna() | (series.astype("string").str.strip() == "")).to_numpy(dtype=bool)
+
+def detect_alert_flags(df, config=None):
+    """
+    Compute alert flags for every row at once and return them as a uint8 bitmask Series.
+    Thresholds come from admin_control.load_config() unless a config is given.
+    """
+    config = load_config() if config is None else config
+    office_start, office_end = parse_time_column([config["Office Start"], config["Office End"]])
+
+    in_seconds = parse_time_column(df["Check-in Time"])
+    out_seconds = parse_time_column(df["Check-out Time"])
+
+    flags = np.zeros(len(df), dtype=np.uint8)
+    flags |= np.where(_missing(df["Check-in Time"]), ALERT_MISSING_CHECK_IN, 0).astype(np.uint8)
+    flags |= np.where(_missing(df["Check-out Time"]), ALERT_MISSING_CHECK_OUT, 0).astype(np.uint8)
+    flags |= np.where(in_seconds > office_start, ALERT_LATE_ARRIVAL, 0).astype(np.uint8)
+    flags |= np.where(out_seconds < office_end, ALERT_EARLY_EXIT, 0).astype(np.uint8)
+    return pd.Series(flags, index=df.index, name="Alert Flags")
+
+def render_alerts(flags):
+    """
+    Turn a bitmask Series into display strings. Only the distinct masks
+    (at most 16) are formatted, then mapped back onto the rows.
+    """
+    labels = {
+        mask: ", ".join(label for bit, label in ALERT_LABELS.items() if mask & bit)
+        for mask in pd.unique(flags)
+    }
+    return flags.map(labels).rename("Alerts")
+
+
 # -------------------------
 # ✉️ Email Notification
 # -------------------------
 
+def _build_message(to_email, subject, body, sender_email):
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = sender_email
+    msg["To"] = to_email
+    msg.set_content(body)
+    return msg
+
 def send_email_alert(to_email, subject, body, smtp_server, smtp_port, sender_email, sender_password):
     try:
-        msg = EmailMessage()
-        msg["Subject"] = subject
-        msg["From"] = sender_email
-        msg["To"] = to_email
-        msg.set_content(body)
+        msg = _build_message(to_email, subject, body, sender_email)
 
         with smtplib.SMTP_SSL(smtp_server, smtp_port) as server:
             server.login(sender_email, sender_password)
@@ -51,3 +113,157 @@ def send_email_alert(to_email, subject, body, smtp_server, smtp_port, sender_ema
     except Exception as e:
         print(f"Email sending failed: {e}")
         return False
+
+
+# -------------------------
+# 📬 Queued Bulk Delivery
+# -------------------------
+
+class EmailQueue:
+    """
+    Background email sender that reuses one authenticated SMTP connection.
+    - identical alerts (same recipient, subject and body) are sent once per dedupe window;
+      an alert that finally fails is forgotten, so it can be queued again
+    - a dropped connection is re-opened; failed messages retry with exponential backoff
+    - stats() reports sent/failed counts and throughput
+    Set use_ssl=False (and no password) to test against a local SMTP stand-in.
+    """
+
+    def __init__(self, smtp_server, smtp_port, sender_email, sender_password=None,
+                 use_ssl=True, max_retries=3, backoff=1.0, dedupe_window=3600, timeout=30, idle_timeout=5):
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.sender_email = sender_email
+        self.sender_password = sender_password
+        self.use_ssl = use_ssl
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.dedupe_window = dedupe_window
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+
+        self._queue = queue.Queue()
+        self._seen = {}  # alert hash -> time queued (dropped again if delivery fails)
+        self._lock = threading.Lock()
+        self._server = None
+        self._stats = {"queued": 0, "sent": 0, "failed": 0, "retries": 0,
+                       "duplicates": 0, "reconnects": 0}
+        self._started = None
+        self._worker = threading.Thread(target=self._run, name="email-queue", daemon=True)
+        self._worker.start()
+
+    # ---------- producer side ----------
+
+    def enqueue(self, to_email, subject, body) -> bool:
+        """
+        Queue an alert. Returns False if an identical one was queued recently.
+        """
+        key = hashlib.sha256(f"{to_email}\0{subject}\0{body}".encode()).hexdigest()
+        now = time.monotonic()
+        with self._lock:
+            queued_at = self._seen.get(key)
+            if queued_at is not None and now - queued_at < self.dedupe_window:
+                self._stats["duplicates"] += 1
+                return False
+            self._seen[key] = now
+            if len(self._seen) > 10000:
+                self._seen = {k: t for k, t in self._seen.items() if now - t < self.dedupe_window}
+            self._stats["queued"] += 1
+            if self._started is None:
+                self._started = now
+        self._queue.put((key, to_email, subject, body))
+        return True
+
+    def join(self):
+        """
+        Block until every queued message has been sent or given up on.
+        """
+        self._queue.join()
+
+    def stop(self):
+        self._queue.put(None)
+        self._worker.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            elapsed = time.monotonic() - self._started if self._started else 0.0
+        stats["pending"] = self._queue.qsize()
+        stats["per_second"] = round(stats["sent"] / elapsed, 2) if elapsed else 0.0
+        return stats
+
+    # ---------- worker side ----------
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        if self.sender_password:
+            server.login(self.sender_email, self.sender_password)
+        return server
+
+    def _disconnect(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+    def _send(self, to_email, subject, body):
+        """
+        Deliver one message, retrying connection/SMTP errors. Other exceptions
+        (a message that cannot be built or serialised) propagate to _run.
+        """
+        msg = _build_message(to_email, subject, body, self.sender_email)
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self._server is None:
+                    self._server = self._connect()
+                    if attempt or self._stats["sent"]:
+                        self._bump("reconnects")
+                self._server.send_message(msg)
+                return True
+            except (smtplib.SMTPException, OSError) as e:
+                self._disconnect()
+                if attempt == self.max_retries:
+                    print(f"Email sending failed: {e}")
+                    return False
+                self._bump("retries")
+                time.sleep(self.backoff * (2 ** attempt))
+        return False
+
+    def _bump(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                # keep the connection open for bursts, close it once idle
+                self._disconnect()
+                continue
+            try:
+                if item is None:
+                    self._disconnect()
+                    return
+                key, to_email, subject, body = item
+                try:
+                    sent = self._send(to_email, subject, body)
+                except Exception as e:
+                    # not retryable (e.g. a newline in a header): fail this
+                    # message only, the worker keeps serving the queue
+                    print(f"Email sending failed: {e}")
+                    self._disconnect()
+                    sent = False
+                if sent:
+                    self._bump("sent")
+                else:
+                    with self._lock:
+                        self._stats["failed"] += 1
+                        self._seen.pop(key, None)
+            finally:
+                self._queue.task_done()
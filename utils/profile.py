@@ -1,43 +1,86 @@
 import pandas as pd
-import os
+import threading
+import time
+from utils import database
+from utils.metrics import increment
 
-# Simulated file-based storage (could be replaced with a DB)
-PROFILE_FILE = "employee_profiles.csv"
+PROFILE_COLUMNS = ["Employee ID", "Name", "Department"]
+# A roster sync that would remove more than this share of the stored
+# employees (and more than MIN_GUARDED_REMOVALS of them) needs force=True
+MAX_REMOVAL_FRACTION = 0.2
+MIN_GUARDED_REMOVALS = 5
+
+# Process-wide profile index, keyed by Employee ID.
+# Rebuilt only when the employees_version counter in the database moves,
+# so a write by any process or admin session invalidates every reader.
+_index_lock = threading.Lock()
+_index = {"version": None, "df": None, "by_id": {}}
+
+def _build_index(version):
+    records = database.list_employees()
+    _index["df"] = pd.DataFrame(records, columns=PROFILE_COLUMNS)
+    _index["by_id"] = {rec["Employee ID"]: rec for rec in records}
+    _index["version"] = version
+
+def _profile_index():
+    """
+    Return the cached index, reloading from the database only if employees changed.
+    """
+    version = database.employees_version()
+    with _index_lock:
+        if _index["version"] != version:
+            increment("profile_index_misses")
+            _build_index(version)
+        else:
+            increment("profile_index_hits")
+        return _index
+
+def invalidate_profile_cache():
+    """
+    Drop the cached profile index so the next lookup re-reads the database.
+    """
+    with _index_lock:
+        _index["version"] = None
+        _index["df"] = None
+        _index["by_id"] = {}
 
 def load_profiles():
     """
-    Load employee profiles from CSV. Create if not exists.
+    Load all employee profiles as a DataFrame.
     """
-    if not os.path.exists(PROFILE_FILE):
-        df = pd.DataFrame(columns=["Employee ID", "Name", "Department"])
-        df.to_csv(PROFILE_FILE, index=False)
-    return pd.read_csv(PROFILE_FILE)
+    return _profile_index()["df"].copy()
 
 def save_profiles(df):
     """
-    Save the updated profiles dataframe to disk.
+    Replace the stored profiles with the contents of `df` in one transaction.
     """
-    df.to_csv(PROFILE_FILE, index=False)
+    database.replace_employees(df[PROFILE_COLUMNS].itertuples(index=False, name=None))
 
 def add_or_update_profile(emp_id, name, department):
     """
     Add a new employee profile or update an existing one.
     """
-    df = load_profiles()
-    if emp_id in df["Employee ID"].values:
-        df.loc[df["Employee ID"] == emp_id, ["Name", "Department"]] = [name, department]
-    else:
-        df = df.append({"Employee ID": emp_id, "Name": name, "Department": department}, ignore_index=True)
-    save_profiles(df)
-    return df
+    database.upsert_employee(emp_id, name, department)
+    return load_profiles()
 
 def get_profile(emp_id):
     """
     Retrieve a single employee's profile as a dict.
     """
-    df = load_profiles()
-    profile = df[df["Employee ID"] == emp_id]
-    return profile.to_dict(orient="records")[0] if not profile.empty else None
+    profile = _profile_index()["by_id"].get(str(emp_id))
+    return dict(profile) if profile is not None else None
+
+def get_profiles(emp_ids):
+    """
+    Bulk lookup: return {emp_id: profile dict} for the IDs that exist.
+    """
+    by_id = _profile_index()["by_id"]
+    found = {}
+    for emp_id in emp_ids:
+        profile = by_id.get(str(emp_id))
+        if profile is not None:
+            found[emp_id] = dict(profile)
+    return found
 
 def list_profiles():
     """
@@ -50,3 +93,71 @@ def get_employee_attendance(emp_id, attendance_df):
     Filter the attendance log for a specific employee.
     """
     return attendance_df[attendance_df["Employee ID"] == emp_id]
+
+def read_roster(source, columns=None):
+    """
+    Read an HR export (CSV or Excel path / uploaded file) into PROFILE_COLUMNS.
+    `columns` maps export headers to profile columns, e.g. {"Staff No": "Employee ID"}.
+    """
+    filename = str(getattr(source, "name", source)).lower()
+    if filename.endswith((".xlsx", ".xls")):
+        df = pd.read_excel(source, dtype=str)
+    else:
+        df = pd.read_csv(source, dtype=str)
+    if columns:
+        df = df.rename(columns=columns)
+    missing = [c for c in PROFILE_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Roster is missing columns: {', '.join(missing)}")
+    return df[PROFILE_COLUMNS]
+
+def _sync_guard(roster, current, removals):
+    if roster.empty:
+        return "Roster has no rows with an Employee ID (wrong file or column mapping?)"
+    if len(removals) > max(MIN_GUARDED_REMOVALS, MAX_REMOVAL_FRACTION * len(current)):
+        return (f"Roster would remove {len(removals)} of {len(current)} employees "
+                f"(more than {MAX_REMOVAL_FRACTION:.0%})")
+    return None
+
+def sync_roster(source, columns=None, remove_missing=True, dry_run=False, force=False):
+    """
+    Make the stored profiles match an HR roster export in one transaction.
+    The diff against current profiles is computed with a single merge;
+    returns a change report with the added, updated and removed IDs.
+    A roster without valid IDs, or one that would remove too many employees,
+    is reported in "refused" and raises ValueError when applied unless force=True.
+    """
+    started = time.perf_counter()
+    roster = source if isinstance(source, pd.DataFrame) else read_roster(source, columns)
+    roster = roster[PROFILE_COLUMNS].fillna("").astype(str).apply(lambda col: col.str.strip())
+    invalid = roster["Employee ID"] == ""
+    roster = roster[~invalid]
+    duplicates = roster["Employee ID"].duplicated(keep="last")
+    roster = roster[~duplicates]
+
+    current = load_profiles().fillna("").astype(str)
+    merged = roster.merge(current, on="Employee ID", how="outer", suffixes=("", "_old"), indicator=True)
+    added = merged["_merge"] == "left_only"
+    removed = merged["_merge"] == "right_only"
+    both = merged["_merge"] == "both"
+    changed = both & ((merged["Name"] != merged["Name_old"]) | (merged["Department"] != merged["Department_old"]))
+
+    upserts = merged.loc[added | changed, PROFILE_COLUMNS]
+    removals = merged.loc[removed, "Employee ID"] if remove_missing else merged.loc[[], "Employee ID"]
+    refused = None if force else _sync_guard(roster, current, removals)
+    if refused and not dry_run:
+        raise ValueError(refused)
+    if not dry_run and (len(upserts) or len(removals)):
+        database.apply_employee_changes(upserts.itertuples(index=False, name=None), removals.tolist())
+
+    return {
+        "added": merged.loc[added, "Employee ID"].tolist(),
+        "updated": merged.loc[changed, "Employee ID"].tolist(),
+        "removed": removals.tolist(),
+        "unchanged": int((both & ~changed).sum()),
+        "skipped_blank_ids": int(invalid.sum()),
+        "duplicate_ids": int(duplicates.sum()),
+        "dry_run": dry_run,
+        "refused": refused,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
@@ -3,24 +3,239 @@ import cv2
 import numpy as np
 from PIL import Image
 import io
+import os
+import hashlib
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from fpdf import FPDF
+from utils.metrics import increment
 
-def generate_qr_code(data: str) -> bytes:
+# Images larger than this (longest side, px) are downscaled before decoding
+DECODE_MAX_SIDE = 1280
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+# One detector per thread (cv2 detectors are not thread-safe), reused across scans
+_detectors = threading.local()
+
+def _get_detector():
+    detector = getattr(_detectors, "detector", None)
+    if detector is None:
+        detector = _detectors.detector = cv2.QRCodeDetector()
+    return detector
+
+# -------------------------------
+# 🖼️ QR Image Cache
+# -------------------------------
+
+class QRImageCache:
     """
-    Generate a QR code for the given data.
-    Returns QR code as bytes.
+    Content-addressed PNG cache keyed by SHA-256 of the payload.
+    Least recently used images are evicted once max_bytes is exceeded.
     """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(data: str) -> str:
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def get(self, data: str):
+        key = self.key(data)
+        with self._lock:
+            png = self._items.get(key)
+            if png is not None:
+                self._items.move_to_end(key)
+            return png
+
+    def put(self, data: str, png: bytes):
+        key = self.key(data)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = png
+            self._size += len(png)
+            while self._size > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def __len__(self):
+        return len(self._items)
+
+qr_cache = QRImageCache()
+
+def _render_qr_png(data: str) -> bytes:
     qr = qrcode.make(data)
     buf = io.BytesIO()
     qr.save(buf, format='PNG')
     return buf.getvalue()
 
+def generate_qr_code(data: str) -> bytes:
+    """
+    Generate a QR code for the given data.
+    Returns QR code as bytes (served from qr_cache when already rendered).
+    """
+    png = qr_cache.get(data)
+    if png is None:
+        png = _render_qr_png(data)
+        qr_cache.put(data, png)
+    return png
+
+def _load_grayscale(image) -> np.ndarray:
+    """
+    Open a path, file-like or PIL image as a single-channel uint8 array.
+    """
+    if not isinstance(image, Image.Image):
+        image = Image.open(image)
+    return np.asarray(image.convert("L"))
+
+def _downscale(gray: np.ndarray, max_side: int) -> np.ndarray:
+    height, width = gray.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1:
+        return gray
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+def _decode_array(gray: np.ndarray) -> list:
+    ok, decoded, _, _ = _get_detector().detectAndDecodeMulti(gray)
+    if not ok:
+        return []
+    return [data for data in decoded if data]
+
+def decode_qr_codes(image, max_side: int = DECODE_MAX_SIDE) -> list:
+    """
+    Decode every QR code in an image.
+    Decodes a downscaled grayscale copy first and retries at full
+    resolution only when that finds nothing.
+    """
+    gray = _load_grayscale(image)
+    small = _downscale(gray, max_side)
+    codes = _decode_array(small)
+    if not codes and small is not gray:
+        codes = _decode_array(gray)
+    return codes
+
 def decode_qr_from_image(uploaded_image) -> str:
     """
     Decode QR code from an uploaded image.
     Returns the decoded data as string.
     """
-    image = Image.open(uploaded_image)
-    img_array = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-    detector = cv2.QRCodeDetector()
-    data, _, _ = detector.detectAndDecode(img_array)
-    return data
+    codes = decode_qr_codes(uploaded_image)
+    if not codes:
+        increment("decode_failures")
+        return ""
+    return codes[0]
+
+# -------------------------------
+# 📦 Batch Decoding
+# -------------------------------
+
+def _decode_job(source) -> dict:
+    started = time.perf_counter()
+    result = {"source": source, "codes": [], "seconds": 0.0, "error": None}
+    try:
+        result["codes"] = decode_qr_codes(source)
+        if not result["codes"]:
+            result["error"] = "no QR code found"
+    except (OSError, ValueError, cv2.error) as e:
+        result["error"] = f"unreadable image: {e}"
+    result["seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+def _list_images(folder: str) -> list:
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+def decode_qr_batch(sources, workers: int = None, chunksize: int = 8) -> list:
+    """
+    Decode a folder of images (or a list of image paths) across a process pool.
+    Returns one dict per image: source, codes, seconds, error.
+    """
+    if isinstance(sources, str):
+        sources = _list_images(sources)
+    sources = list(sources)
+    if not sources:
+        return []
+    if workers == 1 or len(sources) == 1:
+        return [_decode_job(source) for source in sources]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_decode_job, sources, chunksize=chunksize))
+
+# -------------------------------
+# 🪪 Bulk Badge Generation
+# -------------------------------
+
+def generate_badges(payloads: dict, workers: int = None) -> dict:
+    """
+    Render QR PNGs for many employees at once.
+    `payloads` maps emp_id -> QR payload. Only payloads missing from
+    qr_cache are rendered (in parallel); the rest are cache hits.
+    Returns {emp_id: png bytes}.
+    """
+    badges = {}
+    missing = {}
+    for emp_id, data in payloads.items():
+        png = qr_cache.get(data)
+        if png is None:
+            missing.setdefault(data, []).append(emp_id)
+        else:
+            badges[emp_id] = png
+
+    if missing:
+        todo = list(missing)
+        if workers == 1 or len(todo) < 16:
+            rendered = map(_render_qr_png, todo)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rendered = list(pool.map(_render_qr_png, todo, chunksize=32))
+        for data, png in zip(todo, rendered):
+            qr_cache.put(data, png)
+            for emp_id in missing[data]:
+                badges[emp_id] = png
+    return badges
+
+def badges_to_zip(badges: dict, out=None):
+    """
+    Write badges into a ZIP archive (one <emp_id>.png each).
+    Streams into `out` (path or file object); returns the bytes when out is None.
+    """
+    target = io.BytesIO() if out is None else out
+    # PNGs are already compressed, so store them as-is
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_STORED) as zf:
+        for emp_id, png in badges.items():
+            zf.writestr(f"{emp_id}.png", png)
+    return target.getvalue() if out is None else out
+
+def badges_to_pdf(badges: dict, names: dict = None, filename="badges.pdf", columns=3, badge_mm=55):
+    """
+    Lay badges out on a printable multi-page A4 sheet with the ID (and name) under each code.
+    """
+    names = names or {}
+    pdf = FPDF()
+    pdf.set_font("Arial", size=9)
+    margin = 10
+    cell_h = badge_mm + 12
+    rows = int((297 - 2 * margin) // cell_h)
+    per_page = rows * columns
+    for i, (emp_id, png) in enumerate(badges.items()):
+        if i % per_page == 0:
+            pdf.add_page()
+        row, col = divmod(i % per_page, columns)
+        x = margin + col * (badge_mm + 8)
+        y = margin + row * cell_h
+        pdf.image(io.BytesIO(png), x=x, y=y, w=badge_mm, h=badge_mm)
+        pdf.set_xy(x, y + badge_mm + 1)
+        label = f"{emp_id} {names[emp_id]}" if emp_id in names else str(emp_id)
+        pdf.cell(badge_mm, 5, label, align="C")
+    pdf.output(filename)
+    return filename
@@ -0,0 +1,73 @@
+import threading
+
+import pandas as pd
+
+from utils import database
+
+# -------------------------------
+# 📈 Incremental Attendance Rollups
+# -------------------------------
+
+
+class AttendanceRollups:
+    """
+    Query API over running totals, so summaries never need a groupby over
+    the whole history:
+    - per employee / day
+    - per employee / month
+    - per department / day
+    The totals live in the database's rollups table and are updated in the
+    same transaction as each event (database._insert_event), so every
+    process sees the same numbers and a restart loses nothing. Sessions are
+    paired within a day, as in calculator.pair_sessions.
+    """
+
+    # ---------- queries ----------
+
+    def employee_day(self, emp_id, day):
+        return database.get_rollup("emp_day", day, emp_id)
+
+    def employee_month(self, emp_id, month):
+        return database.get_rollup("emp_month", month, emp_id)
+
+    def department_day(self, department, day):
+        return database.get_rollup("dept_day", day, department)
+
+    def department_totals(self, day):
+        """
+        Return a DataFrame of per-department totals for one day.
+        """
+        rows = [
+            {"Department": dept, "Hours Worked": round(hours, 2), "Sessions": sessions, "Events": events}
+            for _, dept, hours, sessions, events in database.list_rollups("dept_day", day)
+        ]
+        return pd.DataFrame(rows, columns=["Department", "Hours Worked", "Sessions", "Events"])
+
+    def monthly_summary(self, month=None):
+        """
+        Same shape as calculator.generate_monthly_summary, read from the running totals.
+        """
+        from utils.profile import get_profiles
+
+        totals = database.list_rollups("emp_month", month)
+        profiles = get_profiles({emp_id for _, emp_id, _, _, _ in totals})
+        rows = [
+            {"Employee ID": emp_id, "Name": profiles.get(emp_id, {}).get("Name"), "Month": m, "Hours Worked": round(hours, 2)}
+            for m, emp_id, hours, _, _ in totals
+        ]
+        return pd.DataFrame(rows, columns=["Employee ID", "Name", "Month", "Hours Worked"])
+
+
+_rollups = None
+_rollups_lock = threading.Lock()
+
+
+def get_rollups():
+    """
+    Return the process-wide rollup query API.
+    """
+    global _rollups
+    with _rollups_lock:
+        if _rollups is None:
+            _rollups = AttendanceRollups()
+        return _rollups
@@ -1,49 +1,309 @@
+import base64
 import hashlib
-import uuid
+import heapq
+import hmac
+import ipaddress
+import mmap
+import os
+import secrets
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from utils.metrics import increment, timer
 
 # -------------------------------
 # 🎯 One-Time QR Token Generator
 # -------------------------------
 
-def generate_one_time_token(emp_id: str) -> str:
+# Shared signing key; set ATTENDANCE_TOKEN_SECRET so every worker accepts the same tokens.
+TOKEN_SECRET = os.environ.get("ATTENDANCE_TOKEN_SECRET", "").encode() or secrets.token_bytes(32)
+TOKEN_TTL_SECONDS = 300
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def _sign(payload: str) -> str:
+    return _b64(hmac.new(TOKEN_SECRET, payload.encode(), hashlib.sha256).digest()[:16])
+
+class ReplayCache:
+    """
+    Remembers consumed tokens until they expire, so each token works once.
+    Expired entries are evicted on every check, keeping memory bounded by
+    the number of tokens used within one TTL window.
+    """
+
+    def __init__(self):
+        self._seen = {}      # token -> expiry
+        self._expiries = []  # heap of (expiry, token)
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        while self._expiries and self._expiries[0][0] < now:
+            _, token = heapq.heappop(self._expiries)
+            self._seen.pop(token, None)
+
+    def consume(self, token: str, expires: int, now: float = None) -> bool:
+        """
+        Mark the token as used. Returns False if it was already used.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._evict(now)
+            if token in self._seen:
+                return False
+            self._seen[token] = expires
+            heapq.heappush(self._expiries, (expires, token))
+            return True
+
+    def __len__(self):
+        return len(self._seen)
+
+replay_cache = ReplayCache()
+
+def generate_one_time_token(emp_id: str, ttl: int = TOKEN_TTL_SECONDS) -> str:
     """
-    Generates a unique token using UUID and timestamp.
+    Generates an HMAC-signed token carrying the employee ID and its expiry.
+    Format: <emp_id b64>.<expiry>.<nonce>.<signature>
     """
-    raw = f"{emp_id}-{uuid.uuid4()}-{int(time.time())}"
-    return hashlib.sha256(raw.encode()).hexdigest()
+    expires = int(time.time()) + ttl
+    payload = f"{_b64(str(emp_id).encode())}.{expires}.{secrets.token_hex(4)}"
+    return f"{payload}.{_sign(payload)}"
 
-def validate_token(token: str, valid_tokens: dict) -> bool:
+def _verify(token: str, now: float = None):
     """
-    Validates and consumes the token. Tokens should be stored temporarily.
+    Returns (emp_id, expiry, signed payload) or None. The HMAC covers the
+    payload text exactly as received, so any rewrite of it fails.
     """
-    if token in valid_tokens:
-        del valid_tokens[token]  # Consume it (one-time use)
-        return True
-    return False
+    try:
+        payload, signature = token.rsplit(".", 1)
+        emp_part, expires, nonce = payload.split(".")
+        # ASCII digits only: int() also takes "+5", " 5", "5_0", "٥"
+        if not (expires.isascii() and expires.isdigit()):
+            return None
+        # compare bytes: compare_digest raises TypeError on non-ASCII str
+        if not hmac.compare_digest(signature.encode(), _sign(payload).encode()):
+            return None
+        emp_id = _unb64(emp_part).decode()
+    except (AttributeError, TypeError, ValueError):
+        return None
+    expires = int(expires)
+    if expires < (time.time() if now is None else now):
+        return None
+    return emp_id, expires, payload
+
+def verify_token(token: str, now: float = None):
+    """
+    Check signature and expiry without consuming the token.
+    Returns (emp_id, expiry) or None.
+    """
+    verified = _verify(token, now)
+    return None if verified is None else verified[:2]
+
+def validate_token(token: str, cache: ReplayCache = None):
+    """
+    Validates and consumes the token (one-time use).
+    Returns the employee ID it was issued for, or None if invalid, expired or replayed.
+    """
+    verified = _verify(token)
+    if verified is None:
+        increment("invalid_tokens")
+        return None
+    emp_id, expires, payload = verified
+    if cache is None:
+        cache = replay_cache
+    # keyed on the signed payload, which has exactly one accepted spelling
+    if not cache.consume(payload, expires):
+        increment("replayed_tokens")
+        return None
+    return emp_id
 
 # -------------------------------
 # 🌍 Geo-tagging & IP Tracking
 # -------------------------------
 
+PUBLIC_IP_TTL_SECONDS = 600
+GEO_CACHE_TTL_SECONDS = 6 * 3600
+GEO_FAILURE_TTL_SECONDS = 300
+# Optional offline IP-range database (see build_ip_database)
+IP_DATABASE_FILE = os.environ.get("ATTENDANCE_IP_DB", "ip_ranges.db")
+
+class TTLCache:
+    """
+    Small thread-safe dict with per-entry expiry and a size cap.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                del self._items[key]
+                return None
+            return item[1]
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._items) >= self.maxsize:
+                now = time.monotonic()
+                self._items = {k: v for k, v in self._items.items() if v[0] >= now}
+                if len(self._items) >= self.maxsize:
+                    self._items.pop(next(iter(self._items)))
+            self._items[key] = (time.monotonic() + self.ttl, value)
+
+_public_ip_cache = TTLCache(PUBLIC_IP_TTL_SECONDS, maxsize=1)
+_geo_cache = TTLCache(GEO_CACHE_TTL_SECONDS)
+_geo_failure_cache = TTLCache(GEO_FAILURE_TTL_SECONDS)  # failed lookups, retried after a short while
+GEO_UNAVAILABLE = {"error": "Location unavailable"}
+
+# ---------- offline IP-range database ----------
+
+IP_RECORD_SIZE = 256
+_IP_KEY_LEN = 32  # 128-bit address as zero-padded hex, so byte order == numeric order
+
+def _ip_key(ip: str) -> bytes:
+    return format(int(ipaddress.ip_address(ip)), "032x").encode()
+
+def build_ip_database(rows, out_path: str = IP_DATABASE_FILE):
+    """
+    Write an offline IP database from rows of
+    (start_ip, end_ip, city, region, country, latitude, longitude).
+    Records are fixed-width and sorted so lookups can binary-search a memory map.
+    """
+    records = []
+    for start, end, *fields in rows:
+        line = "\t".join([_ip_key(start).decode(), _ip_key(end).decode()] + ["" if f is None else str(f) for f in fields])
+        line = line.encode()[:IP_RECORD_SIZE - 1]
+        records.append(line.ljust(IP_RECORD_SIZE - 1) + b"\n")
+    records.sort()
+    with open(out_path, "wb") as f:
+        f.writelines(records)
+    return out_path
+
+class IPRangeDatabase:
+    """
+    Memory-mapped, fixed-width IP-range file searched with binary search.
+    """
+
+    def __init__(self, path: str = IP_DATABASE_FILE):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = len(self._map) // IP_RECORD_SIZE
+
+    def _key_at(self, i: int) -> bytes:
+        offset = i * IP_RECORD_SIZE
+        return self._map[offset:offset + _IP_KEY_LEN]
+
+    def lookup(self, ip: str):
+        try:
+            key = _ip_key(ip)
+        except ValueError:
+            return None
+        # last record whose start <= key
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+        offset = (lo - 1) * IP_RECORD_SIZE
+        fields = self._map[offset:offset + IP_RECORD_SIZE].decode().rstrip().split("\t")
+        fields += [""] * (7 - len(fields))
+        if key > fields[1].encode():
+            return None
+        city, region, country, lat, lon = fields[2:7]
+        return {
+            "city": city or None,
+            "region": region or None,
+            "country": country or None,
+            "latitude": float(lat) if lat else None,
+            "longitude": float(lon) if lon else None
+        }
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+_ip_database = None
+_ip_database_lock = threading.Lock()
+
+def _offline_database():
+    global _ip_database
+    if _ip_database is None and os.path.exists(IP_DATABASE_FILE):
+        with _ip_database_lock:  # enrichment threads may race to open it
+            if _ip_database is None:
+                _ip_database = IPRangeDatabase(IP_DATABASE_FILE)
+    return _ip_database
+
+# ---------- lookups ----------
+
 def get_public_ip():
+    ip = _public_ip_cache.get("ip")
+    if ip is not None:
+        return ip
     try:
-        response = requests.get("https://api64.ipify.org?format=json", timeout=3)
-        return response.json().get("ip", "Unknown")
-    except:
+        with timer("public_ip_http"):
+            response = requests.get("https://api64.ipify.org?format=json", timeout=3)
+        ip = response.json().get("ip", "Unknown")
+    except Exception:
         return "Unavailable"
+    _public_ip_cache.set("ip", ip)
+    return ip
 
 def get_geo_location(ip: str):
-    try:
-        response = requests.get(f"https://ipapi.co/{ip}/json/", timeout=5)
-        data = response.json()
-        return {
-            "city": data.get("city"),
-            "region": data.get("region"),
-            "country": data.get("country_name"),
-            "latitude": data.get("latitude"),
-            "longitude": data.get("longitude")
-        }
-    except:
-        return {"error": "Location unavailable"}
+    cached = _geo_cache.get(ip)
+    if cached is None:
+        cached = _geo_failure_cache.get(ip)
+    if cached is not None:
+        increment("geo_cache_hits")
+        return cached
+    increment("geo_cache_misses")
+    if ip in ("Unavailable", "Unknown"):
+        return GEO_UNAVAILABLE
+    database = _offline_database()
+    location = database.lookup(ip) if database is not None else None
+    if location is None:
+        try:
+            with timer("geo_http"):
+                response = requests.get(f"https://ipapi.co/{ip}/json/", timeout=5)
+            data = response.json()
+            location = {
+                "city": data.get("city"),
+                "region": data.get("region"),
+                "country": data.get("country_name"),
+                "latitude": data.get("latitude"),
+                "longitude": data.get("longitude")
+            }
+        except Exception:
+            _geo_failure_cache.set(ip, GEO_UNAVAILABLE)
+            return GEO_UNAVAILABLE
+    _geo_cache.set(ip, location)
+    return location
+
+# ---------- background enrichment ----------
+
+_geo_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="geo-enrich")
+
+def _resolve_location(callback, ip):
+    ip = ip or get_public_ip()
+    callback(ip, get_geo_location(ip))
+
+def enrich_location_async(callback, ip: str = None):
+    """
+    Resolve IP and location off the scan path.
+    `callback(ip, location)` is called from a worker thread once both are known.
+    """
+    return _geo_pool.submit(_resolve_location, callback, ip)
@@ -0,0 +1,83 @@
+import importlib
+import re
+import subprocess
+import sys
+import threading
+import time
+
+# -------------------------------
+# 🚀 Lazy Imports & Startup Report
+# -------------------------------
+
+# Modules the analysis pages need but the login/Activity Log path does not
+HEAVY_MODULES = [
+    "pandas",
+    "numpy",
+    "plotly.express",
+    "sklearn.ensemble",
+    "utils.ingestion",
+    "utils.eda",
+    "utils.modeling",
+    "utils.viz_data",
+]
+
+_import_times = {}  # module -> seconds spent importing it in this process
+_lock = threading.Lock()
+_process_started = time.perf_counter()
+
+
+def lazy_import(name):
+    """
+    Import a module on first use and record how long that took.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        _import_times.setdefault(name, time.perf_counter() - started)
+    return module
+
+
+def record(stage, seconds):
+    """
+    Record a startup stage that is not an import (e.g. building the authenticator).
+    """
+    with _lock:
+        _import_times.setdefault(stage, seconds)
+
+
+def startup_report():
+    """
+    Lazy imports and startup stages seen so far in this process, slowest first.
+    """
+    with _lock:
+        rows = sorted(_import_times.items(), key=lambda item: item[1], reverse=True)
+    return [{"module": name, "ms": round(seconds * 1000, 1)} for name, seconds in rows]
+
+
+def import_time_profile(modules=HEAVY_MODULES, top=25):
+    """
+    Measure cold import cost in a fresh interpreter with `python -X importtime`.
+    Returns [(cumulative_ms, self_ms, module)] sorted by cumulative time.
+    """
+    code = "; ".join(f"import {m}" for m in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(.+)", line)
+        if match:
+            self_us, cumulative_us, name = match.groups()
+            rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+if __name__ == "__main__":
+    # python -m utils.startup  -> where cold-start import time goes
+    for cumulative, own, name in import_time_profile():
+        print(f"{cumulative:>9.1f} ms  {own:>8.1f} ms self  {name}")
@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.eda import dataset_fingerprint
+
+# -------------------------------
+# 📉 Bounded Chart Payloads
+# -------------------------------
+
+HIST_BINS = 50
+TOP_N = 20
+MAX_POINTS = 20000   # scatter points sent to the browser
+DENSITY_GRID = 150   # bins per axis for density-aggregated scatter
+PAYLOAD_CACHE_SIZE = 32
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cached(key, build):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    payload = build()
+    with _cache_lock:
+        _cache[key] = payload
+        while len(_cache) > PAYLOAD_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return payload
+
+
+def histogram_payload(data, col, bins=HIST_BINS):
+    """
+    Pre-binned histogram: one row per bin (bin_start, bin_end, count).
+    Non-numeric columns fall back to top-N category counts.
+    """
+    def build():
+        series = data[col]
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            return top_n_payload(data, col)
+        values = series.dropna().to_numpy(dtype="float64")
+        values = values[np.isfinite(values)]
+        counts, edges = np.histogram(values, bins=bins)
+        return pd.DataFrame({
+            "bin_start": edges[:-1],
+            "bin_end": edges[1:],
+            "bin_mid": (edges[:-1] + edges[1:]) / 2,
+            "count": counts,
+        })
+    return _cached((dataset_fingerprint(data), "histogram", col, bins), build)
+
+
+def top_n_payload(data, col, n=TOP_N):
+    """
+    Value counts collapsed to the top N categories plus an "Other" row.
+    Output columns are always ("value", "count"), whatever `col` is called.
+    """
+    def build():
+        counts = data[col].value_counts(dropna=False)
+        top = counts.head(n)
+        rest = counts.iloc[n:].sum()
+        payload = pd.DataFrame({"value": top.index.astype(str), "count": top.to_numpy()})
+        if rest:
+            payload.loc[len(payload)] = ["Other", rest]
+        return payload
+    return _cached((dataset_fingerprint(data), "top_n", col, n), build)
+
+
+def scatter_payload(data, x, y, size=None, max_points=MAX_POINTS, method="density"):
+    """
+    Scatter/bubble data with at most `max_points` rows.
+    - small data is passed through unchanged
+    - method="sample": uniform random decimation
+    - method="density": 2-D grid aggregation; each cell becomes one point
+      at its centroid, with a point-count column and the mean of `size`
+      (named "count", or "points" if a plotted column is already "count")
+    Returns (DataFrame, description of the reduction or None).
+    """
+    def build():
+        cols = [c for c in dict.fromkeys([x, y, size]) if c is not None]
+        frame = data[cols].dropna()
+        if len(frame) <= max_points:
+            return frame, None
+        if method == "sample" or not all(pd.api.types.is_numeric_dtype(frame[c]) for c in (x, y)):
+            return frame.sample(n=max_points, random_state=0), f"random sample of {max_points:,} / {len(frame):,} points"
+
+        xs = frame[x].to_numpy(dtype="float64")
+        ys = frame[y].to_numpy(dtype="float64")
+        grid = min(DENSITY_GRID, int(np.sqrt(max_points)))
+        x_bin = np.clip(((xs - xs.min()) / (np.ptp(xs) or 1) * grid).astype(np.int64), 0, grid - 1)
+        y_bin = np.clip(((ys - ys.min()) / (np.ptp(ys) or 1) * grid).astype(np.int64), 0, grid - 1)
+        cell = pd.Series(x_bin * grid + y_bin, index=frame.index, name="cell")
+        count_key = "points" if "count" in cols else "count"
+        agg = {x: (x, "mean"), y: (y, "mean"), count_key: (x, "size")}
+        if size is not None and size not in (x, y) and pd.api.types.is_numeric_dtype(frame[size]):
+            agg[size] = (size, "mean")
+        points = frame.groupby(cell).agg(**agg).reset_index(drop=True)
+        return points, f"{len(frame):,} points aggregated into {len(points):,} density cells"
+    return _cached((dataset_fingerprint(data), "scatter", x, y, size, max_points, method), build)